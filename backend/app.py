@@ -1,12 +1,22 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, make_response, send_from_directory, g, has_request_context
 from flask_cors import CORS, cross_origin
-from physiqueneeds1 import parse_text, compute_nutrients, save_log
-from db import get_conn
-from calorie_target import calculate_daily_calories
-from workout import workout_bp
+from physiqueneeds1 import parse_and_compute, parse_and_compute_many, save_log, save_logs
+from db import get_conn, get_pool, PoolTimeout
+from food_catalog import food_catalog
+from parse_cache import parse_cache
+from profile_cache import DEFAULT_PROFILE, profile_cache
+from log_writer import LOG_WRITE_BEHIND, LogQueueFull, log_writer
+from rollup import BUCKETS, bucket_rows, get_daily_rows, get_range_rows, get_today_row
+from nutrients import NUTRIENT_KEYS
+from workout import workout_bp, today_workout_summary, workout_version
+from workout_counters import today_counters
+from export import export_bp
 
 
 import os
+import hashlib
+from functools import wraps
+from datetime import date, datetime
 from flask import Flask, send_from_directory
 
 
@@ -14,12 +24,21 @@ from flask import Flask, send_from_directory
 
 app = Flask(__name__)
 
+# max entries accepted by /api/log/batch
+LOG_BATCH_MAX = int(os.getenv("LOG_BATCH_MAX", 1000))
+# max page size for /api/logs?limit=
+LOGS_PAGE_MAX = int(os.getenv("LOGS_PAGE_MAX", 200))
+# /api/summary/range limits
+SUMMARY_RANGE_MAX_DAYS = int(os.getenv("SUMMARY_RANGE_MAX_DAYS", 1100))
+SUMMARY_RANGE_MAX_USERS = int(os.getenv("SUMMARY_RANGE_MAX_USERS", 100))
+
 CORS(app, supports_credentials=True)
 
 
 
 
 app.register_blueprint(workout_bp)
+app.register_blueprint(export_bp)
 
 
 # =====================================================
@@ -30,82 +49,131 @@ def home():
     return jsonify({"status": "Backend running"})
 
 
+# =====================================================
+# CACHE STATS
+# =====================================================
+@app.route("/api/stats")
+def api_stats():
+    return jsonify({
+        "food_catalog": food_catalog.stats(),
+        "parse_cache": parse_cache.stats(),
+        "log_writer": log_writer.stats(),
+        "profile_cache": profile_cache.stats(),
+        "conditional_get": dict(conditional_stats),
+        "workout_counters": today_counters.stats(),
+        "db_pool": get_pool().stats()
+    })
+
+
+@app.errorhandler(PoolTimeout)
+def pool_timeout(e):
+    print("ERROR db pool exhausted:", e)
+    return jsonify({"error": "Database busy, please retry"}), 503
+
+
 # =====================================================
 # HELPERS
 # =====================================================
+def fetch_user_profile(cur, user_id):
+    """Profile row on an open (dictionary) cursor, or the safe default"""
+    cur.execute(
+        "SELECT * FROM user_profiles WHERE user_id=%s",
+        (user_id,)
+    )
+    profile = cur.fetchone()
+    if not profile:
+        return {"user_id": user_id, **DEFAULT_PROFILE}
+    return profile
+
+
+# ---------- request-scoped connection ----------
+class _BorrowedConnection:
+    """The request's connection lent to a helper; close() keeps it open"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        pass
+
+
+def request_conn():
+    """
+    The connection @conditional checked out for this request (its ETag
+    probe already ran on it), else a fresh one from the pool.
+    """
+    conn = g.get("db_conn") if has_request_context() else None
+    return _BorrowedConnection(conn) if conn is not None else get_conn()
+
+
 def get_user_profile(user_id):
-    conn = get_conn()
+    conn = request_conn()
     try:
-        cur = conn.cursor(dictionary=True)
-        cur.execute(
-            "SELECT * FROM user_profiles WHERE user_id=%s",
-            (user_id,)
-        )
-        profile = cur.fetchone()
-
-        # 🛡️ SAFE DEFAULT PROFILE (IMPORTANT)
-        if not profile:
-            return {
-                "user_id": user_id,
-                "age": 25,
-                "height_cm": 170,
-                "weight_kg": 65,
-                "gender": "male",
-                "activity_level": "moderate",
-                "goal": "maintenance"
-            }
-
-        return profile
+        return fetch_user_profile(conn.cursor(dictionary=True), user_id)
     finally:
         conn.close()
 
 
+def get_profile_entry(user_id, cur=None):
+    """
+    Cached {"profile", "daily_target", "macro_targets"}.
+    On a miss the row is read on `cur` (or a fresh connection).
+    """
+    entry = profile_cache.get(user_id)
+    if entry is not None:
+        return entry
+    if cur is not None:
+        profile = fetch_user_profile(cur, user_id)
+    else:
+        profile = get_user_profile(user_id)
+    return profile_cache.put(user_id, profile)
+
+
 def get_today_totals(user_id):
-    conn = get_conn()
+    conn = request_conn()
     try:
-        cur = conn.cursor(dictionary=True)
-        cur.execute("""
-            SELECT
-                COALESCE(SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.calories') AS DECIMAL(10,2))),0) calories,
-                COALESCE(SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.protein') AS DECIMAL(10,2))),0) protein,
-                COALESCE(SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.carbs') AS DECIMAL(10,2))),0) carbs,
-                COALESCE(SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.fat') AS DECIMAL(10,2))),0) fat
-            FROM user_food_logs
-            WHERE user_id=%s AND DATE(timestamp)=CURDATE()
-        """, (user_id,))
-        r = cur.fetchone()
-        return {
-            "calories": float(r["calories"] or 0),
-            "protein": float(r["protein"] or 0),
-            "carbs": float(r["carbs"] or 0),
-            "fat": float(r["fat"] or 0),
-        }
+        return get_today_row(conn.cursor(dictionary=True), user_id)
     finally:
         conn.close()
 
 
 def get_last_7_days(user_id):
-    conn = get_conn()
+    conn = request_conn()
     try:
         cur = conn.cursor(dictionary=True)
-        cur.execute("""
-            SELECT
-                DATE(timestamp) day,
-                SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.calories') AS DECIMAL(10,2))) calories,
-                SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.protein') AS DECIMAL(10,2))) protein,
-                SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.carbs') AS DECIMAL(10,2))) carbs,
-                SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.fat') AS DECIMAL(10,2))) fat
-            FROM user_food_logs
-            WHERE user_id=%s
-              AND DATE(timestamp)>=DATE_SUB(CURDATE(),INTERVAL 6 DAY)
-            GROUP BY day
-            ORDER BY day
-        """, (user_id,))
-        return cur.fetchall()
+        return get_daily_rows(cur, user_id, 7)
     finally:
         conn.close()
 
 
+def macro_progress(consumed, targets):
+    def percent(v, t):
+        return min(int((v / t) * 100), 100) if t else 0
+
+    return {k: percent(consumed.get(k, 0), targets[k]) for k in targets}
+
+
+def weekly_stats(data, target):
+    met_days = sum(1 for d in data if d["calories"] and d["calories"] <= target)
+
+    avg = lambda k: round(
+        sum((d.get(k) or 0) for d in data) / 7, 2
+    )
+
+    return {
+        "average_calories": avg("calories"),
+        "average_protein": avg("protein"),
+        "average_carbs": avg("carbs"),
+        "average_fat": avg("fat"),
+        "consistency_percent": int((met_days / 7) * 100),
+        "status": "Good progress ✅" if met_days >= 5 else "Needs improvement ⚠️",
+        "days": data
+    }
+
+
 def generate_advice(consumed, target, goal):
     tips = []
     if consumed > target:
@@ -120,6 +188,85 @@ def generate_advice(consumed, target, goal):
     return tips
 
 
+# =====================================================
+# CONDITIONAL GET (ETag / If-None-Match)
+# =====================================================
+# newest log id + the DB's current day: changes on every saved log and
+# at midnight (today's totals reset) without touching the aggregates.
+# MAX(id) is one lookup on idx_food_logs_user_id (user_id, id).
+USER_VERSION_SQL = """
+    SELECT MAX(id), CURDATE()
+    FROM user_food_logs
+    WHERE user_id=%s
+"""
+
+conditional_stats = {"not_modified": 0, "full": 0, "errors": 0}
+
+
+def user_etag(conn, user_id, target=False, workout=False):
+    """Version stamp for one user's read endpoints (one indexed query on `conn`)"""
+    cur = conn.cursor()
+    cur.execute(USER_VERSION_SQL, (user_id,))
+    last_id, today = cur.fetchone()
+    parts = [request.full_path, user_id, last_id or 0, today]
+    if target:
+        entry = get_profile_entry(user_id, conn.cursor(dictionary=True))
+        parts.append(entry["daily_target"])
+
+    if workout:
+        parts.append(workout_version(user_id, conn))
+    return hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:24]
+
+
+def conditional(target=False, workout=False):
+    """
+    Answer If-None-Match with 304 before the view runs its queries.
+    The probe's connection stays checked out for the view (request_conn),
+    so a conditional GET still uses one pooled connection.
+    target: response depends on the profile's daily target
+    workout: response depends on today's workout log
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user_id = kwargs.get("user_id", request.args.get("user_id"))
+            conn = get_conn()
+            g.db_conn = conn
+            try:
+                return _conditional_response(conn, view, args, kwargs, user_id, target, workout)
+            finally:
+                g.pop("db_conn", None)
+                conn.close()
+        return wrapper
+    return decorator
+
+
+def _conditional_response(conn, view, args, kwargs, user_id, target, workout):
+    try:
+        tag = user_etag(conn, user_id, target, workout)
+    except PoolTimeout:
+        raise
+    except Exception as e:
+        conditional_stats["errors"] += 1
+        print("ERROR computing etag:", e)
+        return view(*args, **kwargs)
+
+    # weak comparison (RFC 9110): W/"tag", lists and * all match
+    if request.if_none_match.contains_weak(tag):
+        conditional_stats["not_modified"] += 1
+        response = make_response("", 304)
+        response.set_etag(tag)
+        return response
+
+    response = make_response(view(*args, **kwargs))
+    if response.status_code == 200:
+        conditional_stats["full"] += 1
+        response.set_etag(tag)
+        # browsers keep the body but revalidate every time
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 # =====================================================
 # UPDATE USER PROFILE
 # =====================================================
@@ -150,16 +297,18 @@ def update_profile():
             user_id
         ))
         conn.commit()
+
+        # write-through: re-read the stored row on the same connection
+        entry = profile_cache.put(user_id, fetch_user_profile(
+            conn.cursor(dictionary=True), user_id
+        ))
     finally:
         conn.close()
 
-    profile = get_user_profile(user_id)
-    daily_target = calculate_daily_calories(profile)
-
     return jsonify({
         "success": True,
-        "daily_target": daily_target,
-        "profile": profile
+        "daily_target": entry["daily_target"],
+        "profile": entry["profile"]
     })
 
 
@@ -174,132 +323,277 @@ def api_log():
         if not data or "text" not in data or "user_id" not in data:
             return jsonify({"success": False, "error": "Invalid payload"}), 400
 
-        parsed = parse_text(data["text"])
-        computed = compute_nutrients(parsed)
-
-        save_log(
-            data["user_id"],
-            data["text"],
-            parsed,
-            computed
-        )
+        # validate before anything is queued: the write-behind path has
+        # already answered success when the INSERT runs
+        try:
+            user_id = parse_log_user_id(data["user_id"])
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "Invalid user_id"}), 400
+        try:
+            ts = parse_log_timestamp(data.get("timestamp"))
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "Invalid timestamp"}), 400
+
+        parsed, computed = parse_and_compute(data["text"])
+
+        if LOG_WRITE_BEHIND:
+            # insert happens in the background; keep the request time
+            log_writer.submit((
+                user_id,
+                data["text"],
+                parsed,
+                computed,
+                ts or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            ))
+            return jsonify({"success": True, "queued": True})
+
+        if ts:
+            save_logs([(user_id, data["text"], parsed, computed, ts)])
+        else:
+            save_log(user_id, data["text"], parsed, computed)
 
         return jsonify({"success": True})
 
+    except LogQueueFull:
+        return jsonify({"success": False, "error": "Server busy, try again"}), 503
+
+    except PoolTimeout:
+        raise  # -> 503
     except Exception as e:
         print("ERROR in /api/log:", e)
         return jsonify({"success": False, "error": "Log failed"}), 500
 
-@app.route("/api/logs")
-def api_logs():
-    user_id = request.args.get("user_id")
-    conn = get_conn()
-    try:
-        cur = conn.cursor(dictionary=True)
-        cur.execute("""
-            SELECT id, raw_text, totals_json, timestamp
-            FROM user_food_logs
-            WHERE user_id=%s
-            ORDER BY timestamp DESC
-            LIMIT 10
-        """, (user_id,))
-        return jsonify({"success": True, "logs": cur.fetchall()})
-    finally:
-        conn.close()
+def parse_log_user_id(value):
+    """Positive int user_id (accepts "7"); anything else raises ValueError"""
+    if isinstance(value, bool):
+        raise ValueError("user_id must be a number")
+    user_id = int(value)
+    if user_id <= 0:
+        raise ValueError("user_id must be positive")
+    return user_id
+
+
+def parse_log_timestamp(value):
+    """ISO-8601 string -> naive 'YYYY-MM-DD HH:MM:SS' (None = now)"""
+    if value in (None, ""):
+        return None
+    ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone().replace(tzinfo=None)
+    return ts.strftime("%Y-%m-%d %H:%M:%S")
 
 
 # =====================================================
-# TODAY SUMMARY
+# BULK LOG FOOD
 # =====================================================
-import json
-from datetime import date
+@app.route("/api/log/batch", methods=["POST"])
+def api_log_batch():
+    data = request.get_json(silent=True)
+    entries = data.get("entries") if isinstance(data, dict) else data
 
-@app.route("/api/summary/today/<int:user_id>")
-def today_summary(user_id):
-    conn = get_conn()
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"success": False, "error": "Expected a non-empty 'entries' list"}), 400
+
+    if len(entries) > LOG_BATCH_MAX:
+        return jsonify({
+            "success": False,
+            "error": f"Too many entries (max {LOG_BATCH_MAX})"
+        }), 413
+
+    # 1️⃣ Validate every entry, keep per-entry errors
+    results = [None] * len(entries)
+    valid = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("text") or "user_id" not in entry:
+            results[i] = {"index": i, "success": False, "error": "Invalid entry"}
+            continue
+        try:
+            user_id = parse_log_user_id(entry["user_id"])
+        except (TypeError, ValueError):
+            results[i] = {"index": i, "success": False, "error": "Invalid user_id"}
+            continue
+        try:
+            ts = parse_log_timestamp(entry.get("timestamp"))
+        except (TypeError, ValueError):
+            results[i] = {"index": i, "success": False, "error": "Invalid timestamp"}
+            continue
+        valid.append((i, user_id, str(entry["text"]), ts))
+
+    # 2️⃣ Parse all texts (memoized, one shared catalog resolution)
+    texts = [text for _, _, text, _ in valid]
     try:
-        cur = conn.cursor(dictionary=True)
+        parsed_all = parse_and_compute_many(texts)
+    except Exception as e:
+        # find the text(s) that break the parser; the rest still get saved
+        print("ERROR in /api/log/batch parse, retrying one by one:", e)
+        parsed_all = []
+        for text in texts:
+            try:
+                parsed_all.append(parse_and_compute(text))
+            except Exception as e:
+                print("ERROR parsing batch entry:", e)
+                parsed_all.append(None)
+
+    rows = []
+    for (i, user_id, text, ts), result in zip(valid, parsed_all):
+        if result is None:
+            results[i] = {"index": i, "success": False, "error": "Could not parse text"}
+            continue
+        parsed, computed = result
+        rows.append((user_id, text, parsed, computed, ts))
+        results[i] = {
+            "index": i,
+            "success": True,
+            "totals": computed["totals"],
+            "unrecognized": [it["food"] for it in parsed if not it["recognized"]]
+        }
 
-        # 1️⃣ Fetch logs safely
-        cur.execute(
-            """
-            SELECT parsed_json
-            FROM user_food_logs
-            WHERE user_id = %s
-              AND DATE(timestamp) = CURDATE()
-            """,
-            (user_id,)
-        )
+    if not rows:
+        return jsonify({
+            "success": False,
+            "error": "No valid entries",
+            "saved": 0,
+            "failed": len(entries),
+            "results": results
+        }), 400
+
+    # 3️⃣ One multi-row insert, one transaction (only entries that passed 1️⃣ + 2️⃣)
+    try:
+        save_logs(rows)
+    except PoolTimeout:
+        raise  # -> 503
+    except Exception as e:
+        print("ERROR in /api/log/batch:", e)
+        return jsonify({"success": False, "error": "Batch insert failed"}), 500
+
+    return jsonify({
+        "success": True,
+        "saved": len(rows),
+        "failed": len(entries) - len(rows),
+        "results": results
+    })
 
-        rows = cur.fetchall()
 
-        # 2️⃣ Initialize totals
-        totals = {
-            "calories": 0,
-            "protein": 0,
-            "carbs": 0,
-            "fat": 0
-        }
+# ---------- /api/logs paging ----------
+# columns a caller may ask for with ?fields= (id + timestamp always come
+# back: they form the cursor)
+LOG_FIELDS = ("id", "timestamp", "raw_text", "parsed_json", "totals_json")
+DEFAULT_LOG_FIELDS = ("id", "raw_text", "totals_json", "timestamp")
 
-        # 3️⃣ Handle EMPTY case (VERY IMPORTANT)
-        if not rows:
-            return jsonify(totals)
 
+def logs_page_sql(fields=DEFAULT_LOG_FIELDS, after_cursor=False):
+    """
+    Newest-first page of a user's logs, keyed on (timestamp, id).
+    With a cursor the range starts on the (user_id, timestamp) index
+    instead of skipping OFFSET rows, so every page costs the same.
+    """
+    cursor_clause = (
+        "AND timestamp <= %s AND (timestamp < %s OR id < %s)"
+        if after_cursor else ""
+    )
+    return f"""
+        SELECT {", ".join(fields)}
+        FROM user_food_logs
+        WHERE user_id=%s {cursor_clause}
+        ORDER BY timestamp DESC, id DESC
+        LIMIT %s
+    """
 
-        # 4️⃣ Parse JSON safely
-        for row in rows:
-            try:
-                items = json.loads(row["parsed_json"])
-            except Exception:
-                continue
 
-            for item in items:
-                totals["calories"] += item.get("calories", 0)
-                totals["protein"] += item.get("protein", 0)
-                totals["carbs"] += item.get("carbs", 0)
-                totals["fat"] += item.get("fat", 0)
+def encode_log_cursor(row):
+    ts = row["timestamp"]
+    if isinstance(ts, datetime):
+        ts = ts.strftime("%Y-%m-%d %H:%M:%S")
+    return f"{ts},{row['id']}"
+
 
-        return jsonify(totals)
+def decode_log_cursor(value):
+    """'YYYY-MM-DD HH:MM:SS,<id>' -> (timestamp, id); ValueError if malformed"""
+    ts, _, log_id = str(value).rpartition(",")
+    ts = datetime.fromisoformat(ts).strftime("%Y-%m-%d %H:%M:%S")
+    return ts, int(log_id)
 
 
+@app.route("/api/logs")
+@conditional()
+def api_logs():
+    user_id = request.args.get("user_id")
+
+    try:
+        limit = min(max(int(request.args.get("limit", 10)), 1), LOGS_PAGE_MAX)
+        before = request.args.get("before")
+        cursor = decode_log_cursor(before) if before else None
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "Invalid limit or cursor"}), 400
+
+    fields = DEFAULT_LOG_FIELDS
+    if request.args.get("fields"):
+        wanted = [f.strip() for f in request.args["fields"].split(",") if f.strip()]
+        unknown = [f for f in wanted if f not in LOG_FIELDS]
+        if unknown:
+            return jsonify({
+                "success": False,
+                "error": f"Unknown fields: {', '.join(unknown)}"
+            }), 400
+        fields = tuple(f for f in LOG_FIELDS if f in ("id", "timestamp") or f in wanted)
+
+    params = [user_id]
+    if cursor:
+        ts, log_id = cursor
+        params += [ts, ts, log_id]
+    params.append(limit + 1)  # one extra row tells us if there is a next page
+
+    conn = request_conn()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute(logs_page_sql(fields, cursor is not None), params)
+        logs = cur.fetchall()
+    finally:
+        conn.close()
+
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+    return jsonify({
+        "success": True,
+        "logs": logs,
+        "next_cursor": encode_log_cursor(logs[-1]) if has_more else None
+    })
+
+
+# =====================================================
+# TODAY SUMMARY
+# =====================================================
+@app.route("/api/summary/today/<int:user_id>")
+@conditional()
+def today_summary(user_id):
+    try:
+        return jsonify(get_today_totals(user_id))
+
+    except PoolTimeout:
+        raise  # -> 503
     except Exception as e:
         # 🔥 TEMP debug (important)
         print("ERROR in today_summary:", e)
         return {"error": str(e)}, 500
 
-    finally:
-        conn.close()
-
 # =====================================================
 # MACRO SUMMARY
 # =====================================================
 @app.route("/api/summary/macros/<int:user_id>")
+@conditional(target=True)
 def macro_summary(user_id):
     try:
-        profile = get_user_profile(user_id)
+        targets = get_profile_entry(user_id)["macro_targets"]
         consumed = get_today_totals(user_id)
 
-        calories_target = calculate_daily_calories(profile) or 2000
-
-        targets = {
-            "calories": calories_target,
-            "protein": round((calories_target * 0.25) / 4, 1),
-            "carbs": round((calories_target * 0.45) / 4, 1),
-            "fat": round((calories_target * 0.30) / 9, 1)
-        }
-
-        def percent(v, t):
-            return min(int((v / t) * 100), 100) if t else 0
-
         return jsonify({
             "targets": targets,
             "consumed": consumed,
-            "progress": {
-                k: percent(consumed.get(k, 0), targets[k])
-                for k in targets
-            }
+            "progress": macro_progress(consumed, targets)
         })
 
+    except PoolTimeout:
+        raise  # -> 503
     except Exception as e:
         print("ERROR in macro_summary:", e)
         return jsonify({"error": "Macro summary failed"}), 500
@@ -309,29 +603,136 @@ def macro_summary(user_id):
 # WEEKLY SUMMARY
 # =====================================================
 @app.route("/api/summary/weekly/<int:user_id>")
+@conditional(target=True)
 def weekly_summary(user_id):
-    profile = get_user_profile(user_id)
-    target = calculate_daily_calories(profile)
+    target = get_profile_entry(user_id)["daily_target"]
     data = get_last_7_days(user_id)
 
-    met_days = sum(1 for d in data if d["calories"] and d["calories"] <= target)
+    return jsonify(weekly_stats(data, target))
 
-    avg = lambda k: round(
-        sum((d.get(k) or 0) for d in data) / 7, 2
+
+# =====================================================
+# RANGE SUMMARY (trend charts, coach views)
+# =====================================================
+@app.route("/api/summary/range")
+def range_summary():
+    """
+    ?user_id=1[&user_id=2 | user_id=1,2]&from=YYYY-MM-DD&to=YYYY-MM-DD
+     &bucket=day|week|month[&nutrients=calories,protein,...]
+    Served from user_daily_totals only: one row per user-day read, no
+    matter how many logs. The rollup is written in the same transaction
+    as every log, so today's partial bucket is already current.
+    """
+    args = request.args
+    try:
+        user_ids = [
+            int(u) for raw in args.getlist("user_id") for u in raw.split(",") if u.strip()
+        ]
+        end_day = date.fromisoformat(args["to"]) if args.get("to") else date.today()
+        start_day = date.fromisoformat(args["from"]) if args.get("from") else end_day
+    except (TypeError, ValueError):
+        return jsonify({"error": "user_id must be numeric, from/to YYYY-MM-DD"}), 400
+
+    bucket = args.get("bucket", "day")
+    columns = tuple(
+        n.strip() for n in args.get("nutrients", "calories,protein,carbs,fat").split(",") if n.strip()
     )
 
+    if not user_ids:
+        return jsonify({"error": "user_id is required"}), 400
+    if len(set(user_ids)) > SUMMARY_RANGE_MAX_USERS:
+        return jsonify({"error": f"Too many users (max {SUMMARY_RANGE_MAX_USERS})"}), 400
+    if bucket not in BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(BUCKETS)}"}), 400
+    unknown = [c for c in columns if c not in NUTRIENT_KEYS]
+    if unknown or not columns:
+        return jsonify({"error": f"Unknown nutrients: {', '.join(unknown)}"}), 400
+    if start_day > end_day:
+        return jsonify({"error": "from must not be after to"}), 400
+    if (end_day - start_day).days + 1 > SUMMARY_RANGE_MAX_DAYS:
+        return jsonify({"error": f"Range too long (max {SUMMARY_RANGE_MAX_DAYS} days)"}), 400
+
+    user_ids = list(dict.fromkeys(user_ids))
+    conn = get_conn()
+    try:
+        cur = conn.cursor(dictionary=True)
+        rows = get_range_rows(cur, user_ids, start_day, end_day, columns)
+    finally:
+        conn.close()
 
+    per_user = {uid: [] for uid in user_ids}
+    for row in rows:
+        per_user[int(row["user_id"])].append(row)
 
     return jsonify({
-        "average_calories": avg("calories"),
-        "average_protein": avg("protein"),
-        "average_carbs": avg("carbs"),
-        "average_fat": avg("fat"),
-        "consistency_percent": int((met_days / 7) * 100),
-        "status": "Good progress ✅" if met_days >= 5 else "Needs improvement ⚠️",
-        "days": data
+        "from": start_day.isoformat(),
+        "to": end_day.isoformat(),
+        "bucket": bucket,
+        "nutrients": list(columns),
+        "users": {
+            str(uid): bucket_rows(user_rows, start_day, end_day, bucket, columns)
+            for uid, user_rows in per_user.items()
+        }
     })
 
+
+# =====================================================
+# DASHBOARD (one request, one connection)
+# =====================================================
+@app.route("/api/dashboard/<int:user_id>")
+@conditional(target=True, workout=True)
+def dashboard(user_id):
+    """
+    Everything the dashboard shows: profile + target, today's totals,
+    macro progress, the 7-day series and burned calories.
+    At most two queries on one connection (one when the profile is
+    cached); today comes out of the 7-day rows. The sql workout store
+    reads today's totals on that same connection.
+    """
+    try:
+        conn = request_conn()
+        try:
+            cur = conn.cursor(dictionary=True)
+            entry = get_profile_entry(user_id, cur)
+            days = get_daily_rows(cur, user_id, 7, mark_today=True)
+            workout = today_workout_summary(user_id, conn)
+        finally:
+            conn.close()
+
+        today_row = {}
+        for d in days:
+            if d.pop("is_today"):
+                today_row = d
+        consumed = {
+            k: float(today_row.get(k) or 0)
+            for k in ("calories", "protein", "carbs", "fat")
+        }
+
+        target = entry["daily_target"]
+        targets = entry["macro_targets"]
+
+        return jsonify({
+            "user_id": user_id,
+            "profile": entry["profile"],
+            "daily_target": target,
+            "today": consumed,
+            "macros": {
+                "targets": targets,
+                "consumed": consumed,
+                "progress": macro_progress(consumed, targets)
+            },
+            "weekly": weekly_stats(days, target),
+            "workout": workout,
+            "net_calories": round(consumed["calories"] - workout["today_burned"], 2)
+        })
+
+    except PoolTimeout:
+        raise  # -> 503
+    except Exception as e:
+        print("ERROR in dashboard:", e)
+        return jsonify({"error": "Dashboard failed"}), 500
+
+
 # =====================================================
 # 🎯 TARGET-BASED FOOD RECOMMENDATION (FIXED)
 # =====================================================
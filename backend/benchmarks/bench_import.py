@@ -0,0 +1,85 @@
+# backend/benchmarks/bench_import.py
+"""
+Cold import-time check for the backend modules.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters,
+reports the median cumulative time and the heaviest imports, and exits
+non-zero when a module goes over its budget (so CI can catch a heavy
+import sneaking back into worker startup).
+
+Run from backend/:
+    python -m benchmarks.bench_import [--runs 5] [--budget physiqueneeds1=300]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> cumulative import budget in ms
+DEFAULT_BUDGETS = {
+    "physiqueneeds1": 300,
+    "app": 600,
+}
+
+# these must never be imported just by loading the module
+FORBIDDEN = {"spacy"}
+
+
+def import_profile(module):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cum_us, name = (p.strip() for p in line.replace("import time:", "|").split("|"))
+        rows.append((name, int(self_us), int(cum_us)))
+    return rows
+
+
+def measure(module, runs):
+    totals, last = [], []
+    for _ in range(runs):
+        last = import_profile(module)
+        totals.append(next(cum for name, _, cum in last if name == module))
+    return statistics.median(totals) / 1000, last
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget", action="append", default=[],
+                    help="module=ms, may be repeated")
+    args = ap.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in args.budget:
+        mod, ms = item.split("=")
+        budgets[mod] = float(ms)
+
+    failed = False
+    for module, budget in budgets.items():
+        median_ms, rows = measure(module, args.runs)
+        loaded = {name for name, _, _ in rows}
+        bad = sorted(FORBIDDEN & loaded)
+        over = median_ms > budget
+        failed |= over or bool(bad)
+
+        status = "FAIL" if over or bad else "ok"
+        print(f"[{status}] {module}: {median_ms:.1f} ms (budget {budget:.0f} ms)")
+        for name, _, cum in sorted(rows, key=lambda r: -r[2])[1:6]:
+            print(f"        {cum / 1000:8.1f} ms  {name}")
+        if bad:
+            print(f"        forbidden imports: {', '.join(bad)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# backend/benchmarks/bench_lexer.py
+"""
+Single-pass lexer vs. the previous regex loop in parse_text.
+
+Only the text -> {food, quantity, unit} stage is timed (no catalog
+lookups). The legacy loop is copied here verbatim for comparison.
+
+Run from backend/:
+    python -m benchmarks.bench_lexer [--meals 1 10 50 200]
+"""
+import argparse
+import random
+import re
+import time
+
+from physiqueneeds1 import (
+    NUMBER_WORDS, UNIT_LOOKUP, VERB_STOPWORDS,
+    clean_text, extract_items, parse_number, tokenize,
+)
+
+LEGACY_QUANTITY_PATTERN = re.compile(
+    r"(?P<num>\d+(\.\d+)?|\d+/\d+|"
+    + "|".join(NUMBER_WORDS.keys()) + ")"
+)
+LEGACY_UNIT_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(u) for u in UNIT_LOOKUP.keys()) + r")\b"
+)
+
+
+def legacy_extract(cleaned):
+    matches = []
+    for m in LEGACY_QUANTITY_PATTERN.finditer(cleaned):
+        qty = parse_number(m.group("num"))
+
+        unit_match = LEGACY_UNIT_PATTERN.search(cleaned, pos=m.end())
+        unit = None
+        unit_end = None
+        if unit_match and unit_match.start() - m.end() < 12:
+            unit = UNIT_LOOKUP.get(unit_match.group(0))
+            unit_end = unit_match.end()
+
+        food = None
+        start_pos = unit_end if unit_end else m.end()
+        after = cleaned[start_pos:start_pos + 40]
+
+        food_match = re.search(r"\b[a-zA-Z][a-zA-Z0-9]*\b", after)
+        if food_match:
+            food = food_match.group(0)
+        else:
+            before = cleaned[:m.start()]
+            words = re.findall(r"\b[a-zA-Z][a-zA-Z0-9]*\b", before)
+            if words:
+                food = words[-1]
+
+        if not food or food in VERB_STOPWORDS or food in UNIT_LOOKUP:
+            continue
+        matches.append({"food": food, "quantity": qty, "unit": unit})
+    return matches
+
+
+FOODS = ["idli", "dosa", "rice", "chapati", "sambar", "banana", "paneer", "dal", "curd", "poori"]
+QTYS = ["1", "2", "3", "half", "one", "two", "1/2", "1.5", "an"]
+UNITS = ["", "cup", "cups", "bowl", "pcs", "g", "slice"]
+
+
+def make_text(meals, rng):
+    parts = []
+    for _ in range(meals):
+        parts.append(rng.choice(["", "iniku", "morning", "i ate"]))
+        parts.append(" ".join(p for p in (rng.choice(QTYS), rng.choice(UNITS), rng.choice(FOODS)) if p))
+        parts.append(rng.choice(["and", "&", ",", "sapten"]))
+    return " ".join(p for p in parts if p)
+
+
+def bench(fn, cleaned, budget_s=0.5):
+    runs, t0 = 0, time.perf_counter()
+    while time.perf_counter() - t0 < budget_s:
+        fn(cleaned)
+        runs += 1
+    return runs / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--meals", type=int, nargs="+", default=[1, 10, 50, 200])
+    args = ap.parse_args()
+
+    rng = random.Random(5)
+    print(f"{'items':>6} {'chars':>7} {'legacy ops/s':>14} {'lexer ops/s':>13} {'speedup':>8}")
+    for meals in args.meals:
+        cleaned = clean_text(make_text(meals, rng))
+        old = bench(legacy_extract, cleaned)
+        new = bench(lambda t: extract_items(tokenize(t)), cleaned)
+        print(f"{meals:>6} {len(cleaned):>7} {old:>14.0f} {new:>13.0f} {new / old:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# backend/benchmarks/bench_parser.py
+"""
+Parser + nutrient computation benchmark over the synthetic corpus.
+
+No database is needed: physiqueneeds1 is pointed at an in-memory
+FoodCatalog built from benchmarks.corpus.fake_rows().
+
+For every case it reports ops/sec, p50/p99 latency and the mean peak
+allocation per op (tracemalloc, measured in a separate pass), then
+compares with benchmarks/baseline.json and exits 1 on a regression.
+Baselines are machine specific: refresh them with --save-baseline on
+the machine that runs the check.
+
+Run from backend/:
+    python -m benchmarks.bench_parser [--corpus 500] [--seconds 1]
+    python -m benchmarks.bench_parser --save-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import physiqueneeds1
+from benchmarks.corpus import fake_catalog, fake_rows, make_corpus
+from food_search import SuggestionIndex
+from parse_cache import ParseCache
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def install_fake_catalog(memo_size=0):
+    physiqueneeds1.food_catalog = fake_catalog(fake_rows(extra=500))
+    physiqueneeds1.suggestion_index = SuggestionIndex()
+    physiqueneeds1.parse_cache = ParseCache(maxsize=memo_size)
+    physiqueneeds1.food_catalog.ensure_fresh()
+
+
+def build_cases(corpus):
+    p = physiqueneeds1
+    resolved = {}
+    parsed = p.parse_texts(corpus, resolved)
+
+    def parse_and_compute_cold(text):
+        p.parse_cache.clear()
+        return p.parse_and_compute(text)
+
+    # (name, fn, inputs) - one op = fn(one input)
+    return [
+        ("lexer", lambda t: p.extract_items(p.tokenize(p.clean_text(t))), corpus),
+        ("parse_text", p.parse_text, corpus),
+        ("compute_nutrients", lambda items: p.compute_nutrients(items, resolved), parsed),
+        ("parse_and_compute_cold", parse_and_compute_cold, corpus),
+        ("parse_and_compute_memo", p.parse_and_compute, corpus),
+        ("compute_nutrients_many_x100",
+         lambda chunk: p.compute_nutrients_many(chunk, resolved),
+         [parsed[i:i + 100] for i in range(0, len(parsed), 100)]),
+    ]
+
+
+def run_case(fn, inputs, seconds):
+    lat = []
+    start = time.perf_counter()
+    while True:
+        for x in inputs:
+            t0 = time.perf_counter_ns()
+            fn(x)
+            lat.append(time.perf_counter_ns() - t0)
+        if time.perf_counter() - start >= seconds:
+            break
+    total_s = sum(lat) / 1e9
+    lat.sort()
+
+    tracemalloc.start()
+    peaks = []
+    for x in inputs:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(x)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(len(lat) / total_s, 1),
+        "p50_us": round(lat[len(lat) // 2] / 1000, 2),
+        "p99_us": round(lat[min(len(lat) - 1, int(len(lat) * 0.99))] / 1000, 2),
+        "alloc_kib": round(sum(peaks) / len(peaks) / 1024, 2),
+    }
+
+
+def regressions(name, now, base, tolerance):
+    out = []
+    if now["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+        out.append(f"ops/sec {now['ops_per_sec']} < {base['ops_per_sec']}")
+    # tail latency is noisier, allow twice the slack
+    if now["p99_us"] > base["p99_us"] * (1 + 2 * tolerance):
+        out.append(f"p99 {now['p99_us']}us > {base['p99_us']}us")
+    if now["alloc_kib"] > base["alloc_kib"] * (1 + tolerance) + 1:
+        out.append(f"alloc {now['alloc_kib']}KiB > {base['alloc_kib']}KiB")
+    return [f"{name}: {r}" for r in out]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", type=int, default=500)
+    ap.add_argument("--seconds", type=float, default=1.0)
+    ap.add_argument("--tolerance", type=float, default=0.30)
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true")
+    args = ap.parse_args()
+
+    corpus = make_corpus(args.corpus)
+    install_fake_catalog(memo_size=len(corpus))
+    items = sum(len(physiqueneeds1.parse_text(t)) for t in corpus)
+    print(f"corpus: {len(corpus)} texts, {items} parsed items\n")
+
+    results = {}
+    print(f"{'case':<30} {'ops/sec':>10} {'p50 us':>9} {'p99 us':>9} {'alloc KiB':>10}")
+    for name, fn, inputs in build_cases(corpus):
+        r = results[name] = run_case(fn, inputs, args.seconds)
+        print(f"{name:<30} {r['ops_per_sec']:>10} {r['p50_us']:>9} {r['p99_us']:>9} {r['alloc_kib']:>10}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nbaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nno baseline found, run with --save-baseline")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failures = [
+        msg
+        for name, now in results.items() if name in baseline
+        for msg in regressions(name, now, baseline[name], args.tolerance)
+    ]
+    if failures:
+        print("\nREGRESSIONS:")
+        for msg in failures:
+            print("  " + msg)
+        sys.exit(1)
+    print("\nno regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# backend/benchmarks/bench_suggest.py
+"""
+Fuzzy suggestion index vs. the old LIKE '%raw%' query.
+
+The SQL path runs the exact query from physiqueneeds1._query_suggest_foods
+against an in-memory SQLite copy of a synthetic 10k-food catalog (a local
+stand-in for MySQL, so network latency is NOT included here).
+
+Run from backend/:
+    python -m benchmarks.bench_suggest [--foods 10000] [--queries 2000]
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+
+from food_search import SuggestionIndex
+
+BASES = [
+    "idli", "dosa", "rice", "chapati", "poori", "upma", "pongal", "vada",
+    "sambar", "rasam", "paneer", "dal", "biryani", "parotta", "egg",
+    "chicken", "mutton", "fish", "curd", "banana", "apple", "oats",
+]
+PREFIXES = ["", "masala", "ghee", "rava", "onion", "plain", "spicy", "butter", "veg", "kara"]
+SUFFIXES = ["", "curry", "fry", "roast", "gravy", "special", "mini", "tikka"]
+
+
+def make_catalog(n, seed=7):
+    rng = random.Random(seed)
+    rows, seen = [], set()
+    while len(rows) < n:
+        parts = [rng.choice(PREFIXES), rng.choice(BASES), rng.choice(SUFFIXES)]
+        name = " ".join(p for p in parts if p)
+        if len(seen) >= len(PREFIXES) * len(BASES) * len(SUFFIXES):
+            name = f"{name} {len(rows)}"
+        if name in seen:
+            continue
+        seen.add(name)
+        rows.append({
+            "id": len(rows) + 1,
+            "food_name_singular": name,
+            "food_name_plural": name + "s",
+        })
+    return rows
+
+
+def typo(word, rng):
+    if len(word) < 3:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    op = rng.choice(["double", "drop", "swap"])
+    if op == "double":
+        return word[:i] + word[i] + word[i:]
+    if op == "drop":
+        return word[:i] + word[i + 1:]
+    return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+
+
+def make_queries(n, seed=11):
+    rng = random.Random(seed)
+    return [typo(rng.choice(BASES), rng) for _ in range(n)]
+
+
+def sqlite_catalog(rows):
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE foods (id INT, food_name_singular TEXT, food_name_plural TEXT)")
+    db.executemany(
+        "INSERT INTO foods VALUES (?, ?, ?)",
+        [(r["id"], r["food_name_singular"], r["food_name_plural"]) for r in rows],
+    )
+    return db
+
+
+def sql_suggest(db, raw, limit=5):
+    like = f"%{raw}%"
+    cur = db.execute("""
+        SELECT food_name_singular
+        FROM foods
+        WHERE food_name_singular LIKE ?
+           OR food_name_plural LIKE ?
+        LIMIT ?
+    """, (like, like, limit))
+    return [r[0] for r in cur.fetchall()]
+
+
+def timed(fn, queries):
+    lat, found = [], 0
+    for q in queries:
+        t0 = time.perf_counter()
+        out = fn(q)
+        lat.append((time.perf_counter() - t0) * 1e6)
+        found += bool(out)
+    lat.sort()
+    return {
+        "mean_us": round(statistics.fmean(lat), 1),
+        "p50_us": round(lat[len(lat) // 2], 1),
+        "p99_us": round(lat[int(len(lat) * 0.99) - 1], 1),
+        "found_pct": round(100 * found / len(queries), 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--foods", type=int, default=10000)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    rows = make_catalog(args.foods)
+    queries = make_queries(args.queries)
+
+    t0 = time.perf_counter()
+    idx = SuggestionIndex()
+    idx.sync(rows, 1)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    # incremental rebuild: 1% of the catalog changes
+    changed = rows[: len(rows) // 100]
+    new_rows = rows[len(rows) // 100:] + [
+        dict(r, food_name_singular=r["food_name_singular"] + " new",
+             food_name_plural=r["food_name_plural"] + " new")
+        for r in changed
+    ]
+    t0 = time.perf_counter()
+    idx.sync(new_rows, 2)
+    resync_ms = (time.perf_counter() - t0) * 1000
+
+    db = sqlite_catalog(rows)
+
+    print(f"catalog: {len(rows)} foods, {len(queries)} typo'd queries")
+    print(f"index build: {build_ms:.1f} ms, 1% incremental resync: {resync_ms:.1f} ms")
+    print("fuzzy index :", timed(idx.suggest, queries))
+    print("SQL LIKE    :", timed(lambda q: sql_suggest(db, q), queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# backend/benchmarks/corpus.py
+"""
+Synthetic meal-log corpus + an in-memory foods catalog.
+
+Texts mix English and Tamil-English fillers ("iniku", "sapten"),
+digits, decimals, fractions, number words, units, plurals, typos and
+unknown foods, with 1-30 items each. Everything is seeded, so the
+same arguments always produce the same corpus.
+"""
+import random
+
+from food_catalog import FoodCatalog
+from nutrients import NUTRIENT_COLUMNS
+
+FOODS = [
+    # singular, plural, per_100g, grams_per_unit
+    ("idli", "idlis", 0, 55), ("dosa", "dosas", 0, 90), ("vada", "vadas", 0, 50),
+    ("poori", "pooris", 0, 40), ("chapati", "chapatis", 0, 45), ("parotta", "parottas", 0, 80),
+    ("rice", "rice", 1, 200), ("sambar", "sambar", 1, 150), ("rasam", "rasam", 1, 150),
+    ("curd", "curd", 1, 150), ("dal", "dal", 1, 150), ("upma", "upma", 1, 180),
+    ("pongal", "pongal", 1, 200), ("biryani", "biryani", 1, 250), ("paneer", "paneer", 1, 100),
+    ("egg", "eggs", 0, 50), ("banana", "bananas", 0, 120), ("apple", "apples", 0, 180),
+    ("chicken", "chicken", 1, 150), ("fish", "fish", 1, 120), ("oats", "oats", 1, 40),
+    ("milk", "milk", 1, 250), ("coffee", "coffee", 0, 150), ("tea", "tea", 0, 150),
+]
+
+UNKNOWN = ["kozhukattai", "appam", "kesari", "bajji", "murukku", "paniyaram"]
+
+FILLERS = [
+    "i ate", "i had", "iniku", "morning", "evening", "night", "breakfast",
+    "lunch", "dinner", "snack", "today", "sapten", "sapidu", "saptinga", "consumed",
+]
+JOINERS = [" and ", " & ", ", ", " nd ", " "]
+QUANTITIES = ["1", "2", "3", "4", "1.5", "2.5", "1/2", "3/4", "one", "two",
+              "three", "half", "a", "an", "half a", "2 1/2"]
+UNITS = ["", "", "", "cup", "cups", "bowl", "pcs", "piece", "slice", "g", "tbsp"]
+
+
+def fake_rows(extra=0, seed=3):
+    """Full foods rows (all nutrient columns) for FOODS + `extra` fillers"""
+    rng = random.Random(seed)
+    names = list(FOODS) + [
+        (f"food{i}", f"food{i}s", i % 2, 100) for i in range(extra)
+    ]
+    rows = []
+    for i, (singular, plural, per_100g, grams) in enumerate(names, start=1):
+        row = {
+            "id": i,
+            "food_name_singular": singular,
+            "food_name_plural": plural,
+            "per_100g": per_100g,
+            "grams_per_unit": grams,
+            "unit_name": "cup" if per_100g else "piece",
+        }
+        for _, col in NUTRIENT_COLUMNS:
+            row[col] = round(rng.uniform(0, 200), 2)
+        rows.append(row)
+    return rows
+
+
+def fake_catalog(rows=None):
+    rows = rows if rows is not None else fake_rows()
+    return FoodCatalog(ttl=float("inf"), loader=lambda: ("bench", rows),
+                       version_probe=lambda: "bench")
+
+
+def typo(word, rng):
+    i = rng.randrange(1, len(word))
+    return word[:i] + word[i - 1] + word[i:]
+
+
+def make_item(rng):
+    singular, plural = rng.choice(FOODS)[:2]
+    roll = rng.random()
+    if roll < 0.05:
+        food = rng.choice(UNKNOWN)
+    elif roll < 0.08:
+        food = typo(singular, rng)
+    else:
+        food = rng.choice([singular, plural])
+
+    qty = rng.choice(QUANTITIES)
+    unit = rng.choice(UNITS)
+    if rng.random() < 0.15:
+        # "idli 4" style: food first
+        return " ".join(p for p in (food, qty, unit) if p)
+    if unit and rng.random() < 0.2:
+        unit += " of"
+    if unit == "g" and rng.random() < 0.5:
+        return f"{qty}g {food}" if qty[0].isdigit() and " " not in qty else f"{qty} g {food}"
+    return " ".join(p for p in (qty, unit, food) if p)
+
+
+def make_text(rng, min_items=1, max_items=30):
+    n = rng.randint(min_items, max_items)
+    parts = []
+    if rng.random() < 0.7:
+        parts.append(rng.choice(FILLERS))
+    for i in range(n):
+        if i:
+            parts.append(rng.choice(JOINERS).strip() or " ")
+        parts.append(make_item(rng))
+        if rng.random() < 0.2:
+            parts.append(rng.choice(FILLERS))
+    text = " ".join(p for p in parts if p.strip())
+    return text.upper() if rng.random() < 0.05 else text
+
+
+def make_corpus(size=500, seed=42, min_items=1, max_items=30):
+    rng = random.Random(seed)
+    return [make_text(rng, min_items, max_items) for _ in range(size)]
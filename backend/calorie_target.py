@@ -1,3 +1,15 @@
+import numpy as np
+
+ACTIVITY_MAP = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "heavy": 1.725
+}
+
+MIN_CALORIES = 1200
+
+
 def calculate_daily_calories(profile):
     """
     Single source of truth for daily calorie target.
@@ -28,14 +40,7 @@ def calculate_daily_calories(profile):
     # -----------------------------
     # ACTIVITY MULTIPLIER
     # -----------------------------
-    activity_map = {
-        "sedentary": 1.2,
-        "light": 1.375,
-        "moderate": 1.55,
-        "heavy": 1.725
-    }
-
-    multiplier = activity_map.get(activity, 1.55)
+    multiplier = ACTIVITY_MAP.get(activity, 1.55)
     tdee = bmr * multiplier
 
     # -----------------------------
@@ -51,5 +56,22 @@ def calculate_daily_calories(profile):
     # -----------------------------
     # SAFETY FLOOR
     # -----------------------------
-    MIN_CALORIES = 1200
     return int(max(calories, MIN_CALORIES))
+
+
+def calculate_daily_calories_many(profiles):
+    """
+    calculate_daily_calories for many profile dicts at once (numpy).
+    Same formula, defaults and floor; returns an int array.
+    """
+    weight = np.array([float(p.get("weight_kg") or 0) for p in profiles])
+    height = np.array([float(p.get("height_cm") or 0) for p in profiles])
+    age = np.array([int(p.get("age") or 0) for p in profiles], dtype=float)
+    male = np.array([p.get("gender", "male") == "male" for p in profiles], dtype=bool)
+    multiplier = np.array([ACTIVITY_MAP.get(p.get("activity_level", "moderate"), 1.55) for p in profiles])
+    goal = np.array([p.get("goal", "maintain") for p in profiles], dtype=object)
+
+    bmr = 10 * weight + 6.25 * height - 5 * age + np.where(male, 5, -161)
+    tdee = bmr * multiplier
+    calories = np.where(goal == "loss", tdee - 500, np.where(goal == "gain", tdee + 300, tdee))
+    return np.maximum(calories, MIN_CALORIES).astype(int)
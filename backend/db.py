@@ -1,8 +1,12 @@
 # backend/db.py
 
 import os
+import time
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
 import mysql.connector
-from mysql.connector import pooling
 
 # ====================================
 # MySQL ENV (Railway PUBLIC proxy)
@@ -13,36 +17,343 @@ DB_USER = os.getenv("MYSQLUSER")          # root
 DB_PASSWORD = os.getenv("MYSQLPASSWORD")
 DB_NAME = os.getenv("MYSQLDATABASE")
 
+# ====================================
+# Pool settings (ENV)
+# ====================================
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))      # max wait for a connection
+DB_POOL_MAX_AGE = float(os.getenv("DB_POOL_MAX_AGE", 1800))    # recycle older connections
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+# only ping connections idle at least this long (a ping is a round trip)
+DB_POOL_PRE_PING_AFTER = float(os.getenv("DB_POOL_PRE_PING_AFTER", 30))
+
+
+def connect_mysql():
+    return mysql.connector.connect(
+        host=DB_HOST,
+        port=DB_PORT,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME,
+
+        autocommit=True,
+
+        # ✅ CRITICAL FOR RAILWAY PUBLIC MYSQL
+        ssl_ca=None,
+        ssl_verify_cert=False,
+        ssl_verify_identity=False,
+    )
+
+
+class PoolTimeout(Exception):
+    """No connection became free before the checkout deadline"""
+
+
+class _Waiter:
+    __slots__ = ("event", "conn", "claimed")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None        # handed-over connection, or None = open one in a freed slot
+        self.claimed = False    # set (under the pool lock) when something was handed over
+
+
+class PooledConnection:
+    """Proxy handed to callers; close() returns the connection to the pool"""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._pool._release(self._raw, self._created_at)
+
+    def invalidate(self):
+        """Drop the connection instead of reusing it (e.g. unread streamed rows)"""
+        if not self._closed:
+            self._closed = True
+            self._pool._invalidate(self._raw)
+
+
+class ConnectionPool:
+    """
+    Fixed-size connection pool with a FIFO wait queue.
+
+    Callers that find every connection in use wait (in arrival order)
+    up to `timeout` seconds instead of failing straight away; a released
+    connection is handed directly to the oldest waiter. Idle connections
+    older than `max_age` are recycled, and `pre_ping` checks that one
+    idle for `pre_ping_after` seconds or more is still alive before
+    handing it out.
+    """
+
+    def __init__(self, connect=connect_mysql, size=DB_POOL_SIZE,
+                 timeout=DB_POOL_TIMEOUT, max_age=DB_POOL_MAX_AGE,
+                 pre_ping=DB_POOL_PRE_PING, pre_ping_after=DB_POOL_PRE_PING_AFTER,
+                 clock=time.monotonic):
+        if size <= 0:
+            raise ValueError("pool size must be positive")
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.pre_ping = pre_ping
+        self.pre_ping_after = pre_ping_after
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._idle = deque()        # (raw, created_at, idle_since)
+        self._waiters = deque()     # _Waiter, oldest first
+        self._open = 0              # connections that exist (idle + in use)
+        self._in_use = 0
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.reconnects = 0
+        self.max_in_use = 0
+        self.last_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._wait_ms_total = 0.0
+
+    # ---------------------------
+    # Checkout
+    # ---------------------------
+    def get_connection(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        t0 = self._clock()
+        item, create, waiter = None, False, None
+
+        with self._lock:
+            if self._idle and not self._waiters:
+                item = self._idle.pop()
+            elif self._open < self.size:
+                self._open += 1
+                create = True
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            item = self._wait(waiter, timeout)
+            create = item is None
+            if create:
+                with self._lock:
+                    self.reconnects += 1
+
+        item = self._new_connection() if create else self._checked(*item)
+
+        with self._lock:
+            self._in_use += 1
+            self.max_in_use = max(self.max_in_use, self._in_use)
+            self.checkouts += 1
+            if waiter is not None:
+                ms = (self._clock() - t0) * 1000
+                self.waits += 1
+                self.last_wait_ms = ms
+                self.max_wait_ms = max(self.max_wait_ms, ms)
+                self._wait_ms_total += ms
+
+        return PooledConnection(self, *item)
+
+    def _wait(self, waiter, timeout):
+        if waiter.event.wait(timeout):
+            return waiter.conn
+        with self._lock:
+            if waiter.claimed:
+                # handed over after our deadline: pass it on, don't leak it
+                self._hand_off(waiter.conn)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self.timeouts += 1
+        raise PoolTimeout(f"no database connection free after {timeout:.1f}s")
+
+    def _hand_off(self, item):
+        """
+        Give a connection, or a freed slot when `item` is None, to the
+        oldest waiter; with nobody waiting it goes idle / the slot closes.
+        Caller holds the lock, so a waiter is either still queued or
+        claimed, never in between.
+        """
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.conn = item
+            waiter.claimed = True
+            waiter.event.set()
+        elif item is None:
+            self._open -= 1
+        else:
+            self._idle.append((*item, self._clock()))
+
+    def _new_connection(self):
+        try:
+            return self._connect(), self._clock()
+        except Exception:
+            self._slot_lost()
+            raise
+
+    def _checked(self, raw, created_at, idle_since=None):
+        """Recycle a too-old or dead connection before handing it out"""
+        now = self._clock()
+        expired = self.max_age and now - created_at >= self.max_age
+        # just used (or handed straight over): skip the ping round trip
+        recent = idle_since is None or now - idle_since < self.pre_ping_after
+        if not expired and (not self.pre_ping or recent or self._alive(raw)):
+            return raw, created_at
+
+        self._discard(raw)
+        with self._lock:
+            self.reconnects += 1
+        return self._new_connection()
+
+    @staticmethod
+    def _alive(raw):
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ---------------------------
+    # Release
+    # ---------------------------
+    def _release(self, raw, created_at):
+        try:
+            if getattr(raw, "in_transaction", False):
+                raw.rollback()      # never hand out a half-done transaction
+        except Exception:
+            self._invalidate(raw)
+            return
+
+        with self._lock:
+            self._in_use -= 1
+            self._hand_off((raw, created_at))
+
+    def _invalidate(self, raw):
+        self._discard(raw)
+        with self._lock:
+            self._in_use -= 1
+        self._slot_lost()
+
+    def _slot_lost(self):
+        """
+        A connection went away (failed connect / broken on release).
+        If someone is queued the slot goes to the oldest waiter, which
+        opens a fresh connection itself rather than sit out its timeout.
+        """
+        with self._lock:
+            self._hand_off(None)
+
+    def close_idle(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+        for raw, *_ in idle:
+            self._discard(raw)
+
+    # ---------------------------
+    # Gauges
+    # ---------------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": len(self._waiters),
+                "max_in_use": self.max_in_use,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "reconnects": self.reconnects,
+                "last_wait_ms": round(self.last_wait_ms, 2),
+                "avg_wait_ms": round(self._wait_ms_total / self.waits, 2) if self.waits else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 2),
+            }
+
+
 # ====================================
 # Connection Pool (SSL REQUIRED)
 # ====================================
 _pool = None
+_pool_lock = threading.Lock()
 
 
 def get_pool():
     global _pool
 
     if _pool is None:
-        _pool = pooling.MySQLConnectionPool(
-            pool_name="physique_pool",
-            pool_size=5,
-
-            host=DB_HOST,
-            port=DB_PORT,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME,
-
-            autocommit=True,
-
-            # ✅ CRITICAL FOR RAILWAY PUBLIC MYSQL
-            ssl_ca=None,
-            ssl_verify_cert=False,
-            ssl_verify_identity=False,
-        )
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
 
     return _pool
 
 
 def get_conn():
     return get_pool().get_connection()
+
+
+# ====================================
+# Streaming reads
+# ====================================
+def stream_rows(connect, sql, params=(), fetch_size=500):
+    """
+    Yield the rows (dicts) of `sql` from an unbuffered cursor, `fetch_size`
+    per round trip, on a connection from `connect()`. If the consumer
+    stops early the connection is dropped (PooledConnection.invalidate)
+    rather than handed back to the pool with unread rows on it.
+    """
+    conn = connect()
+    finished = False
+    try:
+        cur = conn.cursor(dictionary=True, buffered=False)
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(fetch_size)
+            if not rows:
+                break
+            yield from rows
+        finished = True
+    finally:
+        if finished or not hasattr(conn, "invalidate"):
+            conn.close()
+        else:
+            conn.invalidate()
+
+
+def iso_timestamp(ts):
+    """DATETIME column (datetime, or a string from the stand-in) -> ISO-8601"""
+    if hasattr(ts, "isoformat"):
+        return ts.isoformat()
+    return str(ts).replace(" ", "T")
+
+
+# ====================================
+# Time ranges
+# ====================================
+def day_bounds(start_day, end_day=None):
+    """
+    Half-open [start 00:00, day after end 00:00) for whole days.
+    Compare as `timestamp >= %s AND timestamp < %s` so the index on
+    (user_id, timestamp) is usable - never wrap the column in DATE().
+    """
+    end_day = end_day or start_day
+    start = datetime(start_day.year, start_day.month, start_day.day)
+    end = datetime(end_day.year, end_day.month, end_day.day) + timedelta(days=1)
+    return start, end
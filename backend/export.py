@@ -0,0 +1,147 @@
+# backend/export.py
+import io
+import os
+import csv
+import json
+import heapq
+from datetime import date
+
+from flask import Blueprint, Response, request, jsonify
+
+from db import get_conn, day_bounds, iso_timestamp, stream_rows
+from workout import iter_workouts
+
+# -------------------------------------------------
+# Blueprint
+# -------------------------------------------------
+export_bp = Blueprint(
+    "export",
+    __name__,
+    url_prefix="/api/export"
+)
+
+# rows pulled from the server-side cursor per round trip
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", 500))
+
+CSV_COLUMNS = [
+    "type", "timestamp", "id", "raw_text",
+    "calories", "protein", "carbs", "fat",
+    "workout_name", "sets", "calories_per_set", "calories_burned",
+]
+
+
+def export_logs_sql(since=False, until=False):
+    return f"""
+        SELECT id, timestamp, raw_text, parsed_json, totals_json
+        FROM user_food_logs
+        WHERE user_id=%s
+          {"AND timestamp >= %s" if since else ""}
+          {"AND timestamp < %s" if until else ""}
+        ORDER BY timestamp, id
+    """
+
+
+# -------------------------------------------------
+# Sources (both already in time order)
+# -------------------------------------------------
+def _json(value):
+    if isinstance(value, (str, bytes, bytearray)):
+        return json.loads(value)
+    return value
+
+
+def food_records(user_id, start_day=None, end_day=None, fetch_size=None):
+    """
+    Stream food logs through an unbuffered cursor, `fetch_size` rows at a
+    time. If the consumer stops early the connection is dropped rather
+    than handed back to the pool with unread rows on it.
+    """
+    params = [user_id]
+    if start_day:
+        params.append(day_bounds(start_day)[0])
+    if end_day:
+        params.append(day_bounds(end_day)[1])
+
+    rows = stream_rows(get_conn, export_logs_sql(bool(start_day), bool(end_day)), params,
+                       fetch_size or EXPORT_FETCH_SIZE)
+    for row in rows:
+        computed = _json(row["totals_json"]) or {}
+        yield {
+            "type": "food",
+            "timestamp": iso_timestamp(row["timestamp"]),
+            "id": row["id"],
+            "raw_text": row["raw_text"],
+            "items": _json(row["parsed_json"]) or [],
+            "totals": computed.get("totals", {}),
+        }
+
+
+def workout_records(user_id, start_day=None, end_day=None):
+    for w in iter_workouts(user_id, start_day, end_day):
+        yield {
+            "type": "workout",
+            "timestamp": iso_timestamp(w.get("timestamp", w["date"])),
+            "workout_name": w.get("workout_name"),
+            "sets": w.get("sets"),
+            "calories_per_set": w.get("calories_per_set"),
+            "calories_burned": w.get("calories_burned", 0),
+        }
+
+
+def history_records(user_id, start_day=None, end_day=None):
+    """Food + workout records merged by timestamp, lazily"""
+    return heapq.merge(
+        food_records(user_id, start_day, end_day),
+        workout_records(user_id, start_day, end_day),
+        key=lambda r: r["timestamp"],
+    )
+
+
+# -------------------------------------------------
+# Encoders
+# -------------------------------------------------
+def ndjson_lines(records):
+    for r in records:
+        yield json.dumps(r, default=str) + "\n"
+
+
+def csv_lines(records):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+
+    def flush():
+        line = buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        return line
+
+    writer.writeheader()
+    yield flush()
+    for r in records:
+        writer.writerow(dict(r, **r.get("totals", {})))
+        yield flush()
+
+
+# -------------------------------------------------
+# GET: Full history export
+# -------------------------------------------------
+@export_bp.route("/<int:user_id>", methods=["GET"])
+def export_history(user_id):
+    """?format=ndjson|csv [&from=YYYY-MM-DD&to=YYYY-MM-DD]"""
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    try:
+        start_day = date.fromisoformat(request.args["from"]) if request.args.get("from") else None
+        end_day = date.fromisoformat(request.args["to"]) if request.args.get("to") else None
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+
+    records = history_records(user_id, start_day, end_day)
+    body = ndjson_lines(records) if fmt == "ndjson" else csv_lines(records)
+    mimetype = "application/x-ndjson" if fmt == "ndjson" else "text/csv"
+
+    return Response(body, mimetype=mimetype, headers={
+        "Content-Disposition": f"attachment; filename=physique_user_{user_id}.{fmt}",
+        "X-Accel-Buffering": "no",     # don't let a proxy buffer the stream
+    })
@@ -0,0 +1,187 @@
+# backend/food_catalog.py
+import os
+import time
+import threading
+
+from db import get_conn
+from nutrients import rows_matrix
+
+# ====================================
+# Catalog cache settings (ENV)
+# ====================================
+CATALOG_CACHE_ENABLED = os.getenv("FOOD_CATALOG_CACHE", "1") != "0"
+CATALOG_TTL_SECONDS = float(os.getenv("FOOD_CATALOG_TTL", 300))
+
+
+def normalize_name(name):
+    """Lowercase + collapse whitespace (matches the utf8mb4 *_ci compare)"""
+    return " ".join(str(name or "").lower().split())
+
+
+# -------------------------------------------------
+# DB loaders
+# -------------------------------------------------
+def fetch_catalog_version(conn=None):
+    """Cheap change stamp for the foods table"""
+    own = conn is None
+    conn = conn or get_conn()
+    try:
+        c = conn.cursor()
+        c.execute("CHECKSUM TABLE foods")
+        row = c.fetchone()
+        return row[1] if row else None
+    finally:
+        if own:
+            conn.close()
+
+
+def load_catalog_snapshot():
+    """Load the whole foods table + its version on ONE connection"""
+    conn = get_conn()
+    try:
+        version = fetch_catalog_version(conn)
+        c = conn.cursor(dictionary=True)
+        c.execute("SELECT * FROM foods ORDER BY id")
+        return version, c.fetchall()
+    finally:
+        conn.close()
+
+
+# -------------------------------------------------
+# Cache
+# -------------------------------------------------
+class FoodCatalog:
+    """
+    Process-local copy of the `foods` table.
+
+    Rows are keyed by normalized singular AND plural name, so a
+    lookup never leaves the process. Every `ttl` seconds the table
+    checksum is compared and the snapshot reloaded only if it moved.
+    """
+
+    def __init__(self, ttl=CATALOG_TTL_SECONDS,
+                 loader=load_catalog_snapshot,
+                 version_probe=fetch_catalog_version,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self._loader = loader
+        self._probe = version_probe
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._rows = []
+        self._by_name = {}
+        # (nutrients, {id(row): index}, rows) swapped as one unit
+        self._matrix = (rows_matrix([]), {}, [])
+        self._version = None
+        self._loaded = False
+        self._checked_at = 0.0
+
+        # bumps every time the cached content changes
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.version_checks = 0
+
+    # ---------------------------
+    # Refresh logic
+    # ---------------------------
+    def _fresh(self, now):
+        return self._loaded and now - self._checked_at < self.ttl
+
+    def _install(self, version, rows):
+        by_name = {}
+        for row in rows:
+            # first row (lowest id) wins, same as the old LIMIT 1 query
+            for key in ("food_name_singular", "food_name_plural"):
+                name = normalize_name(row.get(key))
+                if name:
+                    by_name.setdefault(name, row)
+
+        self._rows = list(rows)
+        self._by_name = by_name
+        self._matrix = (
+            rows_matrix(self._rows),
+            {id(row): i for i, row in enumerate(self._rows)},
+            self._rows,
+        )
+        self._version = version
+        self._loaded = True
+        self.generation += 1
+        self.loads += 1
+
+    def ensure_fresh(self):
+        now = self._clock()
+        if self._fresh(now):
+            return
+
+        with self._lock:
+            if self._fresh(now):
+                return
+
+            if self._loaded:
+                self.version_checks += 1
+                version = self._probe()
+                if version is not None and version == self._version:
+                    self._checked_at = now
+                    return
+
+            version, rows = self._loader()
+            self._install(version, rows)
+            self._checked_at = now
+
+    def invalidate(self):
+        """Force a full reload on the next lookup (call after editing foods)"""
+        with self._lock:
+            self._loaded = False
+            self._checked_at = 0.0
+
+    # ---------------------------
+    # Lookups
+    # ---------------------------
+    def get(self, name):
+        self.ensure_fresh()
+        row = self._by_name.get(normalize_name(name))
+        if row is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return row
+
+    def rows(self):
+        self.ensure_fresh()
+        return self._rows
+
+    def nutrient_matrix(self, rows):
+        """
+        Nutrient rows for `rows`, sliced from the cached catalog matrix.
+        Rows that did not come from this snapshot are converted on the fly.
+        """
+        matrix, positions, _ = self._matrix
+        idx = [positions.get(id(row)) for row in rows]
+        if None not in idx:
+            return matrix[idx]
+        return rows_matrix(rows)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._rows),
+            "generation": self.generation,
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "loads": self.loads,
+            "version_checks": self.version_checks,
+        }
+
+
+# shared per-process instance
+food_catalog = FoodCatalog()
+
+
+def invalidate_food_catalog():
+    food_catalog.invalidate()
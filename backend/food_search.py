@@ -0,0 +1,194 @@
+# backend/food_search.py
+import bisect
+import threading
+from collections import Counter
+
+from rapidfuzz import fuzz, process
+
+from food_catalog import normalize_name
+
+# ====================================
+# Fuzzy suggestion settings
+# ====================================
+NGRAM_SIZE = 3
+MAX_WORDS = 8            # vocabulary words kept per query word
+MAX_CANDIDATES = 50      # food names handed to the final scorer
+SCORE_CUTOFF = 60        # 0..100, lower = more forgiving
+
+
+def ngrams(text, n=NGRAM_SIZE):
+    """Padded character n-grams: 'idli' -> {' id', 'idl', 'dli', 'li '}"""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class SuggestionIndex:
+    """
+    In-memory fuzzy index over food names.
+
+    Distinct words are bucketed by n-gram. A query word is scored only
+    against the words sharing n-grams with it (so "idlly" still finds
+    "idli"), and the food names containing the best words are ranked
+    with rapidfuzz. Nothing scans the whole catalog.
+    """
+
+    def __init__(self, score_cutoff=SCORE_CUTOFF,
+                 max_words=MAX_WORDS, max_candidates=MAX_CANDIDATES):
+        self.score_cutoff = score_cutoff
+        self.max_words = max_words
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()        # one sync at a time; readers never wait
+
+        # (targets, names_by_word, buckets), replaced whole by sync() and
+        # never mutated once published, so a query reads one consistent index
+        #   targets:       name -> food_name_singular
+        #   names_by_word: word -> [(len, name)] shortest first
+        #   buckets:       ngram -> {word}
+        self._index = ({}, {}, {})
+        self.generation = None               # catalog generation last synced
+
+    def __len__(self):
+        return len(self._index[0])
+
+    # ---------------------------
+    # Build / incremental sync
+    # ---------------------------
+    def sync(self, rows, generation=None):
+        """Bring the index in line with `rows`, touching only changed names"""
+        if generation is not None and generation == self.generation:
+            return
+
+        wanted = {}
+        for row in rows:
+            target = row.get("food_name_singular")
+            for key in ("food_name_singular", "food_name_plural"):
+                name = normalize_name(row.get(key))
+                if name:
+                    wanted.setdefault(name, target)
+
+        with self._lock:
+            draft = _Draft(self._index)
+            for name in set(draft.targets) - set(wanted):
+                draft.remove(name)
+            for name, target in wanted.items():
+                if draft.targets.get(name) != target:
+                    draft.remove(name)
+                    draft.add(name, target)
+            self._index = draft.publish()      # one assignment: readers see old or new
+            self.generation = generation
+
+    # ---------------------------
+    # Query
+    # ---------------------------
+    def _similar_words(self, buckets, word):
+        counts = Counter()
+        for g in ngrams(word):
+            counts.update(buckets.get(g, ()))
+        shortlist = [w for w, _ in counts.most_common(self.max_words * 4)]
+        return process.extract(
+            word,
+            shortlist,
+            scorer=fuzz.ratio,
+            score_cutoff=self.score_cutoff,
+            limit=self.max_words,
+        )
+
+    def suggest(self, raw, limit=5):
+        query = normalize_name(raw)
+        if not query:
+            return []
+
+        targets, names_by_word, buckets = self._index    # one snapshot per query
+
+        # names containing the closest words, shortest names first
+        candidates, seen = [], set()
+        for qword in query.split():
+            for word, _score, _ in self._similar_words(buckets, qword):
+                for _, name in names_by_word.get(word, ())[:self.max_candidates]:
+                    if name not in seen:
+                        seen.add(name)
+                        candidates.append(name)
+        if not candidates:
+            return []
+
+        matches = process.extract(
+            query,
+            candidates[:self.max_candidates * 2],
+            scorer=fuzz.WRatio,
+            # singular + plural can both hit the same food
+            limit=limit * 2,
+        )
+
+        out = []
+        for name, _score, _ in matches:
+            target = targets.get(name)
+            if target and target not in out:
+                out.append(target)
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class _Draft:
+    """
+    Next version of a SuggestionIndex's structures. The top-level dicts
+    are copied up front (shallow); a word's name list or an n-gram bucket
+    is copied the first time this draft changes it, so the published
+    index is never written to.
+    """
+
+    def __init__(self, index):
+        self.targets, self.names_by_word, self.buckets = (dict(d) for d in index)
+        self._own_names = set()
+        self._own_buckets = set()
+
+    def _names(self, word):
+        if word not in self._own_names:
+            self._own_names.add(word)
+            self.names_by_word[word] = list(self.names_by_word.get(word, ()))
+        return self.names_by_word[word]
+
+    def _bucket(self, g):
+        if g not in self._own_buckets:
+            self._own_buckets.add(g)
+            self.buckets[g] = set(self.buckets.get(g, ()))
+        return self.buckets[g]
+
+    def add(self, name, target):
+        self.targets[name] = target
+        for word in set(name.split()):
+            names = self._names(word)
+            if not names:
+                for g in ngrams(word):
+                    self._bucket(g).add(word)
+            bisect.insort(names, (len(name), name))
+
+    def remove(self, name):
+        if self.targets.pop(name, None) is None:
+            return
+        for word in set(name.split()):
+            if word not in self.names_by_word:
+                continue
+            names = self._names(word)
+            names.remove((len(name), name))
+            if names:
+                continue
+            del self.names_by_word[word]
+            self._own_names.discard(word)
+            for g in ngrams(word):
+                if g not in self.buckets:
+                    continue
+                bucket = self._bucket(g)
+                bucket.discard(word)
+                if not bucket:
+                    del self.buckets[g]
+                    self._own_buckets.discard(g)
+
+    def publish(self):
+        return self.targets, self.names_by_word, self.buckets
+
+
+# shared per-process instance (kept in sync with food_catalog)
+suggestion_index = SuggestionIndex()
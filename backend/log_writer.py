@@ -0,0 +1,225 @@
+# backend/log_writer.py
+import os
+import time
+import queue
+import atexit
+import threading
+
+from physiqueneeds1 import save_logs
+
+# ====================================
+# Write-behind settings (ENV)
+# ====================================
+LOG_WRITE_BEHIND = os.getenv("LOG_WRITE_BEHIND", "0") == "1"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_QUEUE_FULL = os.getenv("LOG_QUEUE_FULL", "block")         # block | reject
+LOG_QUEUE_BLOCK_SECONDS = float(os.getenv("LOG_QUEUE_BLOCK_SECONDS", 2))
+LOG_FLUSH_BATCH = int(os.getenv("LOG_FLUSH_BATCH", 200))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", 0.5))
+LOG_FLUSH_RETRIES = int(os.getenv("LOG_FLUSH_RETRIES", 3))
+
+
+# wakes the flusher thread on close()
+_WAKE = object()
+
+
+class LogQueueFull(Exception):
+    """Raised by submit() when the queue is full (reject policy / block timeout)"""
+
+
+class LogWriter:
+    """
+    Write-behind queue for food logs.
+
+    submit() only enqueues; a background thread drains the queue in
+    batches through `sink` (save_logs: one multi-row INSERT per batch).
+    close() - also registered with atexit - flushes whatever is left.
+    """
+
+    def __init__(self, sink=save_logs, maxsize=LOG_QUEUE_SIZE,
+                 batch_size=LOG_FLUSH_BATCH, interval=LOG_FLUSH_INTERVAL,
+                 on_full=LOG_QUEUE_FULL, block_seconds=LOG_QUEUE_BLOCK_SECONDS,
+                 retries=LOG_FLUSH_RETRIES):
+        if on_full not in ("block", "reject"):
+            raise ValueError("on_full must be 'block' or 'reject'")
+
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self.on_full = on_full
+        self.block_seconds = block_seconds
+        self.retries = retries
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+
+        self.submitted = 0
+        self.written = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._flush_ms_total = 0.0
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def start(self):
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="log-writer", daemon=True
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def close(self, timeout=30):
+        """Stop the flusher thread and write everything still queued"""
+        self._stop.set()
+        if self._thread:
+            try:
+                self._queue.put_nowait(_WAKE)
+            except queue.Full:
+                pass  # flusher is busy anyway, it will see the stop flag
+            self._thread.join(timeout)
+            self._thread = None
+        # anything the thread did not get to (or if it never ran)
+        self._drain_all()
+
+    def flush(self, timeout=None):
+        """Block until every submitted log has been written (or dropped)"""
+        if not self._thread:
+            self._drain_all()
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    # ---------------------------
+    # Producer side
+    # ---------------------------
+    def submit(self, entry):
+        """entry: (user_id, raw_text, parsed_items, totals, timestamp)"""
+        if not self._thread:
+            self.start()
+        try:
+            if self.on_full == "block":
+                self._queue.put(entry, timeout=self.block_seconds)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            self.rejected += 1
+            raise LogQueueFull("food log queue is full")
+        self.submitted += 1
+
+    # ---------------------------
+    # Consumer side
+    # ---------------------------
+    def _take_batch(self, wait):
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                if wait and not batch:
+                    item = self._queue.get(timeout=wait)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _WAKE:
+                self._queue.task_done()
+                break
+            batch.append(item)
+        return batch
+
+    def _sink(self, batch):
+        """One attempt at writing `batch`; True if it went in"""
+        t0 = time.perf_counter()
+        try:
+            self.sink(batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            print("ERROR in log writer flush:", e)
+            return False
+
+        ms = (time.perf_counter() - t0) * 1000
+        self.last_flush_ms = ms
+        self.max_flush_ms = max(self.max_flush_ms, ms)
+        self._flush_ms_total += ms
+        self.batches += 1
+        self.written += len(batch)
+        return True
+
+    def _write(self, batch):
+        for attempt in range(self.retries + 1):
+            if self._sink(batch):
+                return
+            if attempt < self.retries and not self._stop.is_set():
+                time.sleep(min(0.1 * 2 ** attempt, 2))
+
+        if len(batch) > 1:
+            # one bad row fails the whole INSERT: write the rows one by one
+            # so only the rows that still fail are dropped
+            print(f"⚠️ log writer retrying {len(batch)} logs one at a time")
+            lost = [entry for entry in batch if not self._sink([entry])]
+        else:
+            lost = batch
+        if lost:
+            self.dropped += len(lost)
+            print(f"❌ log writer dropped {len(lost)} logs after {self.retries + 1} attempts")
+
+    def _process(self, batch):
+        try:
+            self._write(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._take_batch(self.interval)
+            if batch:
+                self._process(batch)
+
+    def _drain_all(self):
+        while True:
+            batch = self._take_batch(wait=None)
+            if batch:
+                self._process(batch)
+            elif self._queue.empty():
+                return
+
+    # ---------------------------
+    # Metrics
+    # ---------------------------
+    def stats(self):
+        return {
+            "enabled": LOG_WRITE_BEHIND,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "on_full": self.on_full,
+            "submitted": self.submitted,
+            "written": self.written,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "avg_flush_ms": round(self._flush_ms_total / self.batches, 2) if self.batches else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+
+# shared per-process instance (only started when LOG_WRITE_BEHIND=1)
+log_writer = LogWriter()
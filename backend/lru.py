@@ -0,0 +1,54 @@
+# backend/lru.py
+import threading
+from collections import OrderedDict
+
+
+class BoundedLRU:
+    """
+    Base for the in-process caches (parse, profile, workout counters):
+    an OrderedDict capped at `maxsize` entries, least recently used
+    evicted first, behind one lock, with hit / miss / eviction counts.
+
+    Subclasses decide what a key is and when an entry is stale; they
+    call _found() / _store() while holding self._lock.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _found(self, key, value):
+        """Count one lookup (value None = miss) and return value"""
+        if value is None:
+            self.misses += 1
+        else:
+            self._data.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def _store(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,217 @@
+# backend/migrate.py
+"""
+Versioned schema migrations.
+
+Migrations are plain SQL files in backend/migrations named
+NNNN_description.sql and applied in order; the applied versions are
+recorded in schema_migrations.
+
+    python migrate.py status          # applied / pending
+    python migrate.py up [--to N]     # apply pending migrations
+    python migrate.py explain         # EXPLAIN the hot queries, fail on full scans
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+from datetime import date
+
+from db import get_conn, day_bounds
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATIONS_DIR = os.path.join(BASE_DIR, "migrations")
+
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+# -------------------------------------------------
+# Discovery
+# -------------------------------------------------
+def discover(path=MIGRATIONS_DIR):
+    """[(version, name, sql, checksum)] sorted by version"""
+    found = []
+    for fname in sorted(os.listdir(path)):
+        m = MIGRATION_FILE.match(fname)
+        if not m:
+            continue
+        with open(os.path.join(path, fname)) as f:
+            sql = f.read()
+        found.append((
+            int(m.group(1)),
+            m.group(2),
+            sql,
+            hashlib.sha256(sql.encode()).hexdigest(),
+        ))
+
+    versions = [v for v, *_ in found]
+    if len(versions) != len(set(versions)):
+        raise SystemExit("❌ duplicate migration version numbers")
+    return found
+
+
+def split_statements(sql):
+    """Drop `--` comment lines and split on `;`"""
+    lines = [ln for ln in sql.splitlines() if not ln.strip().startswith("--")]
+    return [s.strip() for s in "\n".join(lines).split(";") if s.strip()]
+
+
+# -------------------------------------------------
+# Ledger
+# -------------------------------------------------
+def ensure_ledger(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cur):
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return {int(v): c for v, c in cur.fetchall()}
+
+
+def status(path=MIGRATIONS_DIR):
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        ensure_ledger(cur)
+        done = applied_versions(cur)
+    finally:
+        conn.close()
+
+    rows = []
+    for version, name, _, checksum in discover(path):
+        if version not in done:
+            state = "pending"
+        elif done[version] != checksum:
+            state = "applied (file changed since!)"
+        else:
+            state = "applied"
+        rows.append((version, name, state))
+    return rows
+
+
+def up(target=None, path=MIGRATIONS_DIR):
+    """Apply pending migrations (up to `target`); returns applied versions"""
+    conn = get_conn()
+    applied = []
+    try:
+        cur = conn.cursor()
+        ensure_ledger(cur)
+        done = applied_versions(cur)
+
+        for version, name, sql, checksum in discover(path):
+            if version in done or (target is not None and version > target):
+                continue
+            print(f"→ applying {version:04d}_{name}")
+            # MySQL DDL auto-commits, so each statement stands alone;
+            # a failure stops here and the migration stays pending.
+            for stmt in split_statements(sql):
+                cur.execute(stmt)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (version, name, checksum),
+            )
+            conn.commit()
+            applied.append(version)
+    finally:
+        conn.close()
+    return applied
+
+
+# -------------------------------------------------
+# EXPLAIN check
+# -------------------------------------------------
+def plan_checks(user_id=1):
+    """(name, sql, params) for the per-user hot paths"""
+    from app import DEFAULT_LOG_FIELDS, USER_VERSION_SQL, logs_page_sql
+    from export import export_logs_sql
+    from rollup import DAILY_ROWS_SQL, TODAY_ROW_SQL, range_rows_sql
+    from workout_db import (
+        DAY_TOTALS_SQL, VERSION_SQL, day_index_sql, range_sql as workout_range_sql,
+    )
+
+    # built by the same calls the routes make, with the params they pass
+    start, end = day_bounds(date.today())
+    return [
+        ("/api/logs first page", logs_page_sql(DEFAULT_LOG_FIELDS), (user_id, 11)),
+        ("/api/logs next page", logs_page_sql(DEFAULT_LOG_FIELDS, after_cursor=True),
+         (user_id, start, start, 2 ** 31 - 1, 11)),
+        ("etag version stamp", USER_VERSION_SQL, (user_id,)),
+        ("export day range", export_logs_sql(since=True, until=True), (user_id, start, end)),
+        ("today totals", TODAY_ROW_SQL, (user_id,)),
+        ("last 7 days", DAILY_ROWS_SQL.format(columns="calories", today_flag=""), (user_id, 6)),
+        # get_range_rows(): [from, to + 1 day) for two users
+        ("range summary", range_rows_sql(("calories",), 2),
+         (user_id, user_id + 1, start.date(), end.date())),
+        ("workout day totals", DAY_TOTALS_SQL, (user_id, start, end)),
+        ("workout version stamp", VERSION_SQL, (user_id, start, end)),
+        ("workout history", workout_range_sql(since=True, until=True), (user_id, start, end)),
+        ("workout day index", day_index_sql(since=True, until=True), (user_id, start, end)),
+    ]
+
+
+def full_scans(plan_rows):
+    """Plan rows that read a whole table (type=ALL or no usable key)"""
+    bad = []
+    for row in plan_rows:
+        if not row.get("table"):
+            continue  # "Impossible WHERE" / "No tables used"
+        if row.get("type") == "ALL" or row.get("key") is None:
+            bad.append(row)
+    return bad
+
+
+def explain(user_id=1):
+    """Print plans for the hot queries; returns the names that full-scan"""
+    failures = []
+    conn = get_conn()
+    try:
+        cur = conn.cursor(dictionary=True)
+        for name, sql, params in plan_checks(user_id):
+            cur.execute("EXPLAIN " + sql, params)
+            plan = cur.fetchall()
+            bad = full_scans(plan)
+            print(f"[{'FAIL' if bad else 'ok'}] {name}")
+            for row in plan:
+                print(f"      table={row.get('table')} type={row.get('type')} "
+                      f"key={row.get('key')} rows={row.get('rows')} extra={row.get('Extra')}")
+            if bad:
+                failures.append(name)
+    finally:
+        conn.close()
+    return failures
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Physique schema migrations")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("status")
+    p_up = sub.add_parser("up")
+    p_up.add_argument("--to", type=int, help="stop after this version")
+    p_ex = sub.add_parser("explain")
+    p_ex.add_argument("--user", type=int, default=1)
+    args = ap.parse_args()
+
+    if args.cmd == "status":
+        for version, name, state in status():
+            print(f"{version:04d}_{name:<40} {state}")
+    elif args.cmd == "up":
+        applied = up(args.to)
+        print(f"✅ applied {len(applied)} migration(s)" if applied else "✅ nothing to apply")
+    else:
+        failures = explain(args.user)
+        if failures:
+            print("❌ full table scans in: " + ", ".join(failures))
+            print("   (on a near-empty table the optimizer may still choose ALL;"
+                  " run against representative data)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+-- 0001: daily nutrition rollup (see rollup.py)
+-- Backfill after applying: python rollup.py rebuild
+CREATE TABLE IF NOT EXISTS user_daily_totals (
+    user_id INT NOT NULL,
+    day DATE NOT NULL,
+    log_count INT NOT NULL DEFAULT 0,
+    calories DOUBLE NOT NULL DEFAULT 0,
+    protein DOUBLE NOT NULL DEFAULT 0,
+    carbs DOUBLE NOT NULL DEFAULT 0,
+    fat DOUBLE NOT NULL DEFAULT 0,
+    fiber DOUBLE NOT NULL DEFAULT 0,
+    sugar DOUBLE NOT NULL DEFAULT 0,
+    sodium_mg DOUBLE NOT NULL DEFAULT 0,
+    cholesterol_mg DOUBLE NOT NULL DEFAULT 0,
+    calcium_mg DOUBLE NOT NULL DEFAULT 0,
+    iron_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminA_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB1_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB2_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB3_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB6_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB9_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB12_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminC_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminD_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminE_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminK_mcg DOUBLE NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day)
+);
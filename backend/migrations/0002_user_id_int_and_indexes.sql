@@ -0,0 +1,13 @@
+-- 0002: one user_id type everywhere + indexes for the per-user queries
+--
+-- user_food_logs.user_id was VARCHAR(100) while user_profiles.user_id is
+-- INT. Every route already takes an int user_id; this fails (strict mode)
+-- if a non-numeric user_id is stored, so clean those rows up first:
+--   SELECT DISTINCT user_id FROM user_food_logs WHERE user_id NOT REGEXP '^[0-9]+$';
+ALTER TABLE user_food_logs MODIFY user_id INT NOT NULL;
+
+-- serves WHERE user_id=? [AND timestamp >= ? AND timestamp < ?] ORDER BY timestamp
+ALTER TABLE user_food_logs ADD INDEX idx_food_logs_user_ts (user_id, timestamp);
+
+-- get_user_profile()
+ALTER TABLE user_profiles ADD INDEX idx_user_profiles_user (user_id);
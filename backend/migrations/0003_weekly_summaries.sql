@@ -0,0 +1,20 @@
+-- 0003: weekly digest output (see weekly_digest.py)
+
+-- the digest reads one week of user_daily_totals for every user
+ALTER TABLE user_daily_totals ADD INDEX idx_daily_totals_day (day);
+
+CREATE TABLE IF NOT EXISTS user_weekly_summaries (
+    user_id INT NOT NULL,
+    week_start DATE NOT NULL,
+    week_end DATE NOT NULL,
+    daily_target INT NOT NULL,
+    days_logged INT NOT NULL DEFAULT 0,
+    met_days INT NOT NULL DEFAULT 0,
+    average_calories DOUBLE NOT NULL DEFAULT 0,
+    average_protein DOUBLE NOT NULL DEFAULT 0,
+    average_carbs DOUBLE NOT NULL DEFAULT 0,
+    average_fat DOUBLE NOT NULL DEFAULT 0,
+    consistency_percent INT NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, week_start)
+);
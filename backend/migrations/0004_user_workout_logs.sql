@@ -0,0 +1,15 @@
+-- 0004: workouts in MySQL (workout_db.py, WORKOUT_STORE=sql)
+--
+-- Copy the existing workout_logs/ day files in afterwards with:
+--   python workout_db.py import
+CREATE TABLE IF NOT EXISTS user_workout_logs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    timestamp DATETIME(6) NOT NULL,
+    workout_name VARCHAR(200) NOT NULL DEFAULT '',
+    sets INT NOT NULL DEFAULT 0,
+    calories_per_set DOUBLE NOT NULL DEFAULT 0,
+    calories_burned DOUBLE NOT NULL DEFAULT 0,
+    -- serves WHERE user_id=? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp
+    INDEX idx_workout_logs_user_ts (user_id, timestamp)
+);
@@ -0,0 +1,5 @@
+-- 0005: ETag version probe (app.USER_VERSION_SQL)
+--
+-- SELECT MAX(id) ... WHERE user_id=? walks every index entry of the user
+-- on (user_id, timestamp); on (user_id, id) it is a single lookup.
+ALTER TABLE user_food_logs ADD INDEX idx_food_logs_user_id (user_id, id);
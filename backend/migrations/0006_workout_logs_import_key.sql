@@ -0,0 +1,10 @@
+-- 0006: re-runnable workout import (workout_db.import_files)
+--
+-- Imported rows remember which day file line they came from; INSERT IGNORE
+-- on this key skips lines already copied instead of deleting the day, so
+-- rows the API wrote straight to MySQL are left alone. API rows keep NULLs,
+-- which a UNIQUE key never treats as equal.
+ALTER TABLE user_workout_logs
+    ADD COLUMN source_day DATE NULL,
+    ADD COLUMN source_seq INT NULL,
+    ADD UNIQUE KEY uq_workout_logs_source (user_id, source_day, source_seq);
@@ -83,9 +83,80 @@ UPDATE foods SET per_100g = 1 WHERE id = 2;
 DROP TABLE IF EXISTS user_food_logs;
 CREATE TABLE user_food_logs (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    user_id VARCHAR(100) NOT NULL,
+    user_id INT NOT NULL,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     raw_text TEXT,
     parsed_json JSON,
-    totals_json JSON
+    totals_json JSON,
+    INDEX idx_food_logs_user_ts (user_id, timestamp),
+    INDEX idx_food_logs_user_id (user_id, id)
+);
+
+-- Existing databases: apply backend/migrations with `python migrate.py up`.
+
+-- Per-user daily rollup, maintained by save_log/save_logs in the same
+-- transaction as the log insert. Rebuild with: python rollup.py rebuild
+DROP TABLE IF EXISTS user_daily_totals;
+CREATE TABLE user_daily_totals (
+    user_id INT NOT NULL,
+    day DATE NOT NULL,
+    log_count INT NOT NULL DEFAULT 0,
+    calories DOUBLE NOT NULL DEFAULT 0,
+    protein DOUBLE NOT NULL DEFAULT 0,
+    carbs DOUBLE NOT NULL DEFAULT 0,
+    fat DOUBLE NOT NULL DEFAULT 0,
+    fiber DOUBLE NOT NULL DEFAULT 0,
+    sugar DOUBLE NOT NULL DEFAULT 0,
+    sodium_mg DOUBLE NOT NULL DEFAULT 0,
+    cholesterol_mg DOUBLE NOT NULL DEFAULT 0,
+    calcium_mg DOUBLE NOT NULL DEFAULT 0,
+    iron_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminA_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB1_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB2_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB3_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB6_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB9_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminB12_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminC_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminD_mcg DOUBLE NOT NULL DEFAULT 0,
+    vitaminE_mg DOUBLE NOT NULL DEFAULT 0,
+    vitaminK_mcg DOUBLE NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day),
+    INDEX idx_daily_totals_day (day)
+);
+
+-- Weekly digest for every user, written by: python weekly_digest.py
+DROP TABLE IF EXISTS user_weekly_summaries;
+CREATE TABLE user_weekly_summaries (
+    user_id INT NOT NULL,
+    week_start DATE NOT NULL,
+    week_end DATE NOT NULL,
+    daily_target INT NOT NULL,
+    days_logged INT NOT NULL DEFAULT 0,
+    met_days INT NOT NULL DEFAULT 0,
+    average_calories DOUBLE NOT NULL DEFAULT 0,
+    average_protein DOUBLE NOT NULL DEFAULT 0,
+    average_carbs DOUBLE NOT NULL DEFAULT 0,
+    average_fat DOUBLE NOT NULL DEFAULT 0,
+    consistency_percent INT NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, week_start)
+);
+
+-- Workouts when WORKOUT_STORE=sql (default is workout_logs/ day files).
+-- Import the files with: python workout_db.py import
+DROP TABLE IF EXISTS user_workout_logs;
+CREATE TABLE user_workout_logs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    timestamp DATETIME(6) NOT NULL,
+    workout_name VARCHAR(200) NOT NULL DEFAULT '',
+    sets INT NOT NULL DEFAULT 0,
+    calories_per_set DOUBLE NOT NULL DEFAULT 0,
+    calories_burned DOUBLE NOT NULL DEFAULT 0,
+    source_day DATE NULL,
+    source_seq INT NULL,
+    INDEX idx_workout_logs_user_ts (user_id, timestamp),
+    UNIQUE KEY uq_workout_logs_source (user_id, source_day, source_seq)
 );
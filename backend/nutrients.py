@@ -0,0 +1,54 @@
+# backend/nutrients.py
+import numpy as np
+
+# ====================================
+# totals key  ->  foods column
+# ====================================
+NUTRIENT_COLUMNS = [
+    ("calories", "calories_per_unit"),
+    ("protein", "protein_per_unit"),
+    ("carbs", "carbs_per_unit"),
+    ("fat", "fat_per_unit"),
+    ("fiber", "fiber_per_unit"),
+    ("sugar", "sugar_per_unit"),
+    ("sodium_mg", "sodium_per_unit_mg"),
+    ("cholesterol_mg", "cholesterol_per_unit_mg"),
+    ("calcium_mg", "calcium_per_unit_mg"),
+    ("iron_mg", "iron_per_unit_mg"),
+    ("vitaminA_mcg", "vitaminA_mcg"),
+    ("vitaminB1_mg", "vitaminB1_mg"),
+    ("vitaminB2_mg", "vitaminB2_mg"),
+    ("vitaminB3_mg", "vitaminB3_mg"),
+    ("vitaminB6_mg", "vitaminB6_mg"),
+    ("vitaminB9_mcg", "vitaminB9_mcg"),
+    ("vitaminB12_mcg", "vitaminB12_mcg"),
+    ("vitaminC_mg", "vitaminC_mg"),
+    ("vitaminD_mcg", "vitaminD_mcg"),
+    ("vitaminE_mg", "vitaminE_mg"),
+    ("vitaminK_mcg", "vitaminK_mcg"),
+]
+
+NUTRIENT_KEYS = [k for k, _ in NUTRIENT_COLUMNS]
+
+
+def rows_matrix(rows):
+    """foods rows -> float matrix, one row per food, one column per nutrient"""
+    if not rows:
+        return np.zeros((0, len(NUTRIENT_COLUMNS)))
+    return np.array(
+        [[float(row.get(col) or 0) for _, col in NUTRIENT_COLUMNS] for row in rows],
+        dtype=np.float64,
+    )
+
+
+def item_factor(item, row):
+    """How many catalog 'units' one parsed item is worth"""
+    qty = item["quantity"]
+    if row.get("per_100g") == 1:
+        grams = qty if item["unit"] == "g" else qty * row["grams_per_unit"]
+        return grams / 100
+    return qty
+
+
+def totals_dict(vector):
+    return {k: round(float(v), 4) for k, v in zip(NUTRIENT_KEYS, vector)}
@@ -0,0 +1,59 @@
+# backend/parse_cache.py
+import os
+import json
+
+from lru import BoundedLRU
+
+# ====================================
+# Parse memo settings (ENV)
+# ====================================
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", 2048))
+
+
+class ParseCache(BoundedLRU):
+    """
+    Bounded LRU of (parsed_items, computed) keyed by cleaned text.
+
+    Entries are only valid for one food catalog generation; the first
+    lookup with a newer generation drops everything.
+    """
+
+    def __init__(self, maxsize=PARSE_CACHE_SIZE):
+        super().__init__(maxsize)
+        self.generation = None
+        self.invalidations = 0
+
+    def _check_generation(self, generation):
+        if generation != self.generation:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self.generation = generation
+
+    def get(self, key, generation):
+        if self.maxsize <= 0 or generation is None:
+            return None
+        with self._lock:
+            self._check_generation(generation)
+            value = self._found(key, self._data.get(key))
+        if value is None:
+            return None
+        # stored as JSON: every caller gets its own fresh copy, far
+        # cheaper than deepcopy
+        return tuple(json.loads(value))
+
+    def put(self, key, generation, value):
+        if self.maxsize <= 0 or generation is None:
+            return
+        value = json.dumps(value)
+        with self._lock:
+            self._check_generation(generation)
+            self._store(key, value)
+
+    def stats(self):
+        return dict(super().stats(), generation=self.generation,
+                    invalidations=self.invalidations)
+
+
+# shared per-process instance
+parse_cache = ParseCache()
@@ -1,18 +1,52 @@
+import os
 import re
 import json
+import threading
 from typing import List, Dict, Any
-import spacy
 
-from rapidfuzz import fuzz
+import numpy as np
+
 from db import get_conn
+from food_catalog import CATALOG_CACHE_ENABLED, food_catalog, normalize_name
+from food_search import suggestion_index
+from nutrients import item_factor, totals_dict
+from parse_cache import parse_cache
+from rollup import add_to_rollup
 
 # -----------------------------
-# Load SpaCy safely
+# SpaCy (lazy + optional)
 # -----------------------------
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    nlp = spacy.blank("en")
+# Nothing is imported or loaded until a parsing mode calls get_nlp(),
+# so workers start fast. PHYSIQUE_NLP=0 turns it off completely.
+NLP_ENABLED = os.getenv("PHYSIQUE_NLP", "1") != "0"
+NLP_MODEL = os.getenv("PHYSIQUE_NLP_MODEL", "en_core_web_sm")
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """Return the SpaCy pipeline, loading it on first use (None if disabled)"""
+    global _nlp
+    if not NLP_ENABLED:
+        return None
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                try:
+                    import spacy
+                except ImportError:
+                    return None
+                try:
+                    _nlp = spacy.load(NLP_MODEL)
+                except OSError:
+                    _nlp = spacy.blank("en")
+    return _nlp
+
+def __getattr__(name):
+    # keeps `from physiqueneeds1 import nlp` working, but lazily
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # -----------------------------
 # STOPWORDS
@@ -39,13 +73,8 @@ NUMBER_WORDS = {
 }
 
 # -----------------------------
-# Regex Patterns
+# Units
 # -----------------------------
-QUANTITY_PATTERN = re.compile(
-    r"(?P<num>\d+(\.\d+)?|\d+/\d+|"
-    + "|".join(NUMBER_WORDS.keys()) + ")"
-)
-
 UNIT_ALIASES = {
     "piece": ["piece", "pieces", "pc", "pcs"],
     "cup": ["cup", "cups"],
@@ -59,10 +88,30 @@ UNIT_ALIASES = {
 
 UNIT_LOOKUP = {v: k for k, lst in UNIT_ALIASES.items() for v in lst}
 
-UNIT_PATTERN = re.compile(
-    r"\b(" + "|".join(re.escape(u) for u in UNIT_LOOKUP.keys()) + r")\b"
+# words skipped between a quantity/unit and its food ("2 cups of rice")
+FILLER_WORDS = {"of"}
+
+# -----------------------------
+# Lexer
+# -----------------------------
+# One pass over the cleaned text; every token is (kind, text, value)
+T_NUM, T_UNIT, T_WORD, T_SEP = "num", "unit", "word", "sep"
+
+TOKEN_PATTERN = re.compile(
+    r"(?P<num>\d+/\d+|\d+(?:\.\d+)?)"
+    r"|(?P<word>[a-z][a-z0-9]*)"
+    r"|(?P<sep>[,;.!?])"
 )
 
+DIGIT_ALPHA_PATTERN = re.compile(r"(\d)([a-zA-Z])")
+
+# pre-classified words: number words, units and (dropped) stopwords
+KEYWORD_TOKENS = {
+    **{w: None for w in VERB_STOPWORDS},
+    **{w: (T_UNIT, w, u) for w, u in UNIT_LOOKUP.items()},
+    **{w: (T_NUM, w, v) for w, v in NUMBER_WORDS.items()},
+}
+
 # -----------------------------
 # Number parser
 # -----------------------------
@@ -85,6 +134,11 @@ def parse_number(text: str) -> float:
 # DB helpers
 # -----------------------------
 def get_food_by_name(name: str):
+    if CATALOG_CACHE_ENABLED:
+        return food_catalog.get(name)
+    return _query_food_by_name(name)
+
+def _query_food_by_name(name: str):
     conn = get_conn()
     try:
         c = conn.cursor(dictionary=True)
@@ -98,7 +152,90 @@ def get_food_by_name(name: str):
     finally:
         conn.close()
 
+def resolve_foods(names) -> Dict[str, Any]:
+    """Resolve many food names at once -> {name: row or None}"""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    # cached catalog: every lookup is an in-process dict hit
+    if CATALOG_CACHE_ENABLED:
+        return {n: get_food_by_name(n) for n in names}
+
+    # no cache: ONE round trip for the whole parse
+    keys = list(dict.fromkeys(normalize_name(n) for n in names))
+    marks = ",".join(["%s"] * len(keys))
+    conn = get_conn()
+    try:
+        c = conn.cursor(dictionary=True)
+        c.execute(f"""
+            SELECT * FROM foods
+            WHERE food_name_singular IN ({marks})
+               OR food_name_plural IN ({marks})
+            ORDER BY id
+        """, (*keys, *keys))
+        rows = c.fetchall()
+    finally:
+        conn.close()
+
+    by_name = {}
+    for row in rows:
+        for key in ("food_name_singular", "food_name_plural"):
+            by_name.setdefault(normalize_name(row.get(key)), row)
+
+    return {n: by_name.get(normalize_name(n)) for n in names}
+
 def suggest_foods(raw: str, limit: int = 5):
+    if not CATALOG_CACHE_ENABLED:
+        return _query_suggest_foods(raw, limit)
+
+    rows = food_catalog.rows()
+    suggestion_index.sync(rows, food_catalog.generation)
+    return suggestion_index.suggest(raw, limit)
+
+def suggest_foods_many(names, limit: int = 5) -> Dict[str, List[str]]:
+    """suggest_foods for many names -> {name: [suggestions]}"""
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    if CATALOG_CACHE_ENABLED:
+        # in-process index: nothing to batch
+        return {n: suggest_foods(n, limit) for n in names}
+    return _query_suggest_foods_many(names, limit)
+
+def suggest_many_sql(n_names: int) -> str:
+    """The first `limit` LIKE matches per name (ROW_NUMBER), for n names at once"""
+    names = " UNION ALL ".join(["SELECT %s AS name, %s AS pattern"] * n_names)
+    return f"""
+        SELECT name, food_name_singular FROM (
+            SELECT q.name, f.food_name_singular,
+                   ROW_NUMBER() OVER (PARTITION BY q.name ORDER BY f.id) AS n
+            FROM ({names}) q
+            JOIN foods f
+              ON f.food_name_singular LIKE q.pattern
+              OR f.food_name_plural LIKE q.pattern
+        ) ranked
+        WHERE n <= %s
+        ORDER BY name, n
+    """
+
+def _query_suggest_foods_many(names, limit):
+    # no cache: ONE round trip for every unrecognized name of the parse
+    params = [p for n in names for p in (n, f"%{n}%")]
+    conn = get_conn()
+    try:
+        c = conn.cursor()
+        c.execute(suggest_many_sql(len(names)), (*params, limit))
+        rows = c.fetchall()
+    finally:
+        conn.close()
+
+    out = {n: [] for n in names}
+    for name, food in rows:
+        out[name].append(food)
+    return out
+
+def _query_suggest_foods(raw: str, limit: int = 5):
     conn = get_conn()
     try:
         c = conn.cursor()
@@ -115,47 +252,87 @@ def suggest_foods(raw: str, limit: int = 5):
         conn.close()
 
 # ----------------------------------------------------------
-# PARSER (ONLY ERROR FIX APPLIED)
+# PARSER
 # ----------------------------------------------------------
-def parse_text(text: str) -> List[Dict[str, Any]]:
+def clean_text(text: str) -> str:
     lowered = text.lower()
 
     # ✅ FIX: split number+unit → 1cup → 1 cup
-    lowered = re.sub(r"(\d)([a-zA-Z])", r"\1 \2", lowered)
+    lowered = DIGIT_ALPHA_PATTERN.sub(r"\1 \2", lowered)
 
     lowered = lowered.replace(" and ", ",").replace("&", ",")
 
-    cleaned = " ".join(
+    return " ".join(
         w for w in lowered.split()
         if w not in VERB_STOPWORDS
     )
 
+def tokenize(cleaned: str) -> List[tuple]:
+    tokens = []
+    append = tokens.append
+    for m in TOKEN_PATTERN.finditer(cleaned):
+        kind = m.lastgroup
+        tok = m.group(kind)
+        if kind == "word":
+            if tok in KEYWORD_TOKENS:
+                keyword = KEYWORD_TOKENS[tok]
+                if keyword:
+                    append(keyword)
+            else:
+                append((T_WORD, tok, None))
+        elif kind == "num":
+            append((T_NUM, tok, parse_number(tok)))
+        else:
+            append((T_SEP, tok, None))
+    return tokens
+
+def extract_items(tokens: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Group tokens into {food, quantity, unit} with a small state machine:
+        QUANTITY [a|an|fraction] [UNIT] [of] FOOD
+    If no food follows the quantity ("rice 2 cups"), the last word
+    before it is used instead.
+    """
     matches = []
+    last_word = None
+    i, n = 0, len(tokens)
 
-    for m in QUANTITY_PATTERN.finditer(cleaned):
-        qty = parse_number(m.group("num"))
+    while i < n:
+        kind, tok, value = tokens[i]
+        i += 1
+
+        if kind == T_WORD:
+            last_word = tok
+            continue
+        if kind != T_NUM:
+            continue
+
+        # quantity: "half a" → 0.5, "2 1/2" → 2.5
+        qty = value
+        if i < n and tokens[i][0] == T_NUM:
+            nxt_tok, nxt_val = tokens[i][1], tokens[i][2]
+            if nxt_tok in ("a", "an"):
+                i += 1
+            elif 0 < nxt_val < 1:
+                qty += nxt_val
+                i += 1
 
-        unit_match = UNIT_PATTERN.search(cleaned, pos=m.end())
         unit = None
-        unit_end = None
-        if unit_match and unit_match.start() - m.end() < 12:
-            unit = UNIT_LOOKUP.get(unit_match.group(0))
-            unit_end = unit_match.end()
+        if i < n and tokens[i][0] == T_UNIT:
+            unit = tokens[i][2]
+            i += 1
 
-        food = None
-        start_pos = unit_end if unit_end else m.end()
-        after = cleaned[start_pos:start_pos + 40]
+        while i < n and tokens[i][0] == T_WORD and tokens[i][1] in FILLER_WORDS:
+            i += 1
 
-        food_match = re.search(r"\b[a-zA-Z][a-zA-Z0-9]*\b", after)
-        if food_match:
-            food = food_match.group(0)
+        if i < n and tokens[i][0] == T_WORD:
+            food = tokens[i][1]
+            last_word = food
+            i += 1
         else:
-            before = cleaned[:m.start()]
-            words = re.findall(r"\b[a-zA-Z][a-zA-Z0-9]*\b", before)
-            if words:
-                food = words[-1]
+            food = last_word
 
-        if not food or food in VERB_STOPWORDS or food in UNIT_LOOKUP:
+        if not food:
             continue
 
         matches.append({
@@ -164,83 +341,183 @@ def parse_text(text: str) -> List[Dict[str, Any]]:
             "unit": unit
         })
 
+    return matches
+
+def combine_items(matches: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     combined = {}
     for m in matches:
         if m["food"] in combined:
             combined[m["food"]]["quantity"] += m["quantity"]
         else:
             combined[m["food"]] = m
+    return combined
 
+def build_parsed(combined: Dict[str, Dict[str, Any]], rows: Dict[str, Any],
+                 suggestions: Dict[str, List[str]] = None) -> List[Dict[str, Any]]:
+    suggestions = suggestions or {}
     final = []
     for food, item in combined.items():
-        row = get_food_by_name(food)
+        row = rows.get(food)
         final.append({
             "food": food,
             "quantity": item["quantity"],
             "unit": item["unit"],
             "recognized": row is not None,
-            "suggestions": [] if row else suggest_foods(food)
+            "suggestions": [] if row else suggestions.get(food, [])
         })
-
     return final
 
-# ----------------------------------------------------------
-# COMPUTE NUTRIENTS (FIXED NAME ONLY)
-# ----------------------------------------------------------
-def compute_nutrients(parsed_items):
-    totals = {
-        "calories": 0, "protein": 0, "carbs": 0, "fat": 0,
-        "fiber": 0, "sugar": 0,
-        "sodium_mg": 0, "cholesterol_mg": 0,
-        "calcium_mg": 0, "iron_mg": 0,
-        "vitaminA_mcg": 0, "vitaminB1_mg": 0,
-        "vitaminB2_mg": 0, "vitaminB3_mg": 0,
-        "vitaminB6_mg": 0, "vitaminB9_mcg": 0,
-        "vitaminB12_mcg": 0, "vitaminC_mg": 0,
-        "vitaminD_mcg": 0, "vitaminE_mg": 0,
-        "vitaminK_mcg": 0
-    }
+def parse_text(text: str, resolved: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    """
+    Parse free text into food items.
+    Pass a dict as `resolved` to receive the matched foods rows
+    ({food: row}) so compute_nutrients can reuse them.
+    """
+    return parse_texts([text], resolved)[0]
 
-    for item in parsed_items:
-        if not item["recognized"]:
-            continue
+def parse_texts(texts: List[str], resolved: Dict[str, Any] = None) -> List[List[Dict[str, Any]]]:
+    """parse_text for many texts with ONE shared food resolution"""
+    return _parse_cleaned([clean_text(t) for t in texts], resolved)
 
-        row = get_food_by_name(item["food"])
-        qty = item["quantity"]
-        unit = item["unit"]
+def _parse_cleaned(cleaned_texts, resolved=None):
+    combined_all = [combine_items(extract_items(tokenize(c))) for c in cleaned_texts]
 
-        if row.get("per_100g") == 1:
-            grams = qty if unit == "g" else qty * row["grams_per_unit"]
-            factor = grams / 100
-        else:
-            factor = qty
+    rows = resolve_foods(food for combined in combined_all for food in combined)
+    if resolved is not None:
+        resolved.update(rows)
+    # every unknown name of every text, suggested in one go
+    suggestions = suggest_foods_many(name for name, row in rows.items() if row is None)
 
-        def mul(v): 
-            return float(v or 0) * factor
+    return [build_parsed(combined, rows, suggestions) for combined in combined_all]
 
-        totals["calories"] += mul(row["calories_per_unit"])
-        totals["protein"] += mul(row["protein_per_unit"])
-        totals["carbs"] += mul(row["carbs_per_unit"])
-        totals["fat"] += mul(row["fat_per_unit"])
-
-    for k in totals:
-        totals[k] = round(totals[k], 4)
+# ----------------------------------------------------------
+# MEMOIZED PARSE + COMPUTE
+# ----------------------------------------------------------
+def catalog_generation():
+    """Current catalog generation, or None when nothing can be memoized"""
+    if not CATALOG_CACHE_ENABLED:
+        return None
+    food_catalog.ensure_fresh()
+    return food_catalog.generation
+
+def parse_and_compute(text: str):
+    return parse_and_compute_many([text])[0]
+
+def parse_and_compute_many(texts: List[str]):
+    """
+    [(parsed_items, computed)] for every text.
+    Repeated phrases come straight from parse_cache; the rest are
+    parsed together with one shared food resolution.
+    """
+    generation = catalog_generation()
+    keys = [clean_text(t) for t in texts]
+    out = [None] * len(texts)
+
+    misses = []
+    for i, key in enumerate(keys):
+        out[i] = parse_cache.get(key, generation)
+        if out[i] is None:
+            misses.append(i)
+
+    if misses:
+        resolved = {}
+        parsed_all = _parse_cleaned([keys[i] for i in misses], resolved)
+        computed_all = compute_nutrients_many(parsed_all, resolved)
+        for i, parsed, computed in zip(misses, parsed_all, computed_all):
+            out[i] = (parsed, computed)
+            parse_cache.put(keys[i], generation, out[i])
+
+    return out
 
-    return {"totals": totals, "items": parsed_items}
+# ----------------------------------------------------------
+# COMPUTE NUTRIENTS (FIXED NAME ONLY)
+# ----------------------------------------------------------
+def _resolved_row(item, resolved):
+    if resolved and resolved.get(item["food"]):
+        return resolved[item["food"]]
+    return get_food_by_name(item["food"])
+
+def compute_nutrients(parsed_items, resolved: Dict[str, Any] = None):
+    return compute_nutrients_many([parsed_items], resolved)[0]
+
+def compute_nutrients_many(parsed_lists, resolved: Dict[str, Any] = None):
+    """
+    Totals for many meals as ONE matrix product:
+        (meals x foods) factors  @  (foods x nutrients) catalog rows
+    """
+    rows, col_of, cells = [], {}, []
+    for m, parsed_items in enumerate(parsed_lists):
+        for item in parsed_items:
+            if not item["recognized"]:
+                continue
+            row = _resolved_row(item, resolved)
+            key = id(row)
+            if key not in col_of:
+                col_of[key] = len(rows)
+                rows.append(row)
+            cells.append((m, col_of[key], item_factor(item, row)))
+
+    factors = np.zeros((len(parsed_lists), len(rows)))
+    for m, j, f in cells:
+        factors[m, j] += f
+
+    totals = factors @ food_catalog.nutrient_matrix(rows)
+
+    return [
+        {"totals": totals_dict(totals[m]), "items": parsed_items}
+        for m, parsed_items in enumerate(parsed_lists)
+    ]
 
 # ----------------------------------------------------------
-# SAVE LOG (UNCHANGED)
+# SAVE LOG (+ daily rollup in the same transaction)
 # ----------------------------------------------------------
 def save_log(user_id, raw_text, parsed_items, totals):
     conn = get_conn()
     try:
+        conn.start_transaction()
         c = conn.cursor()
         c.execute("""
             INSERT INTO user_food_logs (user_id, raw_text, parsed_json, totals_json)
             VALUES (%s, %s, %s, %s)
         """, (user_id, raw_text, json.dumps(parsed_items), json.dumps(totals)))
+        log_id = c.lastrowid
+        add_to_rollup(c, [(user_id, None, totals)])
         conn.commit()
-        return c.lastrowid
+        return log_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def save_logs(entries):
+    """
+    Insert many logs with ONE multi-row INSERT in ONE transaction.
+    entries: [(user_id, raw_text, parsed_items, totals, timestamp or None)]
+    """
+    if not entries:
+        return 0
+
+    conn = get_conn()
+    try:
+        conn.start_transaction()
+        c = conn.cursor()
+        c.executemany("""
+            INSERT INTO user_food_logs (user_id, timestamp, raw_text, parsed_json, totals_json)
+            VALUES (%s, COALESCE(%s, CURRENT_TIMESTAMP), %s, %s, %s)
+        """, [
+            (user_id, ts, raw_text, json.dumps(parsed_items), json.dumps(totals))
+            for user_id, raw_text, parsed_items, totals, ts in entries
+        ])
+        add_to_rollup(c, [
+            (user_id, ts, totals)
+            for user_id, raw_text, parsed_items, totals, ts in entries
+        ])
+        conn.commit()
+        return len(entries)
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         conn.close()
 
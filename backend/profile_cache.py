@@ -0,0 +1,109 @@
+# backend/profile_cache.py
+import os
+import time
+
+from calorie_target import calculate_daily_calories
+from lru import BoundedLRU
+
+# ====================================
+# Profile cache settings (ENV)
+# ====================================
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 10000))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", 300))
+
+
+# 🛡️ SAFE DEFAULT PROFILE (IMPORTANT) - users without a user_profiles row
+DEFAULT_PROFILE = {
+    "age": 25,
+    "height_cm": 170,
+    "weight_kg": 65,
+    "gender": "male",
+    "activity_level": "moderate",
+    "goal": "maintenance"
+}
+
+
+def macro_targets(calories_target):
+    """Protein / carbs / fat grams for a calorie target (25 / 45 / 30 split)"""
+    return {
+        "calories": calories_target,
+        "protein": round((calories_target * 0.25) / 4, 1),
+        "carbs": round((calories_target * 0.45) / 4, 1),
+        "fat": round((calories_target * 0.30) / 9, 1)
+    }
+
+
+def build_entry(profile):
+    daily_target = calculate_daily_calories(profile)
+    return {
+        "profile": dict(profile),
+        "daily_target": daily_target,
+        "macro_targets": macro_targets(daily_target or 2000),
+    }
+
+
+class ProfileCache(BoundedLRU):
+    """
+    Bounded LRU of user_id -> profile + computed daily/macro targets.
+
+    Write-through: /api/profile/update put()s the row it just wrote.
+    Entries also expire after `ttl` seconds so other worker processes
+    (each has its own cache) pick up the change within one TTL.
+    """
+
+    def __init__(self, maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL,
+                 clock=time.monotonic):
+        super().__init__(maxsize)    # user_id -> (stored_at, entry)
+        self.ttl = ttl
+        self._clock = clock
+        self.expirations = 0
+
+    @staticmethod
+    def _key(user_id):
+        # routes pass ints, /api/profile/update passes whatever the JSON had
+        return str(user_id)
+
+    @staticmethod
+    def _copy(entry):
+        return {
+            "profile": dict(entry["profile"]),
+            "daily_target": entry["daily_target"],
+            "macro_targets": dict(entry["macro_targets"]),
+        }
+
+    def get(self, user_id):
+        if self.maxsize <= 0:
+            return None
+        key = self._key(user_id)
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and self._clock() - item[0] >= self.ttl:
+                del self._data[key]
+                self.expirations += 1
+                item = None
+            item = self._found(key, item)
+        return None if item is None else self._copy(item[1])
+
+    def put(self, user_id, profile):
+        """Store a freshly read/written profile; returns its entry"""
+        entry = build_entry(profile)
+        if self.maxsize <= 0:
+            return entry
+        key = self._key(user_id)
+        with self._lock:
+            self._store(key, (self._clock(), entry))
+        return self._copy(entry)
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._data.clear()
+            else:
+                self._data.pop(self._key(user_id), None)
+
+    def stats(self):
+        return dict(super().stats(), ttl=self.ttl, expirations=self.expirations)
+
+
+# shared per-process instance
+profile_cache = ProfileCache()
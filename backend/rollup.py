@@ -0,0 +1,235 @@
+# backend/rollup.py
+"""
+Per-user daily nutrition rollup (user_daily_totals).
+
+Every saved food log adds its totals to the (user_id, day) row in the
+same transaction as the log INSERT, so summary endpoints read a few
+pre-aggregated rows instead of parsing JSON.
+
+Backfill / rebuild from user_food_logs:
+    python rollup.py rebuild              # everyone
+    python rollup.py rebuild --user 1     # one user
+    python rollup.py rebuild --since 2025-01-01
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from db import get_conn, day_bounds
+from nutrients import NUTRIENT_KEYS
+
+ROLLUP_TABLE = "user_daily_totals"
+
+_COLS = ", ".join(NUTRIENT_KEYS)
+_MARKS = ", ".join(["%s"] * len(NUTRIENT_KEYS))
+_ADD = ",\n            ".join(f"{k} = {k} + VALUES({k})" for k in ["log_count", *NUTRIENT_KEYS])
+
+UPSERT_SQL = f"""
+    INSERT INTO {ROLLUP_TABLE} (user_id, day, log_count, {_COLS})
+    VALUES (%s, DATE(COALESCE(%s, CURRENT_TIMESTAMP)), 1, {_MARKS})
+    ON DUPLICATE KEY UPDATE
+            {_ADD}
+"""
+
+
+def rollup_params(user_id, timestamp, computed):
+    """One UPSERT row for a saved log (computed = compute_nutrients output)"""
+    totals = (computed or {}).get("totals", {})
+    return (user_id, timestamp, *[float(totals.get(k) or 0) for k in NUTRIENT_KEYS])
+
+
+def add_to_rollup(cursor, entries):
+    """entries: [(user_id, timestamp or None, computed)] - caller commits"""
+    cursor.executemany(UPSERT_SQL, [rollup_params(*e) for e in entries])
+
+
+# -------------------------------------------------
+# Readers
+# -------------------------------------------------
+# All day windows are half-open ([start, end)) and compare the bare
+# column, so (user_id, day) / (user_id, timestamp) index ranges apply.
+TODAY_ROW_SQL = f"""
+    SELECT calories, protein, carbs, fat
+    FROM {ROLLUP_TABLE}
+    WHERE user_id=%s AND day=CURDATE()
+"""
+
+DAILY_ROWS_SQL = f"""
+    SELECT day, {{columns}}{{today_flag}}
+    FROM {ROLLUP_TABLE}
+    WHERE user_id=%s
+      AND day >= CURDATE() - INTERVAL %s DAY
+      AND day < CURDATE() + INTERVAL 1 DAY
+    ORDER BY day
+"""
+
+def get_today_row(cursor, user_id):
+    """Today's rollup row as floats (zeros when nothing was logged)"""
+    cursor.execute(TODAY_ROW_SQL, (user_id,))
+    r = cursor.fetchone() or {}
+    return {k: float(r.get(k) or 0) for k in ("calories", "protein", "carbs", "fat")}
+
+
+def get_daily_rows(cursor, user_id, days, columns=("calories", "protein", "carbs", "fat"),
+                   mark_today=False):
+    """
+    Rollup rows for the last `days` days (today included), oldest first.
+    mark_today adds an is_today column (server's CURDATE, not ours).
+    """
+    sql = DAILY_ROWS_SQL.format(
+        columns=", ".join(columns),
+        today_flag=", day = CURDATE() AS is_today" if mark_today else "",
+    )
+    cursor.execute(sql, (user_id, days - 1))
+    return cursor.fetchall()
+
+
+def range_rows_sql(columns, users):
+    return f"""
+        SELECT user_id, day, log_count, {", ".join(columns)}
+        FROM {ROLLUP_TABLE}
+        WHERE user_id IN ({", ".join(["%s"] * users)})
+          AND day >= %s AND day < %s
+        ORDER BY user_id, day
+    """
+
+
+def get_range_rows(cursor, user_ids, start_day, end_day, columns):
+    """Rollup rows for [start_day, end_day] (inclusive) for several users"""
+    cursor.execute(
+        range_rows_sql(columns, len(user_ids)),
+        (*user_ids, start_day, end_day + timedelta(days=1)),
+    )
+    return cursor.fetchall()
+
+
+# -------------------------------------------------
+# Buckets (day / week / month)
+# -------------------------------------------------
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(day, bucket):
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())      # ISO week, Monday
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start, bucket):
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_rows(rows, start_day, end_day, bucket, columns):
+    """
+    Fold one user's daily rows (dicts, any order) into consecutive
+    buckets covering [start_day, end_day]. Empty buckets come back as
+    zeros so charts get a continuous series; averages are per calendar
+    day of the bucket that falls inside the range.
+    """
+    by_start = {}
+    for row in rows:
+        day = row["day"]
+        if not isinstance(day, date):
+            day = date.fromisoformat(str(day))
+        by_start.setdefault(bucket_start(day, bucket), []).append(row)
+
+    out = []
+    start = bucket_start(start_day, bucket)
+    while start <= end_day:
+        nxt = next_bucket(start, bucket)
+        first, last = max(start, start_day), min(nxt - timedelta(days=1), end_day)
+        days = (last - first).days + 1
+        members = by_start.get(start, [])
+        totals = {
+            k: round(sum(float(r.get(k) or 0) for r in members), 2)
+            for k in columns
+        }
+        out.append({
+            "start": first.isoformat(),
+            "end": last.isoformat(),
+            "days": days,
+            "days_logged": len(members),
+            "log_count": sum(int(r.get("log_count") or 0) for r in members),
+            "totals": totals,
+            "average": {k: round(v / days, 2) for k, v in totals.items()},
+        })
+        start = nxt
+    return out
+
+
+# -------------------------------------------------
+# Backfill / rebuild
+# -------------------------------------------------
+def _json_sum(key):
+    return (
+        f"COALESCE(SUM(CAST(JSON_EXTRACT(totals_json,'$.totals.{key}') "
+        f"AS DECIMAL(14,4))),0)"
+    )
+
+
+def rebuild(user_id=None, since=None):
+    """
+    Recompute rollup rows from user_food_logs (all users or one).
+    `since` (a date) limits the rebuild to days >= since.
+    """
+    scope, params = [], []
+    if user_id is not None:
+        scope.append("user_id=%s")
+        params.append(user_id)
+    day_where, log_where = list(scope), list(scope)
+    day_params, log_params = list(params), list(params)
+    if since is not None:
+        day_where.append("day >= %s")
+        day_params.append(since)
+        log_where.append("timestamp >= %s")
+        log_params.append(day_bounds(since)[0])
+
+    def where(clauses):
+        return ("WHERE " + " AND ".join(clauses)) if clauses else ""
+
+    sums = ",\n               ".join(_json_sum(k) for k in NUTRIENT_KEYS)
+
+    conn = get_conn()
+    try:
+        conn.start_transaction()
+        c = conn.cursor()
+        c.execute(f"DELETE FROM {ROLLUP_TABLE} {where(day_where)}", tuple(day_params))
+        c.execute(f"""
+            INSERT INTO {ROLLUP_TABLE} (user_id, day, log_count, {_COLS})
+            SELECT user_id, DATE(timestamp), COUNT(*),
+               {sums}
+            FROM user_food_logs
+            {where(log_where)}
+            GROUP BY user_id, DATE(timestamp)
+        """, tuple(log_params))
+        rows = c.rowcount
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Maintain the user_daily_totals rollup")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rb = sub.add_parser("rebuild", help="recompute rollup rows from user_food_logs")
+    rb.add_argument("--user", type=int, help="only this user_id")
+    rb.add_argument("--since", type=date.fromisoformat, help="only days >= YYYY-MM-DD")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    rows = rebuild(args.user, args.since)
+    print(f"✅ rebuilt {rows} daily rows in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# backend/tests/conftest.py
+"""
+Shared fixtures: a fresh SQLite stand-in behind every module's get_conn,
+workout files in the test's tmp dir, and an empty profile cache.
+"""
+import pytest
+
+import app as app_module
+import export
+import physiqueneeds1
+import rollup
+import weekly_digest
+import workout_db
+import workout_store
+from profile_cache import ProfileCache
+from standin_db import StandInDB
+
+# modules that do `from db import get_conn`
+DB_MODULES = (app_module, physiqueneeds1, export, rollup, weekly_digest, workout_db)
+
+PROFILE_SQL = (
+    "INSERT INTO user_profiles (user_id, age, height_cm, weight_kg, gender, activity_level, goal) "
+    "VALUES (1, 30, 180, 80, 'male', 'light', 'loss')"
+)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    standin = StandInDB(tmp_path / "physique.db")
+    for mod in DB_MODULES:
+        monkeypatch.setattr(mod, "get_conn", standin.connect)
+    monkeypatch.setattr(workout_store, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(app_module, "profile_cache", ProfileCache())
+    return standin
+
+
+@pytest.fixture
+def profile(db):
+    """User 1: 30y male, 180cm / 80kg, light activity, losing weight"""
+    db.query(PROFILE_SQL)
+    return db
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
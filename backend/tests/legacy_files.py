@@ -0,0 +1,12 @@
+# backend/tests/legacy_files.py
+"""
+Writes pre-segment workout day files (user_<id>_<date>.json, one
+pretty-printed JSON list) the way the old workout.py did, so tests can
+cover reading / converting / importing them.
+"""
+import json
+
+
+def write_legacy(path, entries):
+    with open(path, "w") as f:
+        json.dump(entries, f, indent=2)
@@ -0,0 +1,171 @@
+# backend/tests/standin_db.py
+"""
+Local stand-in for the MySQL database: a SQLite file wrapped in the
+small slice of the mysql-connector API the backend uses
+(cursor(dictionary=True), %s params, executemany, start_transaction,
+commit/rollback, close). Every connect() opens its own SQLite
+connection, so threads behave like separate pooled connections.
+"""
+import re
+import sqlite3
+
+from nutrients import NUTRIENT_KEYS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_food_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+    raw_text TEXT,
+    parsed_json TEXT,
+    totals_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_food_logs_user_ts ON user_food_logs (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_food_logs_user_id ON user_food_logs (user_id, id);
+CREATE TABLE IF NOT EXISTS user_profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    age INTEGER,
+    height_cm INTEGER,
+    weight_kg REAL,
+    gender TEXT,
+    activity_level TEXT,
+    goal TEXT
+);
+CREATE TABLE IF NOT EXISTS user_daily_totals (
+    user_id INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    log_count INTEGER NOT NULL DEFAULT 0,
+    %s,
+    PRIMARY KEY (user_id, day)
+);
+CREATE TABLE IF NOT EXISTS user_weekly_summaries (
+    user_id INTEGER NOT NULL,
+    week_start TEXT NOT NULL,
+    week_end TEXT NOT NULL,
+    daily_target INTEGER NOT NULL,
+    days_logged INTEGER NOT NULL DEFAULT 0,
+    met_days INTEGER NOT NULL DEFAULT 0,
+    average_calories REAL NOT NULL DEFAULT 0,
+    average_protein REAL NOT NULL DEFAULT 0,
+    average_carbs REAL NOT NULL DEFAULT 0,
+    average_fat REAL NOT NULL DEFAULT 0,
+    consistency_percent INTEGER NOT NULL DEFAULT 0,
+    computed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, week_start)
+);
+CREATE TABLE IF NOT EXISTS user_workout_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    workout_name TEXT NOT NULL DEFAULT '',
+    sets INTEGER NOT NULL DEFAULT 0,
+    calories_per_set REAL NOT NULL DEFAULT 0,
+    calories_burned REAL NOT NULL DEFAULT 0,
+    source_day TEXT,
+    source_seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_workout_logs_user_ts ON user_workout_logs (user_id, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_workout_logs_source
+    ON user_workout_logs (user_id, source_day, source_seq);
+-- names only: the nutrient tests use in-memory rows
+CREATE TABLE IF NOT EXISTS foods (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    food_name_singular TEXT NOT NULL,
+    food_name_plural TEXT
+);
+""" % ",\n    ".join(f"{k} REAL NOT NULL DEFAULT 0" for k in NUTRIENT_KEYS)
+
+# MySQL-only syntax -> SQLite
+TRANSLATIONS = [
+    (re.compile(r"ON DUPLICATE KEY UPDATE", re.I), "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"INSERT IGNORE", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"VALUES\((\w+)\)", re.I), r"excluded.\1"),
+    (re.compile(r"CURDATE\(\)\s*([+-])\s*INTERVAL\s+(%s|\d+)\s+DAY", re.I),
+     r"DATE('now', '\1' || \2 || ' days')"),
+    (re.compile(r"CURDATE\(\)", re.I), "DATE('now')"),
+    (re.compile(r"%s"), "?"),
+]
+
+
+class StandInCursor:
+    def __init__(self, cur, dictionary=False):
+        self._cur = cur
+        self._dictionary = dictionary
+
+    @staticmethod
+    def _sql(sql):
+        for pattern, repl in TRANSLATIONS:
+            sql = pattern.sub(repl, sql)
+        return sql
+
+    def execute(self, sql, params=()):
+        self._cur.execute(self._sql(sql), tuple(params))
+
+    def executemany(self, sql, seq):
+        self._cur.executemany(self._sql(sql), [tuple(p) for p in seq])
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: v for d, v in zip(self._cur.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cur.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(r) for r in self._cur.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(r) for r in self._cur.fetchall()]
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+
+class StandInConnection:
+    def __init__(self, path):
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.closed = False
+
+    def cursor(self, dictionary=False, **_):
+        return StandInCursor(self._db.cursor(), dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._db.in_transaction
+
+    def ping(self, reconnect=False):
+        self._db.execute("SELECT 1")
+
+    def start_transaction(self):
+        pass  # sqlite3 opens one implicitly on the first write
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def close(self):
+        self.closed = True
+        self._db.close()
+
+
+class StandInDB:
+    def __init__(self, path, schema=SCHEMA):
+        self.path = str(path)
+        with sqlite3.connect(self.path) as db:
+            db.executescript(schema)
+
+    def connect(self):
+        return StandInConnection(self.path)
+
+    def query(self, sql, params=()):
+        with sqlite3.connect(self.path) as db:
+            return db.execute(sql, params).fetchall()
@@ -0,0 +1,22 @@
+# backend/tests/test_bench_corpus.py
+import physiqueneeds1
+from benchmarks.corpus import fake_catalog, make_corpus
+from food_search import SuggestionIndex
+
+
+def test_corpus_is_deterministic_and_varied():
+    corpus = make_corpus(50, seed=1)
+    assert corpus == make_corpus(50, seed=1)
+    joined = " ".join(corpus).lower()
+    for token in ("iniku", "sapten", "1/2", "half", "cup"):
+        assert token in joined
+
+
+def test_corpus_parses_against_fake_catalog(monkeypatch):
+    monkeypatch.setattr(physiqueneeds1, "food_catalog", fake_catalog())
+    monkeypatch.setattr(physiqueneeds1, "suggestion_index", SuggestionIndex())
+    parsed = physiqueneeds1.parse_texts(make_corpus(50, seed=1))
+    items = [it for p in parsed for it in p]
+    recognized = sum(it["recognized"] for it in items)
+    assert len(items) > 50
+    assert recognized / len(items) > 0.8
@@ -88,3 +88,46 @@ def test_compute_rice(monkeypatch):
     assert totals["calories"] == 520
     # protein: (400/100)*2.7 = 10.8
     assert round(totals["protein"], 4) == round(2.7 * 4, 4)
+
+def test_compute_uses_resolved_rows(monkeypatch):
+    def no_lookup(name):
+        raise AssertionError("compute_nutrients should not re-query resolved foods")
+    monkeypatch.setattr('physiqueneeds1.get_food_by_name', no_lookup)
+    parsed = [
+        {"food":"idlis","quantity":2,"unit":None,"recognized":True},
+        {"food":"rice","quantity":1,"unit":"cup","recognized":True},
+    ]
+    out = compute_nutrients(parsed, {"idlis": IDLI_ROW, "rice": RICE_ROW})
+    # 2 * 52 + (200/100) * 130
+    assert out["totals"]["calories"] == 364
+
+def test_compute_fills_micronutrients():
+    parsed = [{"food":"idli","quantity":2,"unit":None,"recognized":True}]
+    totals = compute_nutrients(parsed, {"idli": IDLI_ROW})["totals"]
+    assert totals["fiber"] == 1.6
+    assert totals["sodium_mg"] == 256
+    assert totals["vitaminB9_mcg"] == 8
+    assert len(totals) == 21
+
+def test_compute_many_matches_single_meals():
+    from physiqueneeds1 import compute_nutrients_many
+    resolved = {"idli": IDLI_ROW, "rice": RICE_ROW}
+    meals = [
+        [{"food":"idli","quantity":3,"unit":None,"recognized":True}],
+        [{"food":"rice","quantity":150,"unit":"g","recognized":True},
+         {"food":"idli","quantity":1,"unit":None,"recognized":True},
+         {"food":"vada","quantity":1,"unit":None,"recognized":False}],
+        [],
+    ]
+    batch = compute_nutrients_many(meals, resolved)
+    assert [b["totals"] for b in batch] == [compute_nutrients(m, resolved)["totals"] for m in meals]
+    assert batch[1]["totals"]["calories"] == 52 + 1.5 * 130
+    assert batch[2]["totals"]["calories"] == 0
+
+def test_catalog_matrix_rows_are_reused():
+    from food_catalog import FoodCatalog
+    cat = FoodCatalog(loader=lambda: ("v", [IDLI_ROW, RICE_ROW]), version_probe=lambda: "v")
+    rows = [cat.get("rice"), cat.get("idli")]
+    m = cat.nutrient_matrix(rows)
+    assert m.shape == (2, 21)
+    assert list(m[:, 0]) == [130, 52]
@@ -0,0 +1,92 @@
+# backend/tests/test_conditional_get.py
+import pytest
+
+import app as app_module
+import physiqueneeds1
+import workout_store
+
+pytestmark = pytest.mark.usefixtures("profile")
+
+
+def revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": f'"{etag}"'})
+
+
+def log(calories):
+    physiqueneeds1.save_log(1, "x", [], {"totals": {"calories": calories}, "items": []})
+
+
+@pytest.mark.parametrize("url", [
+    "/api/summary/today/1",
+    "/api/summary/macros/1",
+    "/api/summary/weekly/1",
+    "/api/logs?user_id=1",
+    "/api/dashboard/1",
+])
+def test_unchanged_data_answers_304(client, url):
+    log(100)
+    first = client.get(url)
+    etag, _ = first.get_etag()
+    assert first.status_code == 200 and etag
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    again = revalidate(client, url, etag)
+    assert again.status_code == 304 and again.data == b""
+
+    log(50)
+    changed = revalidate(client, url, etag)
+    assert changed.status_code == 200 and changed.get_etag()[0] != etag
+
+
+def test_304_skips_the_aggregate_queries(client, monkeypatch):
+    etag, _ = client.get("/api/summary/today/1").get_etag()
+    monkeypatch.setattr(app_module, "get_today_totals", lambda uid: pytest.fail("aggregate ran"))
+    assert revalidate(client, "/api/summary/today/1", etag).status_code == 304
+
+
+def test_workout_and_profile_changes_bust_the_etag(client):
+    etag, _ = client.get("/api/dashboard/1").get_etag()
+    workout_store.append_workout(1, {"calories_burned": 10})
+    assert revalidate(client, "/api/dashboard/1", etag).status_code == 200
+
+    etag, _ = client.get("/api/summary/macros/1").get_etag()
+    client.post("/api/profile/update", json={
+        "user_id": 1, "age": 30, "height_cm": 180, "weight_kg": 80,
+        "gender": "male", "activity_level": "light", "goal": "gain",
+    })
+    assert revalidate(client, "/api/summary/macros/1", etag).status_code == 200
+
+
+def test_different_users_never_share_etags(client):
+    log(100)
+    a, _ = client.get("/api/summary/today/1").get_etag()
+    b, _ = client.get("/api/summary/today/2").get_etag()
+    assert a != b
+
+
+@pytest.mark.parametrize("header", [
+    'W/"{etag}"',
+    '"nope", "{etag}"',
+    '"nope",W/"{etag}"',
+    "*",
+])
+def test_weak_and_listed_etags_match(client, header):
+    etag, _ = client.get("/api/summary/today/1").get_etag()
+    res = client.get("/api/summary/today/1", headers={"If-None-Match": header.format(etag=etag)})
+    assert res.status_code == 304
+
+
+def test_probe_and_view_share_one_connection(client, monkeypatch):
+    opened = []
+    connect = app_module.get_conn
+
+    def counting():
+        opened.append(1)
+        return connect()
+    monkeypatch.setattr(app_module, "get_conn", counting)
+
+    log(100)
+    for url in ("/api/summary/macros/1", "/api/summary/weekly/1", "/api/logs?user_id=1"):
+        opened.clear()
+        assert client.get(url).status_code == 200
+        assert len(opened) == 1, url
@@ -0,0 +1,102 @@
+# backend/tests/test_dashboard.py
+import pytest
+
+import app as app_module
+import physiqueneeds1
+import workout
+import workout_db
+import workout_store
+from calorie_target import calculate_daily_calories
+
+pytestmark = pytest.mark.usefixtures("profile")
+
+
+class CountingDB:
+    """Counts connections and statements going through the stand-in"""
+
+    def __init__(self, standin):
+        self.standin = standin
+        self.connections = 0
+        self.statements = 0
+
+    def connect(self):
+        self.connections += 1
+        conn = self.standin.connect()
+        make_cursor = conn.cursor
+
+        def cursor(*args, **kwargs):
+            cur = make_cursor(*args, **kwargs)
+            execute = cur.execute
+
+            def counted(*a, **kw):
+                self.statements += 1
+                return execute(*a, **kw)
+
+            cur.execute = counted
+            return cur
+
+        conn.cursor = cursor
+        return conn
+
+
+def computed(calories, protein=0):
+    return {"totals": {"calories": calories, "protein": protein}, "items": []}
+
+
+def test_dashboard_matches_individual_endpoints(db, monkeypatch):
+    physiqueneeds1.save_logs([
+        (1, "today", [], computed(500, 30), None),
+        (1, "today again", [], computed(250, 10), None),
+    ])
+    db.query("INSERT INTO user_daily_totals (user_id, day, log_count, calories) "
+             "VALUES (1, DATE('now', '-1 day'), 1, 900)")
+    workout_store.append_workout(1, {"calories_burned": 120})
+    workout_store.append_workout(1, {"calories_burned": 30})
+
+    client = app_module.app.test_client()
+    macros = client.get("/api/summary/macros/1").get_json()
+    weekly = client.get("/api/summary/weekly/1").get_json()
+
+    counting = CountingDB(db)
+    monkeypatch.setattr(app_module, "get_conn", counting.connect)
+    dash = client.get("/api/dashboard/1").get_json()
+
+    # ETag stamp + the 7-day query on ONE connection (profile was cached
+    # by the macros call)
+    assert counting.connections == 1
+    assert counting.statements == 2
+
+    assert dash["macros"] == macros
+    assert dash["weekly"] == weekly
+    assert dash["today"] == {"calories": 750.0, "protein": 40.0, "carbs": 0.0, "fat": 0.0}
+    assert dash["daily_target"] == calculate_daily_calories(dash["profile"])
+    assert dash["workout"]["today_burned"] == 150
+    assert dash["workout"]["workouts_count"] == 2
+    assert dash["net_calories"] == 600
+
+
+def test_dashboard_for_new_user_uses_defaults(db, monkeypatch):
+    counting = CountingDB(db)
+    monkeypatch.setattr(app_module, "get_conn", counting.connect)
+    dash = app_module.app.test_client().get("/api/dashboard/42").get_json()
+    # ETag stamp + profile miss + the 7-day query, all on one connection
+    assert (counting.connections, counting.statements) == (1, 3)
+    assert dash["profile"]["user_id"] == 42
+    assert dash["today"]["calories"] == 0
+    assert dash["weekly"]["days"] == []
+    assert dash["workout"]["workouts_count"] == 0
+
+
+def test_dashboard_on_the_sql_workout_store_still_uses_one_connection(db, client, monkeypatch):
+    monkeypatch.setattr(workout, "WORKOUT_STORE", "sql")
+    workout_db.append_workout(1, {"workout_name": "Run", "calories_burned": 80})
+
+    counting = CountingDB(db)
+    for mod in (app_module, workout_db):
+        monkeypatch.setattr(mod, "get_conn", counting.connect)
+    dash = client.get("/api/dashboard/1").get_json()
+
+    # ETag stamp (food + workout version), profile, 7 days, workout totals
+    assert (counting.connections, counting.statements) == (1, 5)
+    assert dash["workout"] == {"date": dash["workout"]["date"], "today_burned": 80.0,
+                               "workouts_count": 1}
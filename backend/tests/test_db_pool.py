@@ -0,0 +1,182 @@
+# backend/tests/test_db_pool.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import db as db_module
+import physiqueneeds1
+from conftest import DB_MODULES
+from db import ConnectionPool, PoolTimeout
+
+
+class FakeConn:
+    def __init__(self, n):
+        self.n = n
+        self.alive = True
+        self.closed = False
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise OSError("gone away")
+
+    def close(self):
+        self.closed = True
+
+
+class Factory:
+    def __init__(self):
+        self.made = []
+
+    def __call__(self):
+        conn = FakeConn(len(self.made))
+        self.made.append(conn)
+        return conn
+
+
+def test_waits_instead_of_failing_then_times_out():
+    pool = ConnectionPool(connect=Factory(), size=1, timeout=0.05)
+    held = pool.get_connection()
+
+    released = threading.Timer(0.01, held.close)
+    released.start()
+    again = pool.get_connection(timeout=1)      # waits for the release
+    assert again.n == 0
+
+    with pytest.raises(PoolTimeout):
+        pool.get_connection()
+    stats = pool.stats()
+    assert stats["waits"] == 1 and stats["timeouts"] == 1 and stats["waiters"] == 0
+
+
+def test_waiters_are_served_in_arrival_order():
+    pool = ConnectionPool(connect=Factory(), size=1, timeout=5)
+    held = pool.get_connection()
+    order = []
+
+    def worker(i):
+        conn = pool.get_connection()
+        order.append(i)
+        conn.close()
+
+    threads = []
+    for i in range(5):
+        t = threading.Thread(target=worker, args=(i,))
+        t.start()
+        threads.append(t)
+        while pool.stats()["waiters"] < i + 1:   # queue them one by one
+            time.sleep(0.001)
+
+    held.close()
+    for t in threads:
+        t.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_max_age_and_pre_ping_recycle_connections():
+    now = [0.0]
+    factory = Factory()
+    pool = ConnectionPool(connect=factory, size=1, max_age=60, pre_ping_after=10,
+                          clock=lambda: now[0])
+
+    pool.get_connection().close()
+    now[0] = 61
+    conn = pool.get_connection()
+    assert conn.n == 1 and factory.made[0].closed
+
+    conn._raw.alive = False
+    conn.close()
+    now[0] = 71                                 # idle long enough to be pinged
+    assert pool.get_connection().n == 2
+    assert pool.stats()["reconnects"] == 2
+
+
+def test_recently_used_connections_are_not_pinged():
+    now = [0.0]
+    pings = []
+    factory = Factory()
+    pool = ConnectionPool(connect=factory, size=1, pre_ping_after=10, clock=lambda: now[0])
+    conn = pool.get_connection()
+    conn._raw.ping = lambda reconnect=False: pings.append(now[0])
+
+    for t in (1, 2, 3):
+        conn.close()
+        now[0] = t
+        conn = pool.get_connection()
+    assert pings == []
+
+    conn.close()
+    now[0] = 13
+    pool.get_connection()
+    assert pings == [13]
+
+
+def test_close_twice_returns_once():
+    pool = ConnectionPool(connect=Factory(), size=2)
+    conn = pool.get_connection()
+    conn.close()
+    conn.close()
+    assert pool.stats()["idle"] == 1 and pool.stats()["in_use"] == 0
+
+
+@pytest.mark.parametrize("give_up", ["invalidate", "close"])
+def test_handoff_landing_on_a_timed_out_waiter_is_not_leaked(monkeypatch, give_up):
+    """The waiter's deadline expires right as a slot / connection is handed to it"""
+    pool = ConnectionPool(connect=Factory(), size=1, timeout=5)
+    held = pool.get_connection()
+
+    class LateEvent(threading.Event):
+        def wait(self, timeout=None):
+            getattr(held, give_up)()        # hand-off happens...
+            return False                    # ...but the wait already timed out
+
+    class LateWaiter(db_module._Waiter):
+        __slots__ = ()
+
+        def __init__(self):
+            super().__init__()
+            self.event = LateEvent()
+
+    monkeypatch.setattr(db_module, "_Waiter", LateWaiter)
+    with pytest.raises(PoolTimeout):
+        pool.get_connection()
+    monkeypatch.undo()
+
+    stats = pool.stats()
+    assert (stats["in_use"], stats["waiters"]) == (0, 0)
+    assert stats["open"] == stats["idle"] == (1 if give_up == "close" else 0)
+    conn = pool.get_connection(timeout=0.1)     # the slot is still usable
+    conn.close()
+    assert pool.stats()["open"] == 1
+
+
+@pytest.fixture
+def pooled(db, monkeypatch):
+    """The stand-in behind a real 5-connection pool instead of plain connects"""
+    pool = ConnectionPool(connect=db.connect, size=5, timeout=30)
+    monkeypatch.setattr(db_module, "_pool", pool)
+    for mod in DB_MODULES:
+        monkeypatch.setattr(mod, "get_conn", db_module.get_conn)
+    return pool
+
+
+def test_50_concurrent_requests_on_5_connections(pooled, client):
+    physiqueneeds1.save_log(1, "x", [], {"totals": {"calories": 100}, "items": []})
+
+    urls = ["/api/dashboard/1", "/api/summary/today/1", "/api/summary/weekly/1",
+            "/api/summary/macros/1", "/api/logs?user_id=1"]
+    start = threading.Barrier(50)
+
+    def hit(i):
+        start.wait()
+        return client.get(urls[i % len(urls)]).status_code
+
+    with ThreadPoolExecutor(max_workers=50) as ex:
+        codes = list(ex.map(hit, range(50)))
+
+    assert codes == [200] * 50
+    stats = pooled.stats()
+    assert stats["checkouts"] > 50 and stats["timeouts"] == 0
+    assert stats["max_in_use"] <= 5 and stats["open"] <= 5
+    assert stats["in_use"] == 0 and stats["waiters"] == 0
@@ -0,0 +1,94 @@
+# backend/tests/test_export.py
+import csv
+import io
+import json
+
+import pytest
+
+import export
+import physiqueneeds1
+from db import ConnectionPool
+from legacy_files import write_legacy
+
+
+@pytest.fixture
+def standin(db, tmp_path):
+    physiqueneeds1.save_logs([
+        (1, "2 idli", [{"food": "idli", "quantity": 2}], {"totals": {"calories": 104}}, "2025-01-01 08:00:00"),
+        (1, "rice", [], {"totals": {"calories": 260}}, "2025-01-01 13:00:00"),
+        (1, "dosa", [], {"totals": {"calories": 170}}, "2025-01-02 09:00:00"),
+        (2, "not mine", [], {"totals": {}}, "2025-01-01 09:00:00"),
+    ])
+    write_legacy(str(tmp_path / "user_1_2025-01-01.json"), [
+        {"workout_name": "Squats", "sets": 4, "calories_per_set": 90.0,
+         "calories_burned": 360.0, "timestamp": "2025-01-01T10:30:00.123456"},
+    ])
+    write_legacy(str(tmp_path / "user_1_2025-01-03.json"), [
+        {"workout_name": "Run", "sets": 1, "calories_per_set": 300.0,
+         "calories_burned": 300.0, "timestamp": "2025-01-03T07:00:00"},
+    ])
+    write_legacy(str(tmp_path / "user_11_2025-01-01.json"), [
+        {"workout_name": "Other", "calories_burned": 1, "timestamp": "2025-01-01T00:00:00"},
+    ])
+    return db
+
+
+def test_ndjson_merges_food_and_workouts_in_time_order(standin, client):
+    res = client.get("/api/export/1")
+    assert res.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in res.data.decode().splitlines()]
+
+    assert [(r["type"], r.get("raw_text") or r.get("workout_name")) for r in records] == [
+        ("food", "2 idli"), ("workout", "Squats"), ("food", "rice"),
+        ("food", "dosa"), ("workout", "Run"),
+    ]
+    assert records[0]["items"] == [{"food": "idli", "quantity": 2}]
+    assert records[0]["totals"] == {"calories": 104}
+
+
+def test_csv_with_date_range(standin, client):
+    res = client.get("/api/export/1?format=csv&from=2025-01-01&to=2025-01-01")
+    rows = list(csv.DictReader(io.StringIO(res.data.decode())))
+    assert [r["type"] for r in rows] == ["food", "workout", "food"]
+    assert rows[0]["calories"] == "104" and rows[1]["calories_burned"] == "360.0"
+
+
+def test_food_rows_are_fetched_in_chunks(standin, monkeypatch):
+    sizes = []
+    real_connect = standin.connect
+
+    def connect():
+        conn = real_connect()
+        make_cursor = conn.cursor
+
+        def cursor(*a, **kw):
+            cur = make_cursor(*a, **kw)
+            fetchmany = cur.fetchmany
+            cur.fetchmany = lambda n: sizes.append(n) or fetchmany(n)
+            cur.fetchall = lambda: pytest.fail("export must not fetchall")
+            return cur
+
+        conn.cursor = cursor
+        return conn
+
+    monkeypatch.setattr(export, "get_conn", connect)
+    assert len(list(export.food_records(1, fetch_size=2))) == 3
+    assert sizes == [2, 2, 2]
+
+
+def test_abandoned_stream_drops_the_connection(standin, monkeypatch):
+    pool = ConnectionPool(connect=standin.connect, size=1)
+    monkeypatch.setattr(export, "get_conn", pool.get_connection)
+
+    stream = export.food_records(1, fetch_size=1)
+    next(stream)
+    stream.close()
+    stats = pool.stats()
+    assert stats["in_use"] == 0 and stats["idle"] == 0 and stats["open"] == 0
+
+    assert len(list(export.food_records(1))) == 3   # pool still usable
+
+
+def test_rejects_bad_format(standin, client):
+    assert client.get("/api/export/1?format=xml").status_code == 400
+    assert client.get("/api/export/1?from=yesterday").status_code == 400
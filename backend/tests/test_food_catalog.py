@@ -0,0 +1,74 @@
+# backend/tests/test_food_catalog.py
+import pytest
+from food_catalog import FoodCatalog
+
+ROWS = [
+    {"id": 1, "food_name_singular": "idli", "food_name_plural": "idlis"},
+    {"id": 2, "food_name_singular": "rice", "food_name_plural": "rice"},
+]
+
+
+class FakeDB:
+    def __init__(self):
+        self.version = "v1"
+        self.rows = list(ROWS)
+        self.loads = 0
+        self.probes = 0
+
+    def loader(self):
+        self.loads += 1
+        return self.version, list(self.rows)
+
+    def probe(self):
+        self.probes += 1
+        return self.version
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def setup():
+    db, clock = FakeDB(), FakeClock()
+    cat = FoodCatalog(ttl=60, loader=db.loader, version_probe=db.probe, clock=clock)
+    return cat, db, clock
+
+
+def test_lookup_singular_plural_and_case(setup):
+    cat, db, _ = setup
+    assert cat.get("idli")["id"] == 1
+    assert cat.get("IDLIS")["id"] == 1
+    assert cat.get(" Rice ")["id"] == 2
+    assert cat.get("dosa") is None
+    assert db.loads == 1
+    stats = cat.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1
+    assert stats["size"] == 2
+
+
+def test_ttl_probe_reloads_only_on_version_change(setup):
+    cat, db, clock = setup
+    cat.get("idli")
+    clock.now = 61
+    cat.get("idli")
+    assert db.probes == 1 and db.loads == 1
+
+    db.version = "v2"
+    db.rows.append({"id": 3, "food_name_singular": "dosa", "food_name_plural": "dosas"})
+    clock.now = 122
+    assert cat.get("dosas")["id"] == 3
+    assert db.loads == 2
+    assert cat.generation == 2
+
+
+def test_invalidate_forces_reload(setup):
+    cat, db, _ = setup
+    cat.get("idli")
+    cat.invalidate()
+    cat.get("idli")
+    assert db.loads == 2
@@ -0,0 +1,54 @@
+# backend/tests/test_food_search.py
+import copy
+
+from food_search import SuggestionIndex
+
+ROWS = [
+    {"id": 1, "food_name_singular": "idli", "food_name_plural": "idlis"},
+    {"id": 2, "food_name_singular": "rice", "food_name_plural": "rice"},
+    {"id": 3, "food_name_singular": "dosa", "food_name_plural": "dosas"},
+    {"id": 4, "food_name_singular": "chapati", "food_name_plural": "chapatis"},
+]
+
+
+def test_typo_finds_food():
+    idx = SuggestionIndex()
+    idx.sync(ROWS, 1)
+    assert idx.suggest("idlly")[0] == "idli"
+    assert idx.suggest("chappathi")[0] == "chapati"
+    assert idx.suggest("zzzz") == []
+
+
+def test_suggestions_are_unique_and_limited():
+    idx = SuggestionIndex(score_cutoff=0)
+    idx.sync(ROWS, 1)
+    out = idx.suggest("dosas", limit=2)
+    assert out[0] == "dosa"
+    assert len(out) == len(set(out)) <= 2
+
+
+def test_incremental_sync():
+    idx = SuggestionIndex()
+    idx.sync(ROWS, 1)
+    assert idx.suggest("puri") == []
+
+    rows = ROWS[1:] + [{"id": 5, "food_name_singular": "poori", "food_name_plural": "pooris"}]
+    idx.sync(rows, 2)
+    assert idx.suggest("puri") == ["poori"]
+    assert "idli" not in idx.suggest("idli")
+    assert len(idx) == 7
+
+    # same generation -> no work
+    idx.sync([], 2)
+    assert len(idx) == 7
+
+
+def test_sync_never_mutates_the_index_a_query_is_reading():
+    idx = SuggestionIndex()
+    idx.sync(ROWS, 1)
+    reading = idx._index
+    before = copy.deepcopy(reading)
+
+    idx.sync(ROWS[1:] + [{"id": 5, "food_name_singular": "idly", "food_name_plural": "idlys"}], 2)
+    assert reading == before            # an in-flight suggest() still sees generation 1
+    assert idx._index is not reading and "idly" in idx._index[0]
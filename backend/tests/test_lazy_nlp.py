@@ -0,0 +1,33 @@
+# backend/tests/test_lazy_nlp.py
+import os
+import subprocess
+import sys
+
+import physiqueneeds1
+
+
+def run(code, **env):
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=dict(os.environ, **env), capture_output=True, text=True, check=True,
+    )
+    return proc.stdout.strip()
+
+
+def test_import_does_not_load_spacy():
+    out = run("import sys, physiqueneeds1; print('spacy' in sys.modules)")
+    assert out == "False"
+
+
+def test_nlp_switch_off():
+    out = run("import physiqueneeds1; print(physiqueneeds1.get_nlp())", PHYSIQUE_NLP="0")
+    assert out == "None"
+
+
+def test_get_nlp_is_cached(monkeypatch):
+    monkeypatch.setattr(physiqueneeds1, "_nlp", None)
+    first = physiqueneeds1.get_nlp()
+    assert first is not None
+    assert physiqueneeds1.get_nlp() is first
+    assert physiqueneeds1.nlp is first
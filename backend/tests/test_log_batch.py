@@ -0,0 +1,87 @@
+# backend/tests/test_log_batch.py
+import pytest
+
+ROWS = {
+    "idli": {"food_name_singular": "idli", "calories_per_unit": 52, "protein_per_unit": 2,
+             "carbs_per_unit": 11, "fat_per_unit": 0.4, "per_100g": 0, "grams_per_unit": 55},
+}
+
+
+@pytest.fixture
+def lookups(db, monkeypatch):
+    seen = []
+
+    def fake_lookup(name):
+        seen.append(name)
+        return ROWS.get(name.rstrip("s"))
+
+    monkeypatch.setattr("physiqueneeds1.get_food_by_name", fake_lookup)
+    monkeypatch.setattr("physiqueneeds1.suggest_foods", lambda raw, limit=5: [])
+    monkeypatch.setattr("physiqueneeds1.catalog_generation", lambda: None)
+    return seen
+
+
+def saved(db):
+    return db.query("SELECT user_id, raw_text, timestamp FROM user_food_logs ORDER BY id")
+
+
+def test_batch_saves_valid_entries_and_reports_each(db, client, lookups):
+    res = client.post("/api/log/batch", json={"entries": [
+        {"user_id": 1, "text": "2 idli", "timestamp": "2025-12-25T08:30:00"},
+        {"user_id": 1, "text": "3 idlis and 1 vada"},
+        {"user_id": 2},
+        {"user_id": 2, "text": "1 idli", "timestamp": "yesterday"},
+    ]})
+    body = res.get_json()
+
+    assert res.status_code == 200
+    assert body["saved"] == 2 and body["failed"] == 2
+    assert body["results"][0]["totals"]["calories"] == 104
+    assert body["results"][1]["unrecognized"] == ["vada"]
+    assert body["results"][2]["success"] is False
+    assert body["results"][3]["error"] == "Invalid timestamp"
+
+    rows = saved(db)
+    assert [r[0] for r in rows] == [1, 1]
+    # no timestamp: stored at insert time
+    assert rows[0][2] == "2025-12-25 08:30:00" and rows[1][2] != rows[0][2]
+    # shared resolution: each distinct food looked up once
+    assert sorted(lookups) == ["idli", "idlis", "vada"]
+
+
+def test_batch_rejects_bad_payload(client, lookups):
+    assert client.post("/api/log/batch", json={"entries": []}).status_code == 400
+    assert client.post("/api/log/batch", json={"nope": 1}).status_code == 400
+
+
+def test_bad_user_ids_and_unparseable_text_fail_alone(db, client, lookups, monkeypatch):
+    def lookup(name):
+        if name == "boom":
+            raise RuntimeError("parser blew up")
+        return ROWS.get(name.rstrip("s"))
+    monkeypatch.setattr("physiqueneeds1.get_food_by_name", lookup)
+
+    res = client.post("/api/log/batch", json={"entries": [
+        {"user_id": "abc", "text": "1 idli"},
+        {"user_id": None, "text": "1 idli"},
+        {"user_id": True, "text": "1 idli"},
+        {"user_id": -4, "text": "1 idli"},
+        {"user_id": "3", "text": "2 idli"},
+        {"user_id": 3, "text": "1 boom"},
+        {"user_id": 3, "text": "1 idli"},
+    ]})
+    body = res.get_json()
+
+    assert res.status_code == 200
+    assert (body["saved"], body["failed"]) == (2, 5)
+    assert [r["error"] for r in body["results"][:4]] == ["Invalid user_id"] * 4
+    assert body["results"][5] == {"index": 5, "success": False, "error": "Could not parse text"}
+    assert [(r[0], r[1]) for r in saved(db)] == [(3, "2 idli"), (3, "1 idli")]
+
+
+def test_batch_with_no_valid_entry_is_400_and_writes_nothing(db, client, lookups):
+    res = client.post("/api/log/batch", json={"entries": [
+        {"user_id": "x", "text": "1 idli"}, {"user_id": 1},
+    ]})
+    assert res.status_code == 400
+    assert res.get_json()["failed"] == 2 and saved(db) == []
@@ -0,0 +1,110 @@
+# backend/tests/test_log_writer.py
+import threading
+
+import pytest
+
+import app as app_module
+import physiqueneeds1
+from log_writer import LogQueueFull, LogWriter
+
+
+def entry(i):
+    return (1, f"{i} idli", [], {"totals": {"calories": i}}, None)
+
+
+def test_write_behind_batches_into_standin_db(db):
+    writer = LogWriter(sink=physiqueneeds1.save_logs, batch_size=100, interval=0.01)
+    for i in range(1000):
+        writer.submit(entry(i))
+    assert writer.flush(timeout=10)
+
+    assert db.query("SELECT COUNT(*) FROM user_food_logs")[0][0] == 1000
+    stats = writer.stats()
+    assert stats["written"] == 1000 and stats["queue_depth"] == 0
+    assert 10 <= stats["batches"] < 1000
+    writer.close()
+
+
+def test_close_flushes_pending_logs(db):
+    writer = LogWriter(sink=physiqueneeds1.save_logs, batch_size=1000, interval=10)
+    for i in range(5):
+        writer.submit(entry(i))
+    writer.close(timeout=5)
+    assert db.query("SELECT COUNT(*) FROM user_food_logs")[0][0] == 5
+
+
+def test_reject_policy_when_queue_is_full():
+    entered, release, written = threading.Event(), threading.Event(), []
+
+    def slow_sink(batch):
+        entered.set()
+        release.wait(5)
+        written.extend(batch)
+
+    writer = LogWriter(sink=slow_sink, maxsize=2, batch_size=1, interval=0.01, on_full="reject")
+    writer.submit(entry(0))
+    assert entered.wait(5)          # flusher holds entry 0, queue is empty again
+    writer.submit(entry(1))
+    writer.submit(entry(2))
+    with pytest.raises(LogQueueFull):
+        writer.submit(entry(3))
+    assert writer.stats()["rejected"] == 1
+
+    release.set()
+    writer.close(timeout=5)
+    assert len(written) == 3
+
+
+def test_failed_batches_are_retried():
+    calls = []
+
+    def flaky_sink(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("db hiccup")
+
+    writer = LogWriter(sink=flaky_sink, batch_size=10, interval=0.01, retries=2)
+    writer.submit(entry(0))
+    writer.close(timeout=5)
+    stats = writer.stats()
+    assert stats["written"] == 1 and stats["failed_flushes"] == 1 and stats["dropped"] == 0
+
+
+def test_one_bad_row_does_not_drop_the_batch():
+    written = []
+
+    def strict_sink(batch):
+        if any(not isinstance(e[0], int) for e in batch):
+            raise ValueError("Incorrect integer value for column 'user_id'")
+        written.extend(batch)
+
+    writer = LogWriter(sink=strict_sink, batch_size=10, interval=10, retries=1)
+    for i in range(5):
+        writer.submit(entry(i))
+    writer.submit(("abc", "bad", [], {"totals": {}}, None))
+    for i in range(5, 9):
+        writer.submit(entry(i))
+    writer.close(timeout=5)
+
+    assert sorted(e[1] for e in written) == sorted(f"{i} idli" for i in range(9))
+    stats = writer.stats()
+    assert stats["written"] == 9 and stats["dropped"] == 1
+
+
+def test_write_behind_log_is_validated_before_it_is_queued(monkeypatch):
+    queued = []
+    writer = LogWriter(sink=queued.extend, batch_size=10, interval=0.01)
+    monkeypatch.setattr(app_module, "LOG_WRITE_BEHIND", True)
+    monkeypatch.setattr(app_module, "log_writer", writer)
+    monkeypatch.setattr(app_module, "parse_and_compute", lambda text: ([], {"totals": {}}))
+    client = app_module.app.test_client()
+
+    for bad in ({"user_id": "abc"}, {"user_id": 0}, {"user_id": 1, "timestamp": "yesterday"}):
+        res = client.post("/api/log", json={"text": "1 idli", **bad})
+        assert res.status_code == 400 and res.get_json()["success"] is False
+    res = client.post("/api/log", json={"user_id": "7", "text": "1 idli",
+                                        "timestamp": "2025-01-01T08:00:00"})
+    assert res.get_json() == {"success": True, "queued": True}
+
+    writer.close(timeout=5)
+    assert queued == [(7, "1 idli", [], {"totals": {}}, "2025-01-01 08:00:00")]
@@ -0,0 +1,56 @@
+# backend/tests/test_logs_pagination.py
+import pytest
+
+import app as app_module
+import physiqueneeds1
+
+
+@pytest.fixture(autouse=True)
+def logs(db):
+    # 25 logs, several sharing a timestamp so the id tie-break matters
+    physiqueneeds1.save_logs([
+        (1, f"log {i}", [{"food": "idli"}], {"totals": {"calories": i}}, f"2025-01-{1 + i // 3:02d} 08:00:00")
+        for i in range(25)
+    ] + [(2, "other user", [], {"totals": {}}, "2025-01-05 08:00:00")])
+
+
+def pages(client, url):
+    cursor, seen = None, []
+    while True:
+        res = client.get(url + (f"&before={cursor}" if cursor else "")).get_json()
+        seen.append(res["logs"])
+        cursor = res["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_default_is_latest_ten(client):
+    res = client.get("/api/logs?user_id=1").get_json()
+    assert [r["raw_text"] for r in res["logs"]] == [f"log {i}" for i in range(24, 14, -1)]
+    assert set(res["logs"][0]) == {"id", "raw_text", "totals_json", "timestamp"}
+    assert res["next_cursor"]
+
+
+def test_cursor_walks_every_row_once_newest_first(client):
+    got = pages(client, "/api/logs?user_id=1&limit=4")
+    assert [len(p) for p in got] == [4, 4, 4, 4, 4, 4, 1]
+    texts = [r["raw_text"] for p in got for r in p]
+    assert texts == [f"log {i}" for i in range(24, -1, -1)]
+
+
+def test_field_projection_keeps_cursor_columns(client):
+    res = client.get("/api/logs?user_id=1&limit=2&fields=raw_text").get_json()
+    assert set(res["logs"][0]) == {"id", "timestamp", "raw_text"}
+
+    res = client.get("/api/logs?user_id=1&fields=raw_text,password")
+    assert res.status_code == 400
+
+
+@pytest.mark.parametrize("query", ["limit=abc", "before=garbage", "before=2025-01-01,x"])
+def test_bad_paging_params(client, query):
+    assert client.get(f"/api/logs?user_id=1&{query}").status_code == 400
+
+
+def test_limit_is_capped(client, monkeypatch):
+    monkeypatch.setattr(app_module, "LOGS_PAGE_MAX", 3)
+    assert len(client.get("/api/logs?user_id=1&limit=100").get_json()["logs"]) == 3
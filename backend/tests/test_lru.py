@@ -0,0 +1,28 @@
+# backend/tests/test_lru.py
+from lru import BoundedLRU
+
+
+class Plain(BoundedLRU):
+    def get(self, key):
+        with self._lock:
+            return self._found(key, self._data.get(key))
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+
+def test_evicts_least_recently_used_and_counts():
+    cache = Plain(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # "b" is now the oldest
+    cache.put("c", 3)
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+    cache.clear()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,74 @@
+# backend/tests/test_migrate.py
+import pytest
+
+import migrate
+from standin_db import StandInDB
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    standin = StandInDB(tmp_path / "physique.db", schema="")
+    monkeypatch.setattr(migrate, "get_conn", standin.connect)
+    return standin
+
+
+@pytest.fixture
+def migrations(tmp_path):
+    path = tmp_path / "migrations"
+    path.mkdir()
+    (path / "0001_create_things.sql").write_text(
+        "-- things; with a semicolon in a comment\n"
+        "CREATE TABLE things (id INTEGER PRIMARY KEY, user_id INTEGER);\n"
+        "CREATE INDEX idx_things_user ON things (user_id);\n"
+    )
+    (path / "0002_seed.sql").write_text("INSERT INTO things (user_id) VALUES (1);")
+    (path / "README.md").write_text("not a migration")
+    return path
+
+
+def test_split_statements_ignores_comments():
+    sql = "-- a; b\nCREATE TABLE x (id INT);\n\n-- tail\nDROP TABLE y;\n"
+    assert migrate.split_statements(sql) == ["CREATE TABLE x (id INT)", "DROP TABLE y"]
+
+
+def test_up_applies_in_order_once(db, migrations):
+    assert [s for *_, s in migrate.status(migrations)] == ["pending", "pending"]
+
+    assert migrate.up(target=1, path=migrations) == [1]
+    assert migrate.up(path=migrations) == [2]
+    assert migrate.up(path=migrations) == []
+
+    assert db.query("SELECT user_id FROM things") == [(1,)]
+    assert [v for v, in db.query("SELECT version FROM schema_migrations")] == [1, 2]
+    assert [s for *_, s in migrate.status(migrations)] == ["applied", "applied"]
+
+
+def test_status_flags_edited_migration(db, migrations):
+    migrate.up(path=migrations)
+    (migrations / "0002_seed.sql").write_text("INSERT INTO things (user_id) VALUES (2);")
+    assert migrate.status(migrations)[1][2].startswith("applied (file changed")
+
+
+def test_full_scans_flags_unindexed_plans():
+    plan = [
+        {"table": "user_food_logs", "type": "ref", "key": "idx_food_logs_user_ts"},
+        {"table": "user_profiles", "type": "ALL", "key": None},
+        {"table": None, "type": None, "key": None, "Extra": "Impossible WHERE"},
+    ]
+    assert [r["table"] for r in migrate.full_scans(plan)] == ["user_profiles"]
+
+
+def test_plan_checks_use_half_open_ranges():
+    checks = dict((name, (sql, params)) for name, sql, params in migrate.plan_checks(7))
+    sql, (user_id, start, end) = checks["export day range"]
+    assert "timestamp >= %s" in sql and "timestamp < %s" in sql and "DATE(" not in sql
+    assert user_id == 7 and (end - start).days == 1 and start.hour == 0
+
+
+def test_plan_checks_are_the_queries_the_routes_run():
+    import app as app_module
+    from rollup import range_rows_sql
+
+    checks = dict((name, sql) for name, sql, _ in migrate.plan_checks(7))
+    assert checks["/api/logs first page"] == app_module.logs_page_sql(app_module.DEFAULT_LOG_FIELDS)
+    assert checks["range summary"] == range_rows_sql(("calories",), 2)
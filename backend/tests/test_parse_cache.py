@@ -0,0 +1,46 @@
+# backend/tests/test_parse_cache.py
+import physiqueneeds1
+from parse_cache import ParseCache
+
+
+def test_lru_eviction_and_stats():
+    cache = ParseCache(maxsize=2)
+    cache.put("a", 1, ("A", {}))
+    cache.put("b", 1, ("B", {}))
+    assert cache.get("a", 1) == ("A", {})
+    cache.put("c", 1, ("C", {}))          # evicts "b" (least recently used)
+    assert cache.get("b", 1) is None
+    assert cache.get("c", 1) == ("C", {})
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_new_generation_drops_entries():
+    cache = ParseCache(maxsize=10)
+    cache.put("a", 1, ("A", {}))
+    assert cache.get("a", 2) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_returned_values_are_copies():
+    cache = ParseCache(maxsize=10)
+    cache.put("a", 1, ([{"food": "idli"}], {}))
+    cache.get("a", 1)[0][0]["food"] = "changed"
+    assert cache.get("a", 1)[0][0]["food"] == "idli"
+
+
+def test_repeated_phrase_skips_parsing(monkeypatch):
+    calls = []
+    row = {"calories_per_unit": 52, "protein_per_unit": 2, "carbs_per_unit": 11,
+           "fat_per_unit": 0.4, "per_100g": 0}
+    monkeypatch.setattr(physiqueneeds1, "parse_cache", ParseCache(maxsize=10))
+    monkeypatch.setattr(physiqueneeds1, "catalog_generation", lambda: 1)
+    monkeypatch.setattr(physiqueneeds1, "get_food_by_name", lambda n: calls.append(n) or row)
+
+    first = physiqueneeds1.parse_and_compute("I ate 2 idli")
+    again = physiqueneeds1.parse_and_compute("i ATE  2 idli")
+    assert first == again
+    assert again[1]["totals"]["calories"] == 104
+    assert calls == ["idli"]
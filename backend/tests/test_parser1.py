@@ -29,3 +29,38 @@ def test_parse_tamil_english_mix(monkeypatch):
     found = next((it for it in res if 'idli' in it['food']), None)
     assert found is not None
     assert found['quantity'] == 4
+
+def items(text):
+    from physiqueneeds1 import clean_text, tokenize, extract_items
+    return [(m['food'], m['quantity'], m['unit']) for m in extract_items(tokenize(clean_text(text)))]
+
+def test_articles_inside_words_are_not_quantities():
+    assert items("banana and 2 dosa") == [("dosa", 2, None)]
+
+def test_fractions_and_number_words():
+    assert items("1/2 cup rice") == [("rice", 0.5, "cup")]
+    assert items("half a cup rice") == [("rice", 0.5, "cup")]
+    assert items("2 1/2 chapati") == [("chapati", 2.5, None)]
+    assert items("an apple") == [("apple", 1, None)]
+
+def test_food_before_quantity_and_filler_words():
+    assert items("rice 2, dosa 3") == [("rice", 2, None), ("dosa", 3, None)]
+    assert items("2 cups of rice and 1 apple") == [("rice", 2, "cup"), ("apple", 1, None)]
+    assert items("I had 200g paneer") == [("paneer", 200, "g")]
+
+def test_uncached_parse_suggests_in_one_round_trip(db, monkeypatch):
+    import physiqueneeds1
+    from physiqueneeds1 import parse_texts
+    db.query("INSERT INTO foods (food_name_singular, food_name_plural) VALUES "
+             "('idli', 'idlis'), ('rava idli', 'rava idlis'), ('dosa', 'dosas'), "
+             "('masala dosa', 'masala dosas'), ('vada', 'vadas')")
+    monkeypatch.setattr(physiqueneeds1, "CATALOG_CACHE_ENABLED", False)
+    connects = []
+    monkeypatch.setattr(physiqueneeds1, "get_conn", lambda: connects.append(1) or db.connect())
+
+    res = parse_texts(["2 idl and 1 dos", "1 dos and 3 vad", "1 xyz"])
+    # one IN lookup for the names + one query for all the suggestions
+    assert len(connects) == 2
+    by_food = {it["food"]: it["suggestions"] for items in res for it in items}
+    assert by_food == {"idl": ["idli", "rava idli"], "dos": ["dosa", "masala dosa"],
+                       "vad": ["vada"], "xyz": []}
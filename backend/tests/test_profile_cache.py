@@ -0,0 +1,80 @@
+# backend/tests/test_profile_cache.py
+import pytest
+
+import app as app_module
+from calorie_target import calculate_daily_calories
+from profile_cache import ProfileCache, macro_targets
+
+PROFILE = {"user_id": 1, "age": 30, "height_cm": 180, "weight_kg": 80,
+           "gender": "male", "activity_level": "light", "goal": "loss"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entry_holds_computed_targets():
+    cache = ProfileCache(maxsize=10, ttl=60)
+    entry = cache.put(1, PROFILE)
+    target = calculate_daily_calories(PROFILE)
+    assert entry["daily_target"] == target
+    assert entry["macro_targets"] == macro_targets(target)
+    assert cache.get("1") == entry          # JSON string ids hit the same key
+
+
+def test_ttl_and_size_bound():
+    clock = Clock()
+    cache = ProfileCache(maxsize=2, ttl=10, clock=clock)
+    cache.put(1, PROFILE)
+    cache.put(2, PROFILE)
+    cache.get(1)
+    cache.put(3, PROFILE)                   # evicts 2 (least recently used)
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+
+    clock.now = 10
+    assert cache.get(1) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expirations"] == 1
+
+
+def test_returned_entries_are_copies():
+    cache = ProfileCache(maxsize=10, ttl=60)
+    cache.put(1, PROFILE)
+    cache.get(1)["profile"]["goal"] = "gain"
+    assert cache.get(1)["profile"]["goal"] == "loss"
+
+
+@pytest.fixture
+def db(profile, monkeypatch):
+    monkeypatch.setattr(app_module, "profile_cache", ProfileCache(maxsize=10, ttl=60))
+    return profile
+
+
+def test_summaries_skip_profile_query_once_cached(db, client, monkeypatch):
+    client.get("/api/summary/macros/1")
+
+    reads = []
+    real = app_module.fetch_user_profile
+    monkeypatch.setattr(app_module, "fetch_user_profile",
+                        lambda cur, uid: reads.append(uid) or real(cur, uid))
+    client.get("/api/summary/macros/1")
+    client.get("/api/summary/weekly/1")
+    assert reads == []
+
+
+def test_profile_update_writes_through(db, client):
+    before = client.get("/api/summary/macros/1").get_json()["targets"]["calories"]
+
+    res = client.post("/api/profile/update", json={
+        "user_id": "1", "age": 30, "height_cm": 180, "weight_kg": 80,
+        "gender": "male", "activity_level": "light", "goal": "gain",
+    }).get_json()
+    assert res["profile"]["goal"] == "gain"
+
+    after = client.get("/api/summary/macros/1").get_json()["targets"]["calories"]
+    assert after == res["daily_target"] and after != before
@@ -0,0 +1,72 @@
+# backend/tests/test_range_summary.py
+from datetime import date
+
+import pytest
+
+import physiqueneeds1
+from rollup import bucket_rows
+
+
+def computed(calories, protein=0):
+    return {"totals": {"calories": calories, "protein": protein, "fiber": 2}, "items": []}
+
+
+@pytest.fixture(autouse=True)
+def logs(db):
+    physiqueneeds1.save_logs([
+        (1, "a", [], computed(100, 10), "2025-01-01 08:00:00"),
+        (1, "b", [], computed(200, 20), "2025-01-01 20:00:00"),
+        (1, "c", [], computed(300), "2025-01-06 12:00:00"),     # Monday
+        (1, "d", [], computed(400), "2025-02-03 12:00:00"),
+        (2, "e", [], computed(50), "2025-01-02 12:00:00"),
+    ])
+
+
+def test_day_buckets_fill_gaps(client):
+    res = client.get("/api/summary/range?user_id=1&from=2025-01-01&to=2025-01-03").get_json()
+    days = res["users"]["1"]
+    assert [d["start"] for d in days] == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert days[0]["totals"]["calories"] == 300 and days[0]["log_count"] == 2
+    assert days[1]["totals"]["calories"] == 0 and days[1]["days_logged"] == 0
+
+
+def test_week_and_month_buckets_clip_to_range(client):
+    res = client.get("/api/summary/range?user_id=1&from=2025-01-01&to=2025-01-12&bucket=week").get_json()
+    weeks = res["users"]["1"]
+    assert [(w["start"], w["end"], w["days"]) for w in weeks] == [
+        ("2025-01-01", "2025-01-05", 5), ("2025-01-06", "2025-01-12", 7)
+    ]
+    assert weeks[0]["average"]["calories"] == 60.0
+
+    res = client.get("/api/summary/range?user_id=1&from=2025-01-01&to=2025-02-28&bucket=month").get_json()
+    assert [m["totals"]["calories"] for m in res["users"]["1"]] == [600, 400]
+
+
+def test_multiple_users_and_nutrient_selection(client):
+    res = client.get(
+        "/api/summary/range?user_id=1,2&user_id=3&from=2025-01-01&to=2025-01-31"
+        "&bucket=month&nutrients=calories,fiber"
+    ).get_json()
+    assert set(res["users"]) == {"1", "2", "3"}
+    assert res["users"]["2"][0]["totals"] == {"calories": 50, "fiber": 2}
+    assert res["users"]["3"][0]["totals"] == {"calories": 0, "fiber": 0}
+
+
+@pytest.mark.parametrize("query", [
+    "from=2025-01-01",                                   # no user
+    "user_id=x",
+    "user_id=1&from=2025-02-01&to=2025-01-01",
+    "user_id=1&bucket=year",
+    "user_id=1&nutrients=calories,secret",
+    "user_id=1&from=2000-01-01&to=2025-01-01",           # too long
+])
+def test_rejects_bad_queries(client, query):
+    assert client.get(f"/api/summary/range?{query}").status_code == 400
+
+
+def test_bucket_rows_across_year_boundary():
+    rows = [{"day": date(2024, 12, 31), "log_count": 1, "calories": 10}]
+    out = bucket_rows(rows, date(2024, 12, 1), date(2025, 1, 31), "month", ("calories",))
+    assert [(m["start"], m["totals"]["calories"]) for m in out] == [
+        ("2024-12-01", 10), ("2025-01-01", 0)
+    ]
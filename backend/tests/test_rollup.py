@@ -0,0 +1,72 @@
+# backend/tests/test_rollup.py
+import app as app_module
+import physiqueneeds1
+import rollup
+
+
+def computed(calories, protein=0):
+    return {"totals": {"calories": calories, "protein": protein, "fiber": 1}, "items": []}
+
+
+def test_saves_update_daily_rollup(db):
+    physiqueneeds1.save_logs([
+        (1, "2 idli", [], computed(104, 4), None),
+        (1, "1 vada", [], computed(50, 2), None),
+        (1, "old", [], computed(999), "2025-01-01 10:00:00"),
+        (2, "rice", [], computed(260), None),
+    ])
+    physiqueneeds1.save_log(1, "1 idli", [], computed(52, 2))
+
+    rows = db.query("SELECT user_id, day, log_count, calories, protein, fiber "
+                    "FROM user_daily_totals ORDER BY user_id, day")
+    assert rows[0][1:] == ("2025-01-01", 1, 999, 0, 1)
+    assert rows[1][2:] == (3, 206, 8, 3)
+    assert rows[2][0] == 2 and rows[2][3] == 260
+
+    assert app_module.get_today_totals(1) == {
+        "calories": 206.0, "protein": 8.0, "carbs": 0.0, "fat": 0.0
+    }
+
+
+def test_rebuild_matches_incremental(db):
+    physiqueneeds1.save_logs([
+        (1, "a", [], computed(100, 1), None),
+        (1, "b", [], computed(20, 2), "2025-01-01 10:00:00"),
+        (2, "c", [], computed(7), None),
+    ])
+    before = db.query("SELECT * FROM user_daily_totals ORDER BY user_id, day")
+
+    db.query("UPDATE user_daily_totals SET calories = -1")
+    assert rollup.rebuild(1) == 2
+    assert rollup.rebuild() == 3
+    assert db.query("SELECT * FROM user_daily_totals ORDER BY user_id, day") == before
+
+
+def test_daily_rows_window_is_half_open(db):
+    physiqueneeds1.save_logs([
+        (1, "today", [], computed(10), None),
+        (1, "long ago", [], computed(20), "2020-01-01 23:59:59"),
+    ])
+    db.query("INSERT INTO user_daily_totals (user_id, day, log_count, calories) "
+             "VALUES (1, DATE('now', '+1 day'), 1, 30)")
+
+    conn = db.connect()
+    try:
+        rows = rollup.get_daily_rows(conn.cursor(), 1, 7, columns=("calories",))
+    finally:
+        conn.close()
+    assert [r[1] for r in rows] == [10]
+
+
+def test_rebuild_since_keeps_older_days(db):
+    from datetime import date
+
+    physiqueneeds1.save_logs([
+        (1, "a", [], computed(100), "2025-01-01 10:00:00"),
+        (1, "b", [], computed(20), "2025-01-02 00:00:00"),
+    ])
+    db.query("UPDATE user_daily_totals SET calories = -1")
+
+    assert rollup.rebuild(1, since=date(2025, 1, 2)) == 1
+    rows = db.query("SELECT day, calories FROM user_daily_totals ORDER BY day")
+    assert rows == [("2025-01-01", -1), ("2025-01-02", 20)]
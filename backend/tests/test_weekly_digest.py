@@ -0,0 +1,104 @@
+# backend/tests/test_weekly_digest.py
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import weekly_digest
+from calorie_target import ACTIVITY_MAP, calculate_daily_calories, calculate_daily_calories_many
+
+
+def random_profiles(n, seed=3):
+    rng = random.Random(seed)
+    return [{
+        "age": rng.choice([None, rng.randint(16, 80)]),
+        "height_cm": rng.choice([None, rng.randint(140, 205)]),
+        "weight_kg": rng.choice([None, rng.uniform(40, 140)]),
+        "gender": rng.choice(["male", "female", None]),
+        "activity_level": rng.choice([*ACTIVITY_MAP, None, "extreme"]),
+        "goal": rng.choice(["loss", "gain", "maintain", "maintenance", None]),
+    } for _ in range(n)]
+
+
+def test_vectorized_target_matches_scalar():
+    profiles = random_profiles(2000)
+    assert calculate_daily_calories_many(profiles).tolist() == [
+        calculate_daily_calories(p) for p in profiles
+    ]
+
+
+@pytest.fixture
+def week(db):
+    rng = random.Random(7)
+    today = datetime.now(timezone.utc).date()     # SQLite CURDATE is UTC
+    for uid, p in enumerate(random_profiles(30), start=1):
+        db.query(
+            "INSERT INTO user_profiles (user_id, age, height_cm, weight_kg, gender, activity_level, goal) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (uid, p["age"], p["height_cm"], p["weight_kg"], p["gender"], p["activity_level"], p["goal"]),
+        )
+    for uid in range(1, 41):                     # 31..40 have logs but no profile
+        for back in range(10):
+            if rng.random() < 0.6:
+                db.query(
+                    "INSERT INTO user_daily_totals (user_id, day, log_count, calories, protein, carbs, fat) "
+                    "VALUES (?, ?, 1, ?, ?, ?, ?)",
+                    (uid, (today - timedelta(days=back)).isoformat(),
+                     rng.uniform(800, 3500), rng.uniform(0, 200), rng.uniform(0, 400), rng.uniform(0, 120)),
+                )
+    return db, today
+
+
+def test_digest_matches_weekly_endpoint(week, client, tmp_path):
+    standin, today = week
+    out = tmp_path / "digest.ndjson"
+    stats = weekly_digest.run(today, str(out))
+    assert stats["users"] == 40 and stats["users_per_s"] > 0
+
+    for line in out.read_text().splitlines():
+        rec = json.loads(line)
+        api = client.get(f"/api/summary/weekly/{rec['user_id']}").get_json()
+        for key in ("average_calories", "average_protein", "average_carbs", "average_fat"):
+            assert rec[key] == pytest.approx(api[key], abs=0.011)
+        assert rec["consistency_percent"] == api["consistency_percent"]
+        assert rec["status"] == api["status"]
+        assert rec["days_logged"] == len(api["days"])
+
+
+def test_digest_writes_table_idempotently(week):
+    standin, today = week
+    weekly_digest.run(today)
+    first = standin.query("SELECT * FROM user_weekly_summaries ORDER BY user_id")
+    weekly_digest.run(today)
+    again = standin.query("SELECT * FROM user_weekly_summaries ORDER BY user_id")
+    assert len(first) == 40
+    assert [r[:11] for r in again] == [r[:11] for r in first]
+
+
+def test_compute_is_vectorized_fast_enough():
+    n = 100_000
+    rng = np.random.default_rng(1)
+    day_users = np.repeat(np.arange(n), 5)
+    day_values = rng.uniform(0, 3000, size=(len(day_users), 4))
+    profiles = {i: p for i, p in enumerate(random_profiles(1000))}
+
+    t0 = time.perf_counter()
+    result = weekly_digest.compute(day_users, day_values, profiles)
+    assert time.perf_counter() - t0 < 2
+    assert len(result["user_id"]) == n and result["days_logged"].sum() == 5 * n
+
+
+def test_load_week_grows_its_buffer_across_chunks(week, monkeypatch):
+    standin, today = week
+    conn = standin.connect()
+    expected = weekly_digest.load_week(conn, today - timedelta(days=6), today)
+
+    monkeypatch.setattr(weekly_digest, "DIGEST_FETCH_SIZE", 7)
+    users, values = weekly_digest.load_week(conn, today - timedelta(days=6), today)
+    assert len(users) > 7 * 4
+    assert users.tolist() == expected[0].tolist()
+    assert np.array_equal(values, expected[1])
+    conn.close()
@@ -0,0 +1,106 @@
+# backend/tests/test_workout_concurrency.py
+import json
+import multiprocessing
+import os
+import threading
+from datetime import date
+
+import pytest
+
+import workout_store
+
+PROCESSES = 4
+THREADS = 2
+PER_THREAD = 250
+
+pytestmark = pytest.mark.skipif(
+    workout_store.fcntl is None or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="needs fcntl.flock and fork",
+)
+
+
+def _worker(log_dir, proc, start):
+    """One 'gunicorn worker': a few threads posting completions"""
+    workout_store.LOG_DIR = log_dir
+    from app import app
+    client = app.test_client()
+    start.wait()
+
+    def post(thread):
+        for i in range(PER_THREAD):
+            res = client.post("/api/workout/complete", json={
+                "user_id": 1, "workout_name": f"p{proc}t{thread}i{i}",
+                "sets": 1, "calories_per_set": 1,
+            })
+            assert res.status_code == 200
+
+    threads = [threading.Thread(target=post, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_no_completion_is_lost_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(workout_store, "LOG_DIR", str(tmp_path))
+    ctx = multiprocessing.get_context("fork")
+    start = ctx.Event()
+    procs = [ctx.Process(target=_worker, args=(str(tmp_path), p, start)) for p in range(PROCESSES)]
+    for p in procs:
+        p.start()
+    start.set()
+    for p in procs:
+        p.join(120)
+        assert p.exitcode == 0
+
+    total = PROCESSES * THREADS * PER_THREAD
+    today = date.today()
+    names = [w["workout_name"] for w in workout_store.read_day(1, today)]
+    assert len(names) == total and len(set(names)) == total
+    assert workout_store.day_totals(1, today) == (total, total)
+
+    # running totals are a strict sequence: no two writers read the same tail
+    lines = (tmp_path / f"user_1_{today.isoformat()}.ndjson").read_text().splitlines()
+    assert [json.loads(l)["count"] for l in lines] == list(range(1, total + 1))
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+
+def test_manifest_compaction_under_concurrent_appends(tmp_path, monkeypatch):
+    """Readers compacting the manifest while appends land lose no delta line"""
+    monkeypatch.setattr(workout_store, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(workout_store, "INDEX_COMPACT_SLACK", 4)
+    day = date(2025, 1, 1)
+    done = threading.Event()
+    errors = []
+
+    def append(n):
+        try:
+            for i in range(100):
+                workout_store.append_workout(1, {"workout_name": f"w{n}",
+                                                 "calories_burned": 1.0}, day)
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            while not done.is_set():
+                workout_store.day_index(1)
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    writers = [threading.Thread(target=append, args=(n,)) for n in range(4)]
+    for t in writers:
+        t.start()
+    for t in writers:
+        t.join()
+    done.set()
+    reader.join()
+
+    assert errors == []
+    [summary] = workout_store.day_index(1)
+    assert (summary["burned"], summary["count"]) == workout_store.day_totals(1, day) == (400.0, 400)
+    assert {name: ex["count"] for name, ex in summary["exercises"].items()} == {
+        f"w{n}": 100 for n in range(4)}
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
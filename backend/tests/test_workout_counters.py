@@ -0,0 +1,99 @@
+# backend/tests/test_workout_counters.py
+from datetime import date
+
+import pytest
+
+import workout
+import workout_db
+import workout_store
+from workout_counters import TodayCounters
+
+
+@pytest.fixture
+def counters(tmp_path, monkeypatch):
+    monkeypatch.setattr(workout_store, "LOG_DIR", str(tmp_path))
+    fresh = TodayCounters()
+    monkeypatch.setattr(workout, "today_counters", fresh)
+    return fresh
+
+
+def complete(client, user_id=4, sets=2):
+    return client.post("/api/workout/complete", json={
+        "user_id": user_id, "workout_name": "Lunges", "sets": sets, "calories_per_set": 10,
+    }).get_json()
+
+
+def test_counters_hit_miss_and_stale():
+    c = TodayCounters(clock=lambda: date(2025, 1, 1))
+    assert c.get(1, "v1") is None
+    c.put(1, date(2025, 1, 1), "v1", 50.0, 2)
+    assert c.get("1", "v1") == (50.0, 2)
+    assert c.get(1, "v2") is None           # written elsewhere since
+    assert c.stats()["hits"] == 1 and c.stats()["stale"] == 1
+
+
+def test_counters_reset_at_day_boundary():
+    today = [date(2025, 1, 1)]
+    c = TodayCounters(clock=lambda: today[0])
+    c.put(1, date(2025, 1, 1), "v", 50.0, 2)
+    c.put(2, date(2024, 12, 31), "v", 9.0, 1)      # not today: ignored
+    assert c.stats()["size"] == 1
+
+    today[0] = date(2025, 1, 2)
+    assert c.get(1, "v") is None
+    assert c.stats()["size"] == 0 and c.stats()["resets"] == 1
+
+
+def test_counters_evict_least_recent():
+    c = TodayCounters(maxsize=2, clock=lambda: date(2025, 1, 1))
+    for user_id in (1, 2, 3):
+        c.put(user_id, date(2025, 1, 1), "v", 1.0, 1)
+    assert c.get(1, "v") is None and c.get(3, "v") == (1.0, 1)
+    assert c.stats()["evictions"] == 1
+
+
+def test_completion_updates_counters_without_rereading(counters, client, monkeypatch):
+    complete(client)
+    complete(client)
+
+    def no_reads(*_):
+        raise AssertionError("served from the counters")
+    monkeypatch.setattr(workout_store, "day_totals", no_reads)
+    monkeypatch.setattr(workout_store, "read_day", no_reads)
+
+    res = client.get("/api/workout/today/4?summary_only=1").get_json()
+    assert res == {"date": date.today().isoformat(), "today_burned": 40.0, "workouts_count": 2}
+    assert counters.stats()["hits"] == 1
+
+
+def test_other_writers_and_misses_rebuild_from_storage(counters, client):
+    complete(client)
+    # another worker process appended (our counters never saw it)
+    workout_store.append_workout(4, {"workout_name": "Row", "calories_burned": 5.0,
+                                     "timestamp": "2025-01-01T00:00:00"})
+    res = client.get("/api/workout/today/4?summary_only=true").get_json()
+    assert (res["today_burned"], res["workouts_count"]) == (25.0, 2)
+
+    counters.invalidate()
+    assert client.get("/api/workout/today/4?summary_only=1").get_json()["today_burned"] == 25.0
+    assert counters.stats()["misses"] == 2
+
+
+def test_full_mode_still_lists_workouts(counters, client):
+    complete(client, sets=3)
+    res = client.get("/api/workout/today/4").get_json()
+    assert res["today_burned"] == 30.0 and res["workouts_count"] == 1
+    assert [w["workout_name"] for w in res["workouts"]] == ["Lunges"]
+
+
+def test_sql_store_reads_totals_directly(db, counters, client, monkeypatch):
+    monkeypatch.setattr(workout, "WORKOUT_STORE", "sql")
+    complete(client)
+
+    def no_version_probe(*_):
+        raise AssertionError("a version check would cost as much as the totals")
+    monkeypatch.setattr(workout_db, "day_version", no_version_probe)
+
+    res = client.get("/api/workout/today/4?summary_only=1").get_json()
+    assert res["today_burned"] == 20.0 and res["workouts_count"] == 1
+    assert counters.stats()["size"] == 0
@@ -0,0 +1,98 @@
+# backend/tests/test_workout_db.py
+import json
+from datetime import date
+
+import workout
+import workout_db
+import workout_store
+from legacy_files import write_legacy
+
+DAY = date(2025, 1, 1)
+
+
+def squat(n=1):
+    return {"workout_name": "Squats", "sets": n, "calories_per_set": 90.0,
+            "calories_burned": 90.0 * n, "timestamp": f"2025-01-01T10:00:0{n}.250000"}
+
+
+def test_same_answers_as_the_file_store(db):
+    for n in (1, 2, 3):
+        from_file = workout_store.append_workout(7, squat(n), DAY)
+        from_sql = workout_db.append_workout(7, squat(n), DAY)
+        from_file.pop("version"), from_sql.pop("version")    # store-specific stamps
+        assert from_sql == from_file
+
+    assert workout_db.read_day(7, DAY) == workout_store.read_day(7, DAY)
+    assert workout_db.day_totals(7, DAY) == workout_store.day_totals(7, DAY) == (540.0, 3)
+    assert workout_db.day_totals(7, date(2025, 1, 2)) == (0, 0)
+    assert list(workout_db.iter_range(7, DAY, DAY)) == list(workout_store.iter_range(7, DAY, DAY))
+
+
+def test_day_version_changes_on_append(db):
+    before = workout_db.day_version(7, DAY)
+    workout_db.append_workout(7, squat(1), DAY)
+    assert workout_db.day_version(7, DAY) != before
+
+
+def test_routes_respond_identically_with_sql_store(db, client, monkeypatch):
+    payload = {"user_id": 5, "workout_name": "Pushups", "sets": 3, "calories_per_set": 8}
+
+    responses = {}
+    for backend in ("file", "sql"):
+        monkeypatch.setattr(workout, "WORKOUT_STORE", backend)
+        posted = client.post("/api/workout/complete", json=payload).get_json()
+        today = client.get("/api/workout/today/5").get_json()
+        for w in [posted["logged_workout"], *today["workouts"]]:
+            assert w.pop("timestamp").startswith(date.today().isoformat() + "T")
+        responses[backend] = (posted, today)
+
+    assert responses["sql"] == responses["file"]
+    assert responses["sql"][1]["today_burned"] == 24.0
+    assert db.query("SELECT user_id, workout_name FROM user_workout_logs") == [(5, "Pushups")]
+
+
+def test_importer_batches_whole_days_and_can_rerun(db, monkeypatch):
+    log_dir = workout_store.LOG_DIR
+    write_legacy(f"{log_dir}/user_1_2025-01-01.json", [squat(1), squat(2)])
+    for n in (1, 2, 3):
+        workout_store.append_workout(2, squat(n), DAY)
+    # a day kept in both formats is read from the segment only
+    write_legacy(f"{log_dir}/user_2_2025-01-01.json", [squat(9)])
+    write_legacy(f"{log_dir}/user_3_2025-01-02.json",
+                             [{"workout_name": "Old", "calories_burned": 5}])
+
+    assert workout_db.import_files(batch=2) == (3, 6)
+    assert workout_db.import_files(batch=1000) == (3, 6)
+
+    rows = db.query("SELECT user_id, COUNT(*), SUM(calories_burned) FROM user_workout_logs "
+                    "GROUP BY user_id ORDER BY user_id")
+    assert rows == [(1, 2, 270.0), (2, 3, 540.0), (3, 1, 5.0)]
+    # no timestamp in the file: start of that day
+    assert workout_db.read_day(3, date(2025, 1, 2))[0]["timestamp"] == "2025-01-02T00:00:00"
+
+
+def test_export_streams_workouts_from_sql(db, client, monkeypatch):
+    monkeypatch.setattr(workout, "WORKOUT_STORE", "sql")
+    workout_db.append_workout(1, squat(1), DAY)
+    workout_db.append_workout(1, dict(squat(2), timestamp="2025-01-03T07:00:00"), date(2025, 1, 3))
+
+    res = client.get("/api/export/1?from=2025-01-02")
+    records = [json.loads(line) for line in res.data.decode().splitlines()]
+    assert [(r["type"], r["timestamp"]) for r in records] == [("workout", "2025-01-03T07:00:00")]
+
+
+def test_version_stamp_matches_the_append(db):
+    record = workout_db.append_workout(7, squat(1), DAY)
+    assert workout_db.day_version(7, DAY) == record["version"]
+
+
+def test_import_keeps_rows_written_to_sql_on_the_same_day(db):
+    workout_store.append_workout(1, squat(1), DAY)
+    workout_db.append_workout(1, squat(2), DAY)      # straight to MySQL, no file line
+    assert workout_db.import_files() == (1, 1)
+
+    workout_store.append_workout(1, squat(3), DAY)
+    assert workout_db.import_files() == (1, 2)       # picks up the new line only
+
+    assert [w["sets"] for w in workout_db.read_day(1, DAY)] == [1, 2, 3]
+    assert workout_db.day_totals(1, DAY) == (540.0, 3)
@@ -0,0 +1,107 @@
+# backend/tests/test_workout_history.py
+import json
+from datetime import date
+
+import pytest
+
+import workout
+import workout_db
+import workout_store
+from legacy_files import write_legacy
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(workout_store, "LOG_DIR", str(tmp_path))
+    return tmp_path
+
+
+def done(name, burned, day):
+    return {"workout_name": name, "sets": 1, "calories_per_set": burned,
+            "calories_burned": burned, "timestamp": f"{day.isoformat()}T10:00:00"}
+
+
+def log_week():
+    for day, name, burned in [
+        (date(2025, 1, 1), "Squats", 90.0),
+        (date(2025, 1, 1), "Run", 300.0),
+        (date(2025, 1, 3), "Squats", 90.0),
+        (date(2025, 1, 7), "Squats", 45.0),     # next ISO week
+    ]:
+        workout_store.append_workout(3, done(name, burned, day), day)
+
+
+def test_appends_keep_the_manifest_current(log_dir):
+    log_week()
+    assert workout_store.day_index(3)[0] == {
+        "day": date(2025, 1, 1), "burned": 390.0, "count": 2,
+        "exercises": {"Squats": {"burned": 90.0, "count": 1}, "Run": {"burned": 300.0, "count": 1}},
+    }
+    assert [d["day"] for d in workout_store.day_index(3, date(2025, 1, 2))] == [
+        date(2025, 1, 3), date(2025, 1, 7)
+    ]
+
+
+def test_history_reads_only_the_manifest(log_dir, client, monkeypatch):
+    log_week()
+
+    def no_day_files(*_):
+        raise AssertionError("history must not open day files")
+    monkeypatch.setattr(workout_store, "read_day", no_day_files)
+    monkeypatch.setattr(workout_store, "list_days", no_day_files)
+
+    res = client.get("/api/workout/history/3?from=2025-01-01&to=2025-01-12&bucket=week").get_json()
+    assert res["total_burned"] == 525.0 and res["workouts_count"] == 4
+    assert res["exercises"] == [
+        {"workout_name": "Run", "burned": 300.0, "count": 1},
+        {"workout_name": "Squats", "burned": 225.0, "count": 3},
+    ]
+    first, second = res["buckets"]
+    assert (first["start"], first["end"], first["days_logged"]) == ("2025-01-01", "2025-01-05", 2)
+    assert first["totals"]["burned"] == 480.0 and first["log_count"] == 3
+    assert second["exercises"] == [{"workout_name": "Squats", "burned": 45.0, "count": 1}]
+
+
+def test_manifest_is_built_from_legacy_files(log_dir):
+    write_legacy(str(log_dir / "user_3_2025-01-01.json"),
+                             [done("Row", 50.0, date(2025, 1, 1))])
+    assert workout_store.day_index(3)[0]["burned"] == 50.0
+
+    # a write the manifest never saw (crash between segment and manifest)
+    with open(log_dir / "user_3_2025-01-02.ndjson", "w") as f:
+        f.write(json.dumps(dict(done("Row", 10.0, date(2025, 1, 2)), day_total=10.0, count=1)) + "\n")
+    workout_store.append_workout(3, done("Row", 5.0, date(2025, 1, 2)), date(2025, 1, 2))
+    assert workout_store.day_index(3)[1]["burned"] == 5.0
+    workout_store.rebuild_index(3)
+    assert workout_store.day_index(3)[1]["burned"] == 15.0
+
+
+def test_delta_lines_are_compacted(log_dir, monkeypatch):
+    monkeypatch.setattr(workout_store, "INDEX_COMPACT_SLACK", 4)
+    day = date(2025, 1, 1)
+    for n in range(10):
+        workout_store.append_workout(3, done("Squats" if n % 2 else "Run", 10.0, day), day)
+    path = log_dir / "user_3.days.ndjson"
+    assert len(path.read_text().splitlines()) == 10
+
+    assert workout_store.day_index(3)[0]["burned"] == 100.0
+    assert sorted(json.loads(l)["workout_name"] for l in path.read_text().splitlines()) == ["Run", "Squats"]
+    assert workout_store.day_index(3)[0]["exercises"]["Run"] == {"burned": 50.0, "count": 5}
+
+
+def test_history_validates_arguments(log_dir, client):
+    for query in ("from=2025-02-01&to=2025-01-01", "bucket=year", "from=junk",
+                  "from=2000-01-01&to=2025-01-01"):
+        assert client.get(f"/api/workout/history/3?{query}").status_code == 400
+
+
+def test_sql_store_gives_the_same_history(log_dir, db, client, monkeypatch):
+    log_week()
+    url = "/api/workout/history/3?from=2024-12-30&to=2025-01-31&bucket=month"
+    from_files = client.get(url).get_json()
+
+    monkeypatch.setattr(workout, "WORKOUT_STORE", "sql")
+    workout_db.import_files()
+
+    assert client.get(url).get_json() == from_files
+    assert len(from_files["buckets"]) == 2
@@ -0,0 +1,94 @@
+# backend/tests/test_workout_store.py
+import json
+from datetime import date
+
+import pytest
+
+import app as app_module
+import workout_store
+from legacy_files import write_legacy
+
+DAY = date(2025, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(workout_store, "LOG_DIR", str(tmp_path))
+    return tmp_path
+
+
+def squat(n=1):
+    return {"workout_name": "Squats", "sets": n, "calories_per_set": 90.0,
+            "calories_burned": 90.0 * n, "timestamp": f"2025-01-01T10:00:0{n}"}
+
+
+def test_each_completion_is_one_appended_line(log_dir):
+    for n in (1, 2, 3):
+        record = workout_store.append_workout(7, squat(n), DAY)
+    assert record["day_total"] == 540.0 and record["count"] == 3
+
+    lines = (log_dir / "user_7_2025-01-01.ndjson").read_text().splitlines()
+    assert [json.loads(l)["day_total"] for l in lines] == [90.0, 270.0, 540.0]
+    assert workout_store.read_day(7, DAY) == [squat(1), squat(2), squat(3)]
+    assert workout_store.day_totals(7, DAY) == (540.0, 3)
+
+
+def test_last_record_reads_across_chunks(monkeypatch):
+    monkeypatch.setattr(workout_store, "TAIL_CHUNK", 16)
+    for n in range(1, 6):
+        workout_store.append_workout(7, squat(n), DAY)
+    assert workout_store.last_record(workout_store.segment_path(7, DAY))["count"] == 5
+
+
+def test_torn_last_line_is_ignored_and_appends_continue(log_dir):
+    workout_store.append_workout(7, squat(1), DAY)
+    path = log_dir / "user_7_2025-01-01.ndjson"
+    with open(path, "a") as f:
+        f.write('{"workout_name": "Dead')          # crash mid-append
+
+    assert workout_store.day_totals(7, DAY) == (90.0, 1)
+    record = workout_store.append_workout(7, squat(2), DAY)
+    assert (record["day_total"], record["count"]) == (270.0, 2)
+    assert len(workout_store.read_day(7, DAY)) == 2
+
+
+def test_totals_rebuild_when_lines_lack_running_total(log_dir):
+    (log_dir / "user_7_2025-01-01.ndjson").write_text(
+        json.dumps(squat(1)) + "\n" + json.dumps(squat(2)) + "\n"
+    )
+    assert workout_store.day_totals(7, DAY) == (270.0, 2)
+    assert workout_store.append_workout(7, squat(3), DAY)["day_total"] == 540.0
+
+
+def test_legacy_day_is_converted_on_append(log_dir):
+    write_legacy(str(log_dir / "user_7_2025-01-01.json"), [squat(1), squat(2)])
+    assert workout_store.day_totals(7, DAY) == (270.0, 2)
+
+    workout_store.append_workout(7, squat(3), DAY)
+    assert not (log_dir / "user_7_2025-01-01.json").exists()
+    assert workout_store.read_day(7, DAY) == [squat(1), squat(2), squat(3)]
+
+
+def test_convert_all(log_dir):
+    write_legacy(str(log_dir / "user_1_2025-01-01.json"), [squat(1)])
+    write_legacy(str(log_dir / "user_2_2025-01-02.json"), [squat(1), squat(2)])
+    assert workout_store.convert_all(keep=True) == 2
+    assert workout_store.convert_all(keep=True) == 0       # segment wins from now on
+    assert workout_store.day_totals(2, date(2025, 1, 2)) == (270.0, 2)
+    assert (log_dir / "user_2_2025-01-02.json").exists()
+
+
+def test_routes_keep_their_response_shape():
+    client = app_module.app.test_client()
+    payload = {"user_id": 3, "workout_name": "Squats", "sets": 4, "calories_per_set": 90}
+    client.post("/api/workout/complete", json=payload)
+    res = client.post("/api/workout/complete", json=payload).get_json()
+    assert res["today_burned"] == 720.0
+    assert set(res["logged_workout"]) == {
+        "workout_name", "sets", "calories_per_set", "calories_burned", "timestamp"
+    }
+
+    today = client.get("/api/workout/today/3").get_json()
+    assert today["today_burned"] == 720.0 and today["workouts_count"] == 2
+    assert today["workouts"][0] == res["logged_workout"] | {"timestamp": today["workouts"][0]["timestamp"]}
+    assert "day_total" not in today["workouts"][1]
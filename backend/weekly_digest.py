@@ -0,0 +1,232 @@
+# backend/weekly_digest.py
+"""
+Weekly digest: the /api/summary/weekly numbers for EVERY user in one pass.
+
+Reads one week of user_daily_totals and all profiles (two streamed
+queries), computes targets, averages and met-days with numpy, then
+writes user_weekly_summaries (or an NDJSON file).
+
+    python weekly_digest.py                          # week ending today
+    python weekly_digest.py --end 2025-01-05
+    python weekly_digest.py --out digest.ndjson      # file instead of table
+"""
+import os
+import json
+import time
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+
+from db import get_conn
+from calorie_target import calculate_daily_calories_many
+from profile_cache import DEFAULT_PROFILE
+from rollup import ROLLUP_TABLE
+
+DIGEST_TABLE = "user_weekly_summaries"
+DIGEST_FETCH_SIZE = int(os.getenv("DIGEST_FETCH_SIZE", 5000))
+DIGEST_WRITE_BATCH = int(os.getenv("DIGEST_WRITE_BATCH", 1000))
+
+MACROS = ("calories", "protein", "carbs", "fat")
+
+WEEK_ROWS_SQL = f"""
+    SELECT user_id, {", ".join(MACROS)}
+    FROM {ROLLUP_TABLE}
+    WHERE day >= %s AND day < %s
+"""
+
+PROFILES_SQL = """
+    SELECT user_id, age, height_cm, weight_kg, gender, activity_level, goal
+    FROM user_profiles
+    WHERE user_id IS NOT NULL
+    ORDER BY id
+"""
+
+_OUT_COLS = (
+    "user_id", "week_start", "week_end", "daily_target", "days_logged", "met_days",
+    "average_calories", "average_protein", "average_carbs", "average_fat",
+    "consistency_percent",
+)
+
+UPSERT_SQL = f"""
+    INSERT INTO {DIGEST_TABLE} ({", ".join(_OUT_COLS)})
+    VALUES ({", ".join(["%s"] * len(_OUT_COLS))})
+    ON DUPLICATE KEY UPDATE
+        {", ".join(f"{c} = VALUES({c})" for c in _OUT_COLS[2:])}
+"""
+
+
+# -------------------------------------------------
+# Load
+# -------------------------------------------------
+def _stream(conn, sql, params=(), dictionary=False):
+    cur = conn.cursor(dictionary=dictionary, buffered=False)
+    cur.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(DIGEST_FETCH_SIZE)
+        if not rows:
+            return
+        yield from rows
+
+
+def load_week(conn, week_start, week_end):
+    """
+    (user_ids, values[n, 4]) for every logged day in the week. Each
+    fetchmany chunk is copied straight into one float buffer (doubled
+    when full), so no list of row tuples for the whole week is ever held.
+    """
+    cur = conn.cursor(buffered=False)
+    cur.execute(WEEK_ROWS_SQL, (week_start, week_end + timedelta(days=1)))
+    data = np.empty((DIGEST_FETCH_SIZE, 1 + len(MACROS)))
+    n = 0
+    while True:
+        rows = cur.fetchmany(DIGEST_FETCH_SIZE)
+        if not rows:
+            break
+        if n + len(rows) > len(data):
+            data = np.resize(data, (max(2 * len(data), n + len(rows)), data.shape[1]))
+        data[n:n + len(rows)] = np.array(rows, dtype=float)    # NULL -> nan
+        n += len(rows)
+    data = data[:n]
+    return data[:, 0].astype(np.int64), np.nan_to_num(data[:, 1:])
+
+
+def load_profiles(conn):
+    """{user_id: profile}; first row wins, like get_user_profile's fetchone"""
+    profiles = {}
+    for row in _stream(conn, PROFILES_SQL, dictionary=True):
+        profiles.setdefault(int(row["user_id"]), row)
+    return profiles
+
+
+# -------------------------------------------------
+# Compute (vectorized)
+# -------------------------------------------------
+def compute(day_users, day_values, profiles):
+    """
+    Same numbers as app.weekly_stats, for every user with a profile or
+    a logged day. Returns a dict of equal-length arrays.
+    """
+    prof_ids = np.fromiter(profiles, dtype=np.int64, count=len(profiles))
+    users = np.union1d(prof_ids, day_users)
+    n = len(users)
+
+    # targets: profile users vectorized, everyone else the default profile
+    target = np.full(n, calculate_daily_calories_many([DEFAULT_PROFILE])[0])
+    if profiles:
+        target[np.searchsorted(users, prof_ids)] = calculate_daily_calories_many(list(profiles.values()))
+
+    idx = np.searchsorted(users, day_users)
+    met = (day_values[:, 0] > 0) & (day_values[:, 0] <= target[idx])
+    sums = np.stack([
+        np.bincount(idx, weights=day_values[:, j], minlength=n)
+        for j in range(len(MACROS))
+    ], axis=1)
+
+    met_days = np.bincount(idx, weights=met, minlength=n).astype(int)
+    return {
+        "user_id": users,
+        "daily_target": target,
+        "days_logged": np.bincount(idx, minlength=n),
+        "met_days": met_days,
+        "averages": sums / 7,
+        "consistency_percent": (met_days / 7 * 100).astype(int),
+    }
+
+
+def records(result, week_start, week_end):
+    averages = result["averages"]
+    for i, uid in enumerate(result["user_id"].tolist()):
+        met = int(result["met_days"][i])
+        rec = {
+            "user_id": uid,
+            "week_start": week_start.isoformat(),
+            "week_end": week_end.isoformat(),
+            "daily_target": int(result["daily_target"][i]),
+            "days_logged": int(result["days_logged"][i]),
+            "met_days": met,
+        }
+        for j, k in enumerate(MACROS):
+            rec[f"average_{k}"] = round(float(averages[i, j]), 2)
+        rec["consistency_percent"] = int(result["consistency_percent"][i])
+        rec["status"] = "Good progress ✅" if met >= 5 else "Needs improvement ⚠️"
+        yield rec
+
+
+# -------------------------------------------------
+# Write
+# -------------------------------------------------
+def write_table(conn, recs):
+    written, batch = 0, []
+    cur = conn.cursor()
+    for rec in recs:
+        batch.append(tuple(rec[c] for c in _OUT_COLS))
+        if len(batch) >= DIGEST_WRITE_BATCH:
+            cur.executemany(UPSERT_SQL, batch)
+            conn.commit()
+            written += len(batch)
+            batch = []
+    if batch:
+        cur.executemany(UPSERT_SQL, batch)
+        conn.commit()
+        written += len(batch)
+    return written
+
+
+def write_ndjson(path, recs):
+    written = 0
+    with open(path, "w") as f:
+        for rec in recs:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def run(week_end=None, out=None):
+    """Build the digest for the 7 days ending `week_end`; returns timing stats"""
+    week_end = week_end or date.today()
+    week_start = week_end - timedelta(days=6)
+    t0 = time.perf_counter()
+
+    conn = get_conn()
+    try:
+        day_users, day_values = load_week(conn, week_start, week_end)
+        profiles = load_profiles(conn)
+        t_load = time.perf_counter()
+
+        result = compute(day_users, day_values, profiles)
+        t_compute = time.perf_counter()
+
+        recs = records(result, week_start, week_end)
+        users = write_ndjson(out, recs) if out else write_table(conn, recs)
+    finally:
+        conn.close()
+
+    total = time.perf_counter() - t0
+    return {
+        "week_start": week_start.isoformat(),
+        "week_end": week_end.isoformat(),
+        "users": users,
+        "day_rows": int(len(day_users)),
+        "load_s": round(t_load - t0, 3),
+        "compute_s": round(t_compute - t_load, 3),
+        "write_s": round(total - (t_compute - t0), 3),
+        "total_s": round(total, 3),
+        "users_per_s": round(users / total, 1) if total else 0.0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Weekly summaries for every user")
+    ap.add_argument("--end", type=date.fromisoformat, help="last day of the week (default today)")
+    ap.add_argument("--out", help="write NDJSON here instead of user_weekly_summaries")
+    args = ap.parse_args()
+
+    stats = run(args.end, args.out)
+    print(f"✅ {stats['users']} users for {stats['week_start']}..{stats['week_end']} "
+          f"in {stats['total_s']}s ({stats['users_per_s']} users/s)")
+    print(f"   load {stats['load_s']}s · compute {stats['compute_s']}s · write {stats['write_s']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,19 @@
 # workout.py
 import os
-import json
 from datetime import datetime, date
 from flask import Blueprint, request, jsonify
 
+import workout_db
+import workout_store
+from workout_counters import today_counters
+from rollup import BUCKETS, bucket_rows, bucket_start, next_bucket
+
+# where workouts are kept: "file" (workout_logs/*.ndjson) or "sql" (user_workout_logs)
+WORKOUT_STORE = os.getenv("WORKOUT_STORE", "file").lower()
+
+# /api/workout/history limit
+WORKOUT_HISTORY_MAX_DAYS = int(os.getenv("WORKOUT_HISTORY_MAX_DAYS", 1100))
+
 print("🔥 workout.py LOADED")  # DEBUG PROOF
 
 # -------------------------------------------------
@@ -15,40 +25,54 @@ workout_bp = Blueprint(
     url_prefix="/api/workout"
 )
 
-# -------------------------------------------------
-# Paths
-# -------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-LOG_DIR = os.path.join(BASE_DIR, "workout_logs")
-
-os.makedirs(LOG_DIR, exist_ok=True)
-
 # -------------------------------------------------
 # Helpers
 # -------------------------------------------------
-def get_log_file(user_id):
-    """Return today's workout log file for a user"""
-    today = date.today().isoformat()
-    return os.path.join(LOG_DIR, f"user_{user_id}_{today}.json")
-
-
-def read_logs(path):
-    """Read workout logs from file safely"""
-    if not os.path.exists(path):
-        return []
-    try:
-        with open(path, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, ValueError):
-        return []
-
-
-def write_logs(path, data):
-    """Atomic write to prevent corruption"""
-    temp_path = f"{path}.tmp"
-    with open(temp_path, "w") as f:
-        json.dump(data, f, indent=2)
-    os.replace(temp_path, path)
+def get_store():
+    """Backend module for workout logs (both expose the same functions)"""
+    return workout_db if WORKOUT_STORE == "sql" else workout_store
+
+
+def iter_workouts(user_id, start_day=None, end_day=None):
+    """Every logged workout in time order (streamed, never the whole history)"""
+    return get_store().iter_range(user_id, start_day, end_day)
+
+
+def workout_version(user_id, conn=None):
+    """Change stamp for today's workouts (changes on every completion)"""
+    return get_store().day_version(user_id, date.today(), conn)
+
+
+def today_counts(user_id, store=None, conn=None):
+    """
+    (burned, count) for today: from the in-memory counters while the
+    day's version is unchanged, else rebuilt from storage. Stores whose
+    version check costs as much as the totals are read directly.
+    conn: the caller's DB connection, used by the sql store
+    """
+    store = store or get_store()
+    today = date.today()
+    if not store.CACHE_TODAY_COUNTS:
+        return store.day_totals(user_id, today, conn)
+    version = store.day_version(user_id, today, conn)
+    cached = today_counters.get(user_id, version)
+    if cached is not None:
+        return cached
+    # version read first: a write landing in between just makes the
+    # entry look stale next time, never wrongly current
+    burned, count = store.day_totals(user_id, today, conn)
+    today_counters.put(user_id, today, version, burned, count)
+    return burned, count
+
+
+def today_workout_summary(user_id, conn=None):
+    """Today's burned calories + count (no workout list)"""
+    burned, count = today_counts(user_id, conn=conn)
+    return {
+        "date": date.today().isoformat(),
+        "today_burned": burned,
+        "workouts_count": count
+    }
 
 
 # -------------------------------------------------
@@ -109,17 +133,18 @@ def complete_workout():
     }
 
     # ---------------------------
-    # 3. File operations
+    # 3. Append to today's log
     # ---------------------------
-    file_path = get_log_file(user_id)
-    logs = read_logs(file_path)
-    logs.append(entry)
-    write_logs(file_path, logs)
+    today = date.today()
+    store = get_store()
+    record = store.append_workout(user_id, entry, today)
 
     # ---------------------------
-    # 4. Daily total
+    # 4. Daily total (returned by the append) -> today's counters
     # ---------------------------
-    total_burned = sum(w.get("calories_burned", 0) for w in logs)
+    total_burned = record["day_total"]
+    if store.CACHE_TODAY_COUNTS:
+        today_counters.put(user_id, today, record["version"], total_burned, record["count"])
 
     print("✅ WORKOUT SAVED:", entry)
 
@@ -138,16 +163,83 @@ def complete_workout():
 # -------------------------------------------------
 @workout_bp.route("/today/<int:user_id>", methods=["GET"])
 def today_burned(user_id):
+    """?summary_only=1 skips reading and sending the workout list"""
     print("🔥 TODAY ROUTE HIT:", user_id)
 
-    file_path = get_log_file(user_id)
-    logs = read_logs(file_path)
+    if request.args.get("summary_only", "").lower() in ("1", "true", "yes"):
+        return jsonify(today_workout_summary(user_id)), 200
 
-    total_burned = sum(w.get("calories_burned", 0) for w in logs)
+    today = date.today()
+    store = get_store()
+    logs = store.read_day(user_id, today)
+    total_burned, _ = today_counts(user_id, store)
 
     return jsonify({
-        "date": date.today().isoformat(),
+        "date": today.isoformat(),
         "today_burned": total_burned,
         "workouts_count": len(logs),
         "workouts": logs
     }), 200
+
+
+# -------------------------------------------------
+# GET: Burned calories over a date range
+# -------------------------------------------------
+def _exercise_totals(summaries):
+    merged = {}
+    for summary in summaries:
+        for name, ex in summary["exercises"].items():
+            m = merged.setdefault(name, {"burned": 0, "count": 0})
+            m["burned"] += ex["burned"]
+            m["count"] += ex["count"]
+    # a list, biggest burn first (jsonify would sort a dict by name)
+    return [
+        {"workout_name": name, "burned": round(m["burned"], 2), "count": m["count"]}
+        for name, m in sorted(merged.items(), key=lambda kv: (-kv[1]["burned"], kv[0]))
+    ]
+
+
+@workout_bp.route("/history/<int:user_id>", methods=["GET"])
+def workout_history(user_id):
+    """
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD&bucket=day|week|month
+    Per-bucket and per-exercise burned calories, read from the day index
+    (one manifest file / one GROUP BY), never from the day files.
+    """
+    try:
+        end_day = date.fromisoformat(request.args["to"]) if request.args.get("to") else date.today()
+        start_day = date.fromisoformat(request.args["from"]) if request.args.get("from") else end_day
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+
+    bucket = request.args.get("bucket", "day")
+    if bucket not in BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(BUCKETS)}"}), 400
+    if start_day > end_day:
+        return jsonify({"error": "from must not be after to"}), 400
+    if (end_day - start_day).days + 1 > WORKOUT_HISTORY_MAX_DAYS:
+        return jsonify({"error": f"Range too long (max {WORKOUT_HISTORY_MAX_DAYS} days)"}), 400
+
+    days = get_store().day_index(user_id, start_day, end_day)
+
+    # same bucket shape as /api/summary/range, plus the exercise split
+    rows = [{"day": d["day"], "log_count": d["count"], "burned": d["burned"]} for d in days]
+    buckets = bucket_rows(rows, start_day, end_day, bucket, ("burned",))
+    by_start = {}
+    for d in days:
+        by_start.setdefault(bucket_start(d["day"], bucket), []).append(d)
+    start = bucket_start(start_day, bucket)
+    for b in buckets:
+        b["exercises"] = _exercise_totals(by_start.get(start, []))
+        start = next_bucket(start, bucket)
+
+    return jsonify({
+        "user_id": user_id,
+        "from": start_day.isoformat(),
+        "to": end_day.isoformat(),
+        "bucket": bucket,
+        "total_burned": round(sum(d["burned"] for d in days), 2),
+        "workouts_count": sum(d["count"] for d in days),
+        "exercises": _exercise_totals(days),
+        "buckets": buckets
+    }), 200
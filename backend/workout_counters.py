@@ -0,0 +1,81 @@
+# backend/workout_counters.py
+import os
+from datetime import date
+
+from lru import BoundedLRU
+
+# ====================================
+# Today-burned counters settings (ENV)
+# ====================================
+WORKOUT_COUNTERS_SIZE = int(os.getenv("WORKOUT_COUNTERS_SIZE", 10000))
+
+
+class TodayCounters(BoundedLRU):
+    """
+    Bounded LRU of (user_id, today) -> (burned, count, version).
+
+    complete_workout put()s the totals its append returned. Each worker
+    process has its own counters, so an entry is only used while the
+    store's day_version() still matches (a stat for the file store);
+    otherwise the caller rebuilds it from storage. Everything is dropped
+    when the date changes.
+    """
+
+    def __init__(self, maxsize=WORKOUT_COUNTERS_SIZE, clock=date.today):
+        super().__init__(maxsize)    # (user_id, day) -> (version, burned, count)
+        self._clock = clock
+        self._day = None
+        self.stale = 0
+        self.resets = 0
+
+    @staticmethod
+    def _key(user_id, day):
+        return str(user_id), day
+
+    def _roll(self):
+        # caller holds the lock
+        today = self._clock()
+        if today != self._day:
+            if self._data:
+                self.resets += 1
+            self._data.clear()
+            self._day = today
+        return today
+
+    def get(self, user_id, version):
+        """(burned, count) for today if cached at this version, else None"""
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            key = self._key(user_id, self._roll())
+            item = self._data.get(key)
+            if item is not None and item[0] != version:
+                del self._data[key]
+                self.stale += 1
+                item = None
+            item = self._found(key, item)
+        return None if item is None else (item[1], item[2])
+
+    def put(self, user_id, day, version, burned, count):
+        """Store a day's totals; ignored unless `day` is today"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if day != self._roll():
+                return
+            self._store(self._key(user_id, day), (version, burned, count))
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._data.clear()
+            else:
+                self._data.pop(self._key(user_id, self._day), None)
+
+    def stats(self):
+        return dict(super().stats(), day=self._day.isoformat() if self._day else None,
+                    stale=self.stale, resets=self.resets)
+
+
+# shared per-process instance
+today_counters = TodayCounters()
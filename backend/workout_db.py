@@ -0,0 +1,274 @@
+# backend/workout_db.py
+"""
+MySQL workout store: one user_workout_logs row per completed workout.
+
+Same functions as workout_store (append_workout, read_day, day_totals,
+day_version, iter_range, day_index), so workout.py can use either;
+pick this one with WORKOUT_STORE=sql.
+
+Copy the existing day files into the table (re-runnable: lines already
+copied are skipped, rows the API wrote are never touched):
+    python workout_db.py import [--batch 1000]
+"""
+import os
+import argparse
+from datetime import date, datetime
+
+from db import get_conn, day_bounds, iso_timestamp, stream_rows
+import workout_store
+
+# rows per executemany / commit in the importer
+IMPORT_BATCH = int(os.getenv("WORKOUT_IMPORT_BATCH", 1000))
+
+# rows pulled per round trip by iter_range
+FETCH_SIZE = int(os.getenv("WORKOUT_FETCH_SIZE", 500))
+
+# checking a cached total here costs a query, same as reading the total
+# itself (one indexed aggregate), so workout.today_counts skips its cache
+CACHE_TODAY_COUNTS = False
+
+INSERT_SQL = """
+    INSERT INTO user_workout_logs
+        (user_id, timestamp, workout_name, sets, calories_per_set, calories_burned)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+# (user_id, source_day, source_seq) is unique: a line imported before is skipped
+IMPORT_SQL = """
+    INSERT IGNORE INTO user_workout_logs
+        (user_id, timestamp, workout_name, sets, calories_per_set, calories_burned,
+         source_day, source_seq)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# served from idx_workout_logs_user_ts alone (id is part of every InnoDB
+# secondary index): no row reads, unlike the SUM in DAY_TOTALS_SQL
+VERSION_SQL = """
+    SELECT COALESCE(MAX(id), 0), COUNT(*)
+    FROM user_workout_logs
+    WHERE user_id=%s AND timestamp >= %s AND timestamp < %s
+"""
+
+DAY_TOTALS_SQL = """
+    SELECT COALESCE(SUM(calories_burned), 0), COUNT(*), COALESCE(MAX(id), 0)
+    FROM user_workout_logs
+    WHERE user_id=%s AND timestamp >= %s AND timestamp < %s
+"""
+
+
+def range_sql(since=False, until=False):
+    return f"""
+        SELECT workout_name, sets, calories_per_set, calories_burned, timestamp
+        FROM user_workout_logs
+        WHERE user_id=%s
+          {"AND timestamp >= %s" if since else ""}
+          {"AND timestamp < %s" if until else ""}
+        ORDER BY timestamp, id
+    """
+
+
+def day_index_sql(since=False, until=False):
+    return f"""
+        SELECT DATE(timestamp) AS day, workout_name,
+               SUM(calories_burned) AS burned, COUNT(*) AS count
+        FROM user_workout_logs
+        WHERE user_id=%s
+          {"AND timestamp >= %s" if since else ""}
+          {"AND timestamp < %s" if until else ""}
+        GROUP BY DATE(timestamp), workout_name
+        ORDER BY day, workout_name
+    """
+
+
+# -------------------------------------------------
+# Row <-> workout dict
+# -------------------------------------------------
+def _to_entry(row):
+    """Same keys / types as a line in the day files"""
+    return {
+        "workout_name": row["workout_name"],
+        "sets": int(row["sets"]),
+        "calories_per_set": float(row["calories_per_set"]),
+        "calories_burned": float(row["calories_burned"]),
+        "timestamp": iso_timestamp(row["timestamp"]),
+    }
+
+
+def _to_row(user_id, entry, day):
+    ts = entry.get("timestamp")
+    ts = datetime.fromisoformat(ts) if ts else datetime.combine(day, datetime.min.time())
+    return (
+        int(user_id),
+        ts,
+        entry.get("workout_name", ""),
+        entry.get("sets", 0),
+        entry.get("calories_per_set", 0),
+        entry.get("calories_burned", 0),
+    )
+
+
+# -------------------------------------------------
+# Store API (mirrors workout_store)
+# -------------------------------------------------
+def _day_totals(cur, user_id, day):
+    cur.execute(DAY_TOTALS_SQL, (user_id, *day_bounds(day)))
+    return cur.fetchone()
+
+
+def append_workout(user_id, entry, day=None):
+    """Insert one workout; returns it with the new day_total / count / version"""
+    row = _to_row(user_id, entry, day or date.today())
+    day = day or row[1].date()
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(INSERT_SQL, row)
+        conn.commit()
+        # read after commit: a concurrent completion for the same user is
+        # counted by both responses instead of neither
+        total, count, last_id = _day_totals(cur, user_id, day)
+    finally:
+        conn.close()
+    return dict(workout_store.strip(entry), day_total=total, count=count,
+                version=_version(last_id, count))
+
+
+def read_day(user_id, day):
+    """Workouts of one day, oldest first"""
+    return list(iter_range(user_id, day, day, dated=False))
+
+
+def day_totals(user_id, day, conn=None):
+    """(calories burned, workout count) for a day (on `conn` if given)"""
+    own = conn is None
+    conn = conn or get_conn()
+    try:
+        total, count, _ = _day_totals(conn.cursor(), user_id, day)
+    finally:
+        if own:
+            conn.close()
+    return total, count
+
+
+def _version(last_id, count):
+    return f"{last_id}.{count}"
+
+
+def day_version(user_id, day, conn=None):
+    """Change stamp for a day (newest row id + row count, "0.0" if none)"""
+    own = conn is None
+    conn = conn or get_conn()
+    try:
+        cur = conn.cursor()
+        cur.execute(VERSION_SQL, (user_id, *day_bounds(day)))
+        last_id, count = cur.fetchone()
+    finally:
+        if own:
+            conn.close()
+    return _version(last_id, count)
+
+
+def _range_params(user_id, start_day, end_day):
+    params = [user_id]
+    if start_day:
+        params.append(day_bounds(start_day)[0])
+    if end_day:
+        params.append(day_bounds(end_day)[1])
+    return params
+
+
+def day_index(user_id, start_day=None, end_day=None):
+    """[{"day", "burned", "count", "exercises"}] oldest first (one GROUP BY)"""
+    conn = get_conn()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute(day_index_sql(bool(start_day), bool(end_day)),
+                    _range_params(user_id, start_day, end_day))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+
+    days = {}
+    for row in rows:
+        day = date.fromisoformat(str(row["day"])[:10])
+        summary = days.setdefault(day, {"day": day, "burned": 0, "count": 0, "exercises": {}})
+        burned, count = float(row["burned"]), int(row["count"])
+        summary["exercises"][row["workout_name"]] = {"burned": burned, "count": count}
+        summary["burned"] += burned
+        summary["count"] += count
+    return list(days.values())
+
+
+def iter_range(user_id, start_day=None, end_day=None, dated=True):
+    """Workouts between two days (inclusive) in time order, streamed"""
+    rows = stream_rows(get_conn, range_sql(bool(start_day), bool(end_day)),
+                       _range_params(user_id, start_day, end_day), FETCH_SIZE)
+    for row in rows:
+        entry = _to_entry(row)
+        if dated:
+            entry["date"] = entry["timestamp"][:10]
+        yield entry
+
+
+# -------------------------------------------------
+# Bulk importer: day files -> user_workout_logs
+# -------------------------------------------------
+def day_files(log_dir=None):
+    """(user_id, day) for every day file, one per day even if both formats exist"""
+    found = set()
+    for name in os.listdir(log_dir or workout_store.LOG_DIR):
+        m = workout_store.DAY_FILE.match(name)
+        if m:
+            found.add((int(m.group(1)), date.fromisoformat(m.group(2))))
+    return sorted(found)
+
+
+def import_files(batch=None):
+    """
+    Stream every day file into user_workout_logs in `batch`-sized
+    executemany inserts, each committed on its own. Rows are keyed by
+    (user, day, line number), so a re-run only adds lines appended since.
+    Returns (days, workouts) read from the files.
+    """
+    batch = batch or IMPORT_BATCH
+    rows = []
+    imported_days = imported_rows = 0
+
+    conn = get_conn()
+    try:
+        cur = conn.cursor()
+
+        def flush():
+            cur.executemany(IMPORT_SQL, rows)
+            conn.commit()
+            rows.clear()
+
+        for user_id, day in day_files():
+            # segment if there is one, else the legacy .json (same rule as the API)
+            entries = workout_store.read_day(user_id, day)
+            rows.extend((*_to_row(user_id, e, day), day, seq) for seq, e in enumerate(entries))
+            imported_days += 1
+            imported_rows += len(entries)
+            if len(rows) >= batch:
+                flush()
+        if rows:
+            flush()
+    finally:
+        conn.close()
+    return imported_days, imported_rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="MySQL workout store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="copy workout_logs/*.json|.ndjson into user_workout_logs")
+    imp.add_argument("--batch", type=int, default=IMPORT_BATCH, help="rows per insert batch")
+    args = ap.parse_args()
+
+    n_days, n_rows = import_files(args.batch)
+    print(f"✅ imported {n_rows} workouts from {n_days} day files in {workout_store.LOG_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+# backend/workout_store.py
+"""
+Workout day segments: workout_logs/user_<id>_<YYYY-MM-DD>.ndjson
+
+One JSON line is appended per completed workout (no read-modify-write
+of the whole day). Every line carries the running `day_total` and
+`count` for its day, so today's total is just the last line.
+
+Old pretty-printed user_<id>_<date>.json files are still read, and are
+converted the first time that day is appended to. Convert everything:
+    python workout_store.py convert [--keep]
+
+A per-user manifest, user_<id>.days.ndjson, holds burned calories and
+counts per (day, exercise), so history queries read one file instead of
+one per day. Appends add a delta line; readers sum the lines and rewrite
+the file compacted once deltas pile up. Rebuild from the day files with:
+    python workout_store.py reindex [--user N]
+
+This is the default workout backend; workout_db.py is the MySQL one
+(WORKOUT_STORE=sql), with an importer for these files.
+"""
+import os
+import re
+import json
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+try:
+    import fcntl            # POSIX advisory locks
+except ImportError:         # Windows dev boxes: in-process locking only
+    fcntl = None
+
+# -------------------------------------------------
+# Paths
+# -------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(BASE_DIR, "workout_logs")
+
+os.makedirs(LOG_DIR, exist_ok=True)
+
+SEGMENT_EXT = ".ndjson"
+LEGACY_EXT = ".json"
+
+# in-process lock stripes (threads of one worker); flock covers processes
+_THREAD_LOCKS = [threading.Lock() for _ in range(64)]
+
+# running-total fields stored on each line, not part of the workout
+BOOKKEEPING = ("day_total", "count")
+
+# bytes read from the end of a segment per step when looking for the last line
+TAIL_CHUNK = 4096
+
+# day_version() is a stat, far cheaper than day_totals(): worth caching
+CACHE_TODAY_COUNTS = True
+
+# delta lines a manifest may carry beyond its compacted size before rewrite
+INDEX_COMPACT_SLACK = 256
+
+
+def segment_path(user_id, day):
+    return os.path.join(LOG_DIR, f"user_{user_id}_{day.isoformat()}{SEGMENT_EXT}")
+
+
+def legacy_path(user_id, day):
+    return os.path.join(LOG_DIR, f"user_{user_id}_{day.isoformat()}{LEGACY_EXT}")
+
+
+def index_path(user_id):
+    return os.path.join(LOG_DIR, f"user_{user_id}.days.ndjson")
+
+
+def lock_path(user_id):
+    return os.path.join(LOG_DIR, f".user_{user_id}.lock")
+
+
+@contextmanager
+def user_lock(user_id):
+    """
+    Serialize one user's workout writes across threads AND gunicorn
+    workers (flock on workout_logs/.user_<id>.lock). Other users never
+    wait on each other beyond a shared thread-lock stripe.
+    """
+    with _THREAD_LOCKS[hash(str(user_id)) % len(_THREAD_LOCKS)]:
+        fd = os.open(lock_path(user_id), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)    # also drops the flock
+
+
+def _temp_file(path):
+    """Unique temp file next to `path` (same filesystem for os.replace)"""
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    return os.fdopen(fd, "w"), temp_path
+
+
+# -------------------------------------------------
+# Legacy JSON day files
+# -------------------------------------------------
+def read_logs(path):
+    """Read workout logs from file safely"""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, ValueError):
+        return []
+
+
+# -------------------------------------------------
+# Segments
+# -------------------------------------------------
+def _parse_line(line):
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def read_segment(path):
+    """
+    All records of a segment. A last line without its newline is a
+    torn append (crash mid-write) and is ignored.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    lines = data.split(b"\n")
+    lines.pop()     # "" after the final newline, or the torn tail
+    return [r for r in map(_parse_line, lines) if r is not None]
+
+
+def last_record(path):
+    """Last complete record, reading only the tail of the file"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        pos, tail = end, b""
+        while pos > 0:
+            step = min(TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.split(b"\n")
+            lines.pop()                 # torn tail / empty after last "\n"
+            # lines[0] may be cut off unless we reached the file start
+            complete = lines if pos == 0 else lines[1:]
+            for line in reversed(complete):
+                record = _parse_line(line)
+                if record is not None:
+                    return record
+    return None
+
+
+def strip(record):
+    return {k: v for k, v in record.items() if k not in BOOKKEEPING}
+
+
+def with_running_totals(entries):
+    total, out = 0, []
+    for i, entry in enumerate(entries, start=1):
+        total += entry.get("calories_burned", 0)
+        out.append(dict(strip(entry), day_total=total, count=i))
+    return out
+
+
+def _write_segment(path, records):
+    f, temp_path = _temp_file(path)
+    with f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+    os.replace(temp_path, path)
+
+
+def convert_day(user_id, day, keep=False):
+    """
+    Rewrite a legacy .json day as a segment. Once a segment exists it is
+    the source of truth (a legacy file kept with --keep is ignored).
+    """
+    with user_lock(user_id):
+        return _convert_day(user_id, day, keep)
+
+
+def _convert_day(user_id, day, keep):
+    old, path = legacy_path(user_id, day), segment_path(user_id, day)
+    if not os.path.exists(old) or os.path.exists(path):
+        return False
+    _write_segment(path, with_running_totals(read_logs(old)))
+    if not keep:
+        os.remove(old)
+    return True
+
+
+def append_workout(user_id, entry, day=None):
+    """
+    Append one workout; returns it with the new day_total / count and
+    the day's version right after this write (taken under the lock).
+    """
+    day = day or date.today()
+    with user_lock(user_id):
+        record = _append(user_id, entry, day)
+        return dict(record, version=day_version(user_id, day))
+
+
+def _append(user_id, entry, day):
+    # read-last-line + append must not interleave with another writer,
+    # or two lines would carry the same running total
+    _convert_day(user_id, day, keep=False)
+    path = segment_path(user_id, day)
+
+    last = last_record(path)
+    if last is not None and "day_total" not in last:
+        last = with_running_totals(read_segment(path))[-1]
+    record = dict(
+        strip(entry),
+        day_total=(last["day_total"] if last else 0) + entry.get("calories_burned", 0),
+        count=(last["count"] if last else 0) + 1,
+    )
+
+    _append_line(path, record)
+    _index_append(user_id, day, record)
+    return record
+
+
+def _append_line(path, record):
+    line = json.dumps(record).encode() + b"\n"
+    with open(path, "ab") as f:
+        if f.tell() > 0 and not _ends_with_newline(path):
+            line = b"\n" + line         # start fresh after a torn line
+        f.write(line)
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+# -------------------------------------------------
+# Readers used by the routes
+# -------------------------------------------------
+def _legacy_only(user_id, day):
+    return (not os.path.exists(segment_path(user_id, day))
+            and os.path.exists(legacy_path(user_id, day)))
+
+
+def read_day(user_id, day):
+    """Workouts of one day, oldest first (segment, else legacy file)"""
+    if _legacy_only(user_id, day):
+        return read_logs(legacy_path(user_id, day))
+    return [strip(r) for r in read_segment(segment_path(user_id, day))]
+
+
+def day_totals(user_id, day, conn=None):
+    """(calories burned, workout count) for a day from the last line only"""
+    # conn: same signature as workout_db; files need no connection
+    if _legacy_only(user_id, day):
+        entries = read_logs(legacy_path(user_id, day))
+        return sum(w.get("calories_burned", 0) for w in entries), len(entries)
+
+    last = last_record(segment_path(user_id, day))
+    if last is None:
+        return 0, 0
+    if "day_total" not in last:
+        # written by hand / damaged: rebuild from the whole segment
+        last = with_running_totals(read_segment(segment_path(user_id, day)))[-1]
+    return last["day_total"], last["count"]
+
+
+def day_version(user_id, day, conn=None):
+    """
+    Change stamp for a day: mtime + size of whichever files exist ("0"
+    if none). Size grows with every append, so two writes inside one
+    mtime tick still differ.
+    """
+    parts = []
+    for path in (segment_path(user_id, day), legacy_path(user_id, day)):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return "/".join(parts) or "0"
+
+
+def list_days(user_id, start_day=None, end_day=None):
+    """Dates a user has workout files for, oldest first"""
+    pattern = re.compile(rf"^user_{int(user_id)}_(\d{{4}}-\d{{2}}-\d{{2}})\.(?:ndjson|json)$")
+    days = set()
+    for name in os.listdir(LOG_DIR):
+        m = pattern.match(name)
+        if not m:
+            continue
+        day = date.fromisoformat(m.group(1))
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        days.add(day)
+    return sorted(days)
+
+
+def iter_range(user_id, start_day=None, end_day=None):
+    """Workouts between two days (inclusive) in time order, one day in memory at a time"""
+    for day in list_days(user_id, start_day, end_day):
+        for entry in sorted(read_day(user_id, day), key=lambda w: w.get("timestamp", "")):
+            yield dict(entry, date=day.isoformat())
+
+
+# -------------------------------------------------
+# Per-user day manifest (history queries)
+# -------------------------------------------------
+def _add_to_index(index, day, name, burned, count):
+    summary = index.setdefault(day, {"burned": 0, "count": 0, "exercises": {}})
+    ex = summary["exercises"].setdefault(name, {"burned": 0, "count": 0})
+    for target in (summary, ex):
+        target["burned"] += burned
+        target["count"] += count
+
+
+def _read_index(user_id):
+    """({day: summary}, line count) summed over the manifest, None if there is none"""
+    path = index_path(user_id)
+    if not os.path.exists(path):
+        return None
+    lines = read_segment(path)
+    index = {}
+    for r in lines:
+        _add_to_index(index, r.get("day"), r.get("workout_name", ""),
+                      r.get("burned", 0), r.get("count", 0))
+    return index, len(lines)
+
+
+def _write_index(user_id, index):
+    """Rewrite compacted: one line per (day, exercise)"""
+    _write_segment(index_path(user_id), [
+        {"day": day, "workout_name": name, "burned": ex["burned"], "count": ex["count"]}
+        for day in sorted(index)
+        for name, ex in index[day]["exercises"].items()
+    ])
+
+
+def _build_index(user_id):
+    index = {}
+    for day in list_days(user_id):
+        for w in read_day(user_id, day):
+            _add_to_index(index, day.isoformat(), w.get("workout_name", ""),
+                          w.get("calories_burned", 0), 1)
+    return index
+
+
+def _index_append(user_id, day, record):
+    # caller holds user_lock; a delta line, so appends stay O(1)
+    if not os.path.exists(index_path(user_id)):
+        _write_index(user_id, _build_index(user_id))     # already includes `record`
+        return
+    _append_line(index_path(user_id), {
+        "day": day.isoformat(),
+        "workout_name": record.get("workout_name", ""),
+        "burned": record.get("calories_burned", 0),
+        "count": 1,
+    })
+
+
+def rebuild_index(user_id):
+    """Manifest from the day files (first use, or after a crash between the two writes)"""
+    with user_lock(user_id):
+        index = _build_index(user_id)
+        _write_index(user_id, index)
+    return index
+
+
+def _compact_index(user_id):
+    with user_lock(user_id):
+        index, _ = _read_index(user_id)     # re-read: appends may have landed
+        _write_index(user_id, index)
+    return index
+
+
+def day_index(user_id, start_day=None, end_day=None):
+    """[{"day", "burned", "count", "exercises"}] oldest first, from the manifest"""
+    loaded = _read_index(user_id)
+    if loaded is None:
+        index = rebuild_index(user_id)
+    else:
+        index, n_lines = loaded
+        if n_lines > INDEX_COMPACT_SLACK + 2 * sum(len(d["exercises"]) for d in index.values()):
+            index = _compact_index(user_id)
+
+    out = []
+    for key in sorted(index):
+        day = date.fromisoformat(key)
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        out.append(dict(index[key], day=day))
+    return out
+
+
+# -------------------------------------------------
+# Converter CLI
+# -------------------------------------------------
+LEGACY_FILE = re.compile(r"^user_(\d+)_(\d{4}-\d{2}-\d{2})\.json$")
+DAY_FILE = re.compile(r"^user_(\d+)_(\d{4}-\d{2}-\d{2})\.(?:ndjson|json)$")
+
+
+def convert_all(keep=False):
+    converted = 0
+    for name in sorted(os.listdir(LOG_DIR)):
+        m = LEGACY_FILE.match(name)
+        if m and convert_day(int(m.group(1)), date.fromisoformat(m.group(2)), keep):
+            converted += 1
+    return converted
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Workout log segments")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    conv = sub.add_parser("convert", help="turn legacy .json day files into .ndjson segments")
+    conv.add_argument("--keep", action="store_true", help="leave the .json files in place")
+    reidx = sub.add_parser("reindex", help="rebuild the per-user day manifests")
+    reidx.add_argument("--user", type=int, help="only this user")
+    args = ap.parse_args()
+
+    if args.cmd == "convert":
+        print(f"✅ converted {convert_all(args.keep)} day files in {LOG_DIR}")
+    else:
+        users = [args.user] if args.user is not None else sorted({
+            int(m.group(1)) for m in map(DAY_FILE.match, os.listdir(LOG_DIR)) if m
+        })
+        for user_id in users:
+            rebuild_index(user_id)
+        print(f"✅ reindexed {len(users)} user(s) in {LOG_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,25 +34,53 @@ export async function postLog(user_id, text) {
 }
 
 // ---------------------------------------------------
-// GET: Fetch last food logs (ALWAYS ARRAY)
+// POST: Add many food logs at once
+// entries: [{ user_id, text, timestamp? }]
 // ---------------------------------------------------
-export async function fetchLogs(user_id) {
+export async function postLogBatch(entries) {
   try {
+    const response = await fetch(`${API_BASE}/api/log/batch`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ entries })
+    });
+
+    return await safeJson(response);
+  } catch (error) {
+    console.error("❌ postLogBatch error:", error);
+    return { success: false, results: [] };
+  }
+}
+
+// ---------------------------------------------------
+// GET: Fetch food logs, newest first (ALWAYS ARRAY)
+// options: { before, limit, fields } - pass next_cursor back
+// as `before` to load the following page
+// ---------------------------------------------------
+export async function fetchLogs(user_id, { before, limit, fields } = {}) {
+  try {
+    const params = new URLSearchParams({ user_id });
+    if (before) params.set("before", before);
+    if (limit) params.set("limit", limit);
+    if (fields) params.set("fields", [].concat(fields).join(","));
+
     const response = await fetch(
-      `${API_BASE}/api/logs?user_id=${user_id}`
+      `${API_BASE}/api/logs?${params}`
     );
 
     const data = await safeJson(response);
 
     return {
       success: true,
-      logs: Array.isArray(data.logs) ? data.logs : []
+      logs: Array.isArray(data.logs) ? data.logs : [],
+      next_cursor: data.next_cursor || null
     };
   } catch (error) {
     console.error("❌ fetchLogs error:", error);
     return {
       success: false,
-      logs: []
+      logs: [],
+      next_cursor: null
     };
   }
 }
@@ -126,6 +154,55 @@ export async function getWeeklySummary(user_id) {
   }
 }
 
+// ---------------------------------------------------
+// GET: Nutrition history buckets for trend charts
+// user_ids: one id or an array (coach view)
+// bucket: "day" | "week" | "month"
+// ---------------------------------------------------
+export async function getRangeSummary(user_ids, from, to, bucket = "day") {
+  try {
+    const params = new URLSearchParams({
+      user_id: [].concat(user_ids).join(","),
+      from,
+      to,
+      bucket
+    });
+    const response = await fetch(
+      `${API_BASE}/api/summary/range?${params}`
+    );
+
+    return await safeJson(response);
+  } catch (error) {
+    console.error("❌ getRangeSummary error:", error);
+    return null;
+  }
+}
+
+// ---------------------------------------------------
+// GET: Whole dashboard in one request
+// (profile, target, today, macros, weekly, workout)
+// ---------------------------------------------------
+export async function getDashboard(user_id) {
+  try {
+    const response = await fetch(
+      `${API_BASE}/api/dashboard/${user_id}`
+    );
+
+    return await safeJson(response);
+  } catch (error) {
+    console.error("❌ getDashboard error:", error);
+    return null;
+  }
+}
+
+// ---------------------------------------------------
+// Download link for the full food + workout history
+// format: "ndjson" | "csv" (streamed by the backend)
+// ---------------------------------------------------
+export function exportHistoryUrl(user_id, format = "csv") {
+  return `${API_BASE}/api/export/${user_id}?format=${format}`;
+}
+
 // ---------------------------------------------------
 // 🎯 TARGET-BASED FOOD RECOMMENDATION (POST)
 // ---------------------------------------------------